@@ -0,0 +1,7 @@
+"""Performance benchmarks for AstroCore.
+
+`benchmarks.corpus` generates reproducible synthetic Methods sections, papers
+and parser inputs; `benchmarks.run` times the extraction and notebook
+pipeline on them and writes machine-readable results. The bench_*.py scripts
+are focused micro-benchmarks.
+"""
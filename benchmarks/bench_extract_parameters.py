@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""Micro-benchmark: per-document latency of nlp_extractor.extract_parameters.
+
+Builds long synthetic Methods sections (parameter sentences interleaved with
+filler prose) and reports mean / median / p95 latency per document.
+
+Usage: python benchmarks/bench_extract_parameters.py [--chars 20000] [--docs 50]
+       [--param-every 40] [--no-prefilter]
+"""
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+# Ensure local src/ and the repo root are on sys.path so the script works when invoked directly
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+for p in (SRC, ROOT):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+from astrocore import nlp_extractor
+from benchmarks.corpus import methods_text
+
+def run(n_chars: int = 20000, n_docs: int = 50, seed: int = 0, param_every: int = 8):
+    rng = random.Random(seed)
+    docs = [methods_text(n_chars, rng, param_every) for _ in range(n_docs)]
+    # warm-up (first call may pay lazy initialisation costs)
+    nlp_extractor.extract_parameters(docs[0], cache=False)
+    timings = []
+    for d in docs:
+        t0 = time.perf_counter()
+        nlp_extractor.extract_parameters(d, cache=False)
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    return {
+        'chars': n_chars,
+        'docs': n_docs,
+        'mean_ms': statistics.mean(timings) * 1000.0,
+        'median_ms': statistics.median(timings) * 1000.0,
+        'p95_ms': timings[min(len(timings) - 1, int(0.95 * len(timings)))] * 1000.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark extract_parameters on long Methods sections')
+    parser.add_argument('--chars', type=int, nargs='+', default=[2000, 20000, 200000], help='Document sizes in characters')
+    parser.add_argument('--docs', type=int, default=50, help='Documents per size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--param-every', type=int, default=8, help='One parameter sentence per N sentences')
+    parser.add_argument('--no-prefilter', action='store_true', help='Send whole documents to spaCy (disables the keyword prefilter)')
+    args = parser.parse_args(argv)
+    if args.no_prefilter:
+        nlp_extractor._PREFILTER_MIN_CHARS = sys.maxsize
+
+    print(f"{'chars':>8} {'docs':>5} {'mean ms':>9} {'median ms':>10} {'p95 ms':>9}")
+    for n in args.chars:
+        r = run(n, args.docs, args.seed, args.param_every)
+        print(f"{r['chars']:>8} {r['docs']:>5} {r['mean_ms']:>9.3f} {r['median_ms']:>10.3f} {r['p95_ms']:>9.3f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""Benchmark: spaCy enrichment cost before and after the fused token pass.
+
+Compares the previous implementation (a Matcher rebuilt on every call plus
+separate token loops in spacy_enrich_extraction and extract_parameters, kept
+below as `legacy_*`) with the single `_scan_tokens` pass that replaced them
+(no Matcher), on Methods sections of roughly 10k tokens. Results are checked
+for equality.
+
+Requires spaCy. Usage: python benchmarks/bench_spacy_enrich.py [--tokens 10000] [--docs 5]
+"""
+import re
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+# Ensure local src/ and the repo root are on sys.path so the script works when invoked directly
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+for p in (SRC, ROOT):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+from astrocore import nlp_extractor
+from astrocore.nlp_extractor import _freq_to_hz
+from benchmarks.corpus import methods_text
+
+
+def legacy_spacy_enrich_extraction(doc, out):
+    """spacy_enrich_extraction as it was before the fused token pass."""
+    try:
+        from spacy.matcher import Matcher
+        matcher = Matcher(doc.vocab)
+        matcher.add('FREQ_HZ', [[{'LIKE_NUM': True}, {'LOWER': {'IN': ['hz','khz','mhz']}}]])
+        matcher.add('FREQ_ATTACHED', [[{'TEXT': {'REGEX': '^[0-9]+(\\.[0-9]+)?(k|m)?hz$'}}]])
+        matcher.add('PATH_WIN', [[{'TEXT': {'REGEX': r"^[A-Za-z]:\\\\.*\\.(csv|mat|npy|fif|edf)$"}}]])
+        matcher.add('PATH_UNIX', [[{'TEXT': {'REGEX': r"^/.*/.*\\.(csv|mat|npy|fif|edf)$"}}]])
+        for mid, start, end in matcher(doc):
+            name = doc.vocab.strings[mid]
+            txt = doc[start:end].text
+            if name in ('FREQ_HZ','FREQ_ATTACHED'):
+                try:
+                    out['fs'] = _freq_to_hz(txt)
+                except Exception:
+                    pass
+            if name in ('PATH_WIN','PATH_UNIX') and 'data_path' not in out:
+                out['data_path'] = txt.strip('"\'')
+    except Exception:
+        pass
+    for ent in doc.ents:
+        if ent.label_ in ('CARDINAL', 'QUANTITY', 'PERCENT') and ent.text:
+            window = doc[max(0, ent.start - 3):ent.end + 3]
+            txt = window.text.lower()
+            if 'fs' in txt or 'sampling' in txt or 'frequency' in txt:
+                m_unit = re.search(r'(\d+(?:\.\d+)?\s*(?:k?m?hz|hz))', txt)
+                if m_unit:
+                    try:
+                        out['fs'] = _freq_to_hz(m_unit.group(1))
+                    except Exception:
+                        pass
+                elif 'fs' not in out:
+                    try:
+                        out['fs'] = float(ent.text)
+                    except Exception:
+                        pass
+        if '/' in ent.text or '\\' in ent.text:
+            t = ent.text.strip("'\"")
+            if any(t.lower().endswith(ext) for ext in ('.csv', '.mat', '.npy', '.fif', '.edf')):
+                out['data_path'] = t
+    for i, token in enumerate(doc[:-1]):
+        if token.like_num:
+            if doc[i+1].text.lower().startswith('hz'):
+                left = doc[max(0, i-4):i]
+                if any(t.text.lower() in ('sampling', 'rate', 'frequency', 'fs') for t in left):
+                    try:
+                        out['fs'] = float(token.text)
+                    except Exception:
+                        pass
+        if token.text.lower() == 'fs' and i + 1 < len(doc) and doc[i+1].like_num:
+            try:
+                out['fs'] = float(doc[i+1].text)
+            except Exception:
+                pass
+    if 'data_path' not in out:
+        m = re.search(r"(?P<path>['\"]?([A-Za-z]:)?[\\/\w\-\.]+\.(?:csv|mat|npy|fif|edf)['\"]?)", doc.text, flags=re.IGNORECASE)
+        if m:
+            out['data_path'] = m.group('path').strip('"\'')
+
+
+def legacy_token_fallbacks(doc):
+    """The token loops extract_parameters ran after enrichment (worst case: all of them)."""
+    found = {}
+    for i, token in enumerate(doc):
+        if token.text.lower().startswith('nperseg') and i + 1 < len(doc) and doc[i+1].like_num:
+            try:
+                found['nperseg'] = int(float(doc[i+1].text))
+                break
+            except Exception:
+                pass
+    for i, token in enumerate(doc[:-2]):
+        if token.like_num and doc[i+1].text.lower() in ('to', '-') and doc[i+2].like_num:
+            j = i + 3
+            if j < len(doc) and doc[j].text.lower().startswith('hz'):
+                try:
+                    found['bandpass'] = (float(token.text), float(doc[i+2].text))
+                    break
+                except Exception:
+                    pass
+    for token in doc:
+        if '/' in token.text and any(ext in token.text.lower() for ext in ('.csv', '.mat', '.npy', '.fif', '.edf')):
+            found['path'] = token.text.strip("'\"")
+            break
+    for i, token in enumerate(doc[:-1]):
+        if token.text.lower() == 'fs' and doc[i+1].like_num:
+            try:
+                found['fs_after_keyword'] = float(doc[i+1].text)
+                break
+            except Exception:
+                pass
+    for i, token in enumerate(doc[:-2]):
+        if token.like_num and doc[i+1].text.lower() in ('hz', 'hz.', 'hz,'):
+            window = doc[max(0, i-4):i]
+            if any(t.text.lower() in ('sampling', 'rate', 'frequency', 'fs') for t in window):
+                try:
+                    found['fs_before_hz'] = float(token.text)
+                    break
+                except Exception:
+                    pass
+    return found
+
+
+def legacy(doc):
+    out = {}
+    legacy_spacy_enrich_extraction(doc, out)
+    return out, legacy_token_fallbacks(doc)
+
+
+def fused(doc):
+    out = {}
+    scan = nlp_extractor._scan_doc(doc)
+    nlp_extractor.spacy_enrich_extraction(doc, out, scan=scan)
+    found = {k: getattr(scan, k) for k in ('nperseg', 'bandpass', 'path', 'fs_after_keyword', 'fs_before_hz')
+             if getattr(scan, k) is not None}
+    return out, found
+
+
+def _time(fn, docs, repeat):
+    timings = []
+    for doc in docs:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(doc)
+            timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare legacy and fused spaCy enrichment cost')
+    parser.add_argument('--tokens', type=int, default=10000, help='Approximate tokens per Methods section')
+    parser.add_argument('--docs', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    nlp = nlp_extractor._get_spacy_nlp()
+    if nlp is None:
+        print('spaCy is not installed; nothing to benchmark')
+        return 1
+    nlp.max_length = max(nlp.max_length, args.tokens * 10)
+    rng = random.Random(args.seed)
+    # ~6 characters per token in the synthetic prose
+    docs = [nlp(methods_text(args.tokens * 6, rng)) for _ in range(args.docs)]
+    for doc in docs:
+        if legacy(doc) != fused(doc):
+            print('MISMATCH between legacy and fused enrichment')
+            return 1
+    old_ms = _time(legacy, docs, args.repeat)
+    new_ms = _time(fused, docs, args.repeat)
+    tokens = statistics.mean(len(d) for d in docs)
+    print(f'tokens/doc: {tokens:.0f}')
+    print(f'legacy enrichment: {old_ms:8.2f} ms/doc')
+    print(f'fused enrichment:  {new_ms:8.2f} ms/doc  ({old_ms / new_ms:.1f}x)')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
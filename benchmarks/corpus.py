@@ -0,0 +1,155 @@
+"""Reproducible synthetic corpora for the benchmarks.
+
+Every generator takes an explicit `random.Random`, so a seed fully determines
+the text. Knobs:
+
+- `n_chars`: approximate document size (the last sentence may overshoot it)
+- `param_every`: one parameter sentence per N sentences (parameter density)
+- `units`: how frequencies are written: 'plain' (``500 Hz``), 'khz'
+  (``1 kHz``), 'attached' (``2048Hz``); sampled uniformly
+- `paths`: how data paths are written: 'unix', 'windows', 'quoted'
+- `dashes`: range separators, e.g. '-', ' to ', '\u2013'
+"""
+import random
+from typing import Dict, List, Sequence
+
+UNIT_VARIANTS = ('plain', 'khz', 'attached')
+PATH_VARIANTS = ('unix', 'windows', 'quoted')
+DASH_VARIANTS = ('-', ' to ', '\u2013')
+
+FILLER = [
+    "Participants were seated comfortably in a dimly lit room.",
+    "All procedures were approved by the local ethics committee.",
+    "Recordings lasted approximately twenty minutes per session.",
+    "Trials contaminated by excessive movement were discarded after visual inspection.",
+    "Statistical analyses were performed with a significance level of five percent.",
+    "The experimental paradigm followed the protocol described in previous work.",
+    "Electrode impedances were kept low throughout the recording.",
+    "Each block was preceded by a short practice run.",
+]
+
+PROSE = [
+    "Understanding neural dynamics remains a central question in systems neuroscience.",
+    "Previous studies have reported conflicting results across populations.",
+    "Our findings extend earlier observations to a larger cohort.",
+    "These results suggest that oscillatory activity tracks task demands.",
+    "Future work should address the limitations of the present design.",
+    "The effect was robust across subjects and sessions.",
+]
+
+# parser.parse_text looks for these goal/material/monitoring phrases
+PARSER_SENTENCES = [
+    "项目核心目标是能量供给与有害物质清除。",
+    "微囊材料可选海藻酸盐 (Alginate) 或聚乙二醇 (PEG)，孔径 50-100 kDa。",
+    "膜材料包括聚醚砜 PES 和聚丙烯腈 PAN，要求亲水性与中性电荷。",
+    "材料需具备弹性与稳定性，以保证长期植入。",
+    "监测方法包括 MRS、EEG、MEG、PET 与 MRI，并追踪 AQP4 的表达。",
+]
+PARSER_FILLER = [
+    "从神经科学的角度看，能量代谢和废物管理是维持神经元健康的两大基石。",
+    "工程化星形胶质细胞作为超级燃料站，为神经元提供乳酸。",
+    "接下来需要讨论工程细节和测试验证的问题。",
+]
+
+SECTIONS = ('Abstract', 'Introduction', 'Methods', 'Results', 'Discussion', 'References')
+
+
+def _freq(rng: random.Random, value: float, units: Sequence[str]) -> str:
+    style = rng.choice(units)
+    if style == 'khz' and value >= 1000:
+        return f"{value / 1000:g} kHz"
+    if style == 'attached':
+        return f"{value:g}Hz"
+    return f"{value:g} Hz"
+
+
+def _path(rng: random.Random, paths: Sequence[str]) -> str:
+    ext = rng.choice(('csv', 'mat', 'npy', 'fif', 'edf'))
+    sub = rng.randint(1, 40)
+    style = rng.choice(paths)
+    if style == 'windows':
+        return f"C:\\data\\sub-{sub:02d}\\run1.{ext}"
+    if style == 'quoted':
+        return f"'recordings/sub-{sub:02d}.{ext}'"
+    return f"data/sub-{sub:02d}/session1.{ext}"
+
+
+def parameter_sentence(rng: random.Random, units: Sequence[str] = UNIT_VARIANTS,
+                       paths: Sequence[str] = PATH_VARIANTS, dashes: Sequence[str] = DASH_VARIANTS) -> str:
+    """Return one Methods sentence carrying extractable parameters."""
+    fs = rng.choice((250, 256, 500, 512, 1000, 2048))
+    lo = rng.choice((0.1, 0.5, 1, 4))
+    hi = rng.choice((30, 40, 45, 100))
+    kind = rng.randrange(6)
+    if kind == 0:
+        return (f"We used Welch's method with nperseg={rng.choice((256, 512, 1024, 2048))} "
+                f"and window='{rng.choice(('hann', 'hamming', 'blackman'))}'.")
+    if kind == 1:
+        return f"Data were bandpass filtered {lo:g}{rng.choice(dashes)}{hi:g} Hz before analysis."
+    if kind == 2:
+        return f"Signals were sampled at fs = {_freq(rng, fs, units)} and stored in {_path(rng, paths)}."
+    if kind == 3:
+        return f"Sampling rate was {_freq(rng, fs, units)} and ICA was performed to remove artifacts."
+    if kind == 4:
+        return f"A {rng.randint(2, 8)}th order butterworth lowpass {hi} Hz filter was applied."
+    return f"Power spectra were computed (FFT) with nfft {rng.choice((512, 1024, 4096))} after a highpass {lo:g} Hz filter."
+
+
+def _fill(rng: random.Random, n_chars: int, make_param, filler: Sequence[str], param_every: int, sep: str = ' ') -> str:
+    parts = []
+    size = 0
+    i = 0
+    while size < n_chars:
+        s = make_param() if param_every and i % param_every == 0 else rng.choice(filler)
+        parts.append(s)
+        size += len(s) + len(sep)
+        i += 1
+    return sep.join(parts)
+
+
+def methods_text(n_chars: int, rng: random.Random, param_every: int = 8, units: Sequence[str] = UNIT_VARIANTS,
+                 paths: Sequence[str] = PATH_VARIANTS, dashes: Sequence[str] = DASH_VARIANTS) -> str:
+    """Return a Methods section of about `n_chars` characters."""
+    return _fill(rng, n_chars, lambda: parameter_sentence(rng, units, paths, dashes), FILLER, param_every)
+
+
+def paper_text(n_chars: int, rng: random.Random, methods_share: float = 0.3, param_every: int = 8,
+               units: Sequence[str] = UNIT_VARIANTS, paths: Sequence[str] = PATH_VARIANTS,
+               dashes: Sequence[str] = DASH_VARIANTS) -> str:
+    """Return a full paper (title + headed sections) of about `n_chars` characters.
+
+    `methods_share` of the body goes to the Methods section; the rest is
+    spread evenly over the other sections. Paragraphs are separated by blank
+    lines, like text extracted from a PDF.
+    """
+    methods_chars = int(n_chars * methods_share)
+    other_chars = max(1, (n_chars - methods_chars) // (len(SECTIONS) - 1))
+    lines = [f"Synthetic Study {rng.randint(1, 9999)}", ""]
+    for name in SECTIONS:
+        lines.append(name)
+        if name == 'Methods':
+            paragraphs = [methods_text(min(methods_chars, 1200), rng, param_every, units, paths, dashes)
+                          for _ in range(max(1, methods_chars // 1200))]
+        else:
+            paragraphs = [_fill(rng, min(other_chars, 1200), lambda: '', PROSE, 0)
+                          for _ in range(max(1, other_chars // 1200))]
+        lines.append('\n\n'.join(paragraphs))
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def parser_text(n_chars: int, rng: random.Random, param_every: int = 4) -> str:
+    """Return project notes in the style of read01.txt for parser.parse_text."""
+    return _fill(rng, n_chars, lambda: rng.choice(PARSER_SENTENCES), PARSER_FILLER, param_every, sep='\n')
+
+
+def generate(kind: str, n_docs: int, n_chars: int, seed: int = 0, **options) -> List[str]:
+    """Return `n_docs` documents of one kind ('methods', 'paper' or 'parser')."""
+    makers = {'methods': methods_text, 'paper': paper_text, 'parser': parser_text}
+    rng = random.Random(f'{kind}:{n_chars}:{seed}')
+    return [makers[kind](n_chars, rng, **options) for _ in range(n_docs)]
+
+
+def describe(options: Dict) -> Dict:
+    """Return the generator options with tuples turned into lists (for JSON)."""
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in options.items()}
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+"""Benchmark suite: time the extraction and notebook pipeline on a synthetic corpus.
+
+Writes a JSON file with one entry per (case, document size), keyed as
+``<case>@<chars>``, plus metadata (commit, Python, spaCy version, corpus
+options). Comparing two result files flags regressions between commits.
+
+Usage:
+    python -m benchmarks.run --out before.json
+    python -m benchmarks.run --out after.json --compare before.json [--fail-over 1.25]
+    python -m benchmarks.run --quick          # small sizes, for smoke testing
+    python -m benchmarks.run --workers 8      # also report per-worker memory of a WarmPool
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import datetime
+import tempfile
+import statistics
+import contextlib
+import subprocess
+from pathlib import Path
+
+# Ensure the repo root (for the benchmarks package) and src/ are importable
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+from benchmarks import corpus
+from astrocore import nlp_extractor, parser as text_parser, replicator, workers as warm_workers
+
+DEFAULT_SIZES = (2000, 20000, 200000)
+QUICK_SIZES = (2000, 20000)
+
+
+def _extract_case(backend: str):
+    """Return an extract_parameters case on one backend."""
+    def run(text):
+        return nlp_extractor.extract_parameters(text, cache=False, backend=backend)
+    return (f'extract_parameters/{backend}', 'methods', None, run, contextlib.nullcontext,
+            lambda: nlp_extractor.backend_available(backend))
+
+
+def _notebook_input(doc):
+    secs = replicator.extract_sections_from_text(doc)
+    return secs, nlp_extractor.extract_parameters(secs.get('Methods', ''), cache=False)
+
+
+def _notebook(doc):
+    secs, extraction = _notebook_input(doc)
+    return replicator.make_notebook_from_sections(secs, populate_code=True, extraction=extraction)
+
+
+def _cases(tmpdir: Path):
+    """Return (name, corpus kind, prepare, run, context, available) per case."""
+    nb_path = tmpdir / 'bench.ipynb'
+    return [_extract_case(backend) for backend in nlp_extractor.backends()] + [
+        ('parser.parse_text', 'parser', None, text_parser.parse_text, contextlib.nullcontext, lambda: True),
+        ('replicator.extract_sections_from_text', 'paper', None,
+         replicator.extract_sections_from_text, contextlib.nullcontext, lambda: True),
+        ('replicator.make_notebook_from_sections', 'paper', _notebook_input,
+         lambda arg: replicator.make_notebook_from_sections(arg[0], populate_code=True, extraction=arg[1]),
+         contextlib.nullcontext, lambda: True),
+        ('replicator.write_notebook', 'paper', _notebook,
+         lambda nb: replicator.write_notebook(nb, nb_path), contextlib.nullcontext, lambda: True),
+    ]
+
+
+def time_case(run, inputs, repeat: int = 3):
+    """Return per-call timings (seconds): the best of `repeat` runs per input."""
+    run(inputs[0])  # warm-up: lazy imports, model loading, regex compilation
+    timings = []
+    for arg in inputs:
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            run(arg)
+            best = min(best, time.perf_counter() - t0)
+        timings.append(best)
+    return timings
+
+
+def summarize(name: str, n_chars: int, docs, timings):
+    timings = sorted(timings)
+    total = sum(timings)
+    return {
+        'case': name,
+        'chars': n_chars,
+        'docs': len(timings),
+        'mean_ms': statistics.mean(timings) * 1000.0,
+        'median_ms': statistics.median(timings) * 1000.0,
+        'p95_ms': timings[min(len(timings) - 1, int(0.95 * len(timings)))] * 1000.0,
+        'min_ms': timings[0] * 1000.0,
+        'chars_per_s': sum(len(d) for d in docs) / total if total > 0 else None,
+    }
+
+
+def _git_commit():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, timeout=30)
+        return sha.stdout.strip() or None, bool(dirty.stdout.strip())
+    except Exception:
+        return None, None
+
+
+def _metadata(args, options):
+    commit, dirty = _git_commit()
+    try:
+        from importlib import metadata
+        spacy_version = metadata.version('spacy')
+    except Exception:
+        spacy_version = None
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'spacy': spacy_version,
+        'backends': {name: nlp_extractor.backend_available(name) for name in nlp_extractor.backends()},
+        'seed': args.seed,
+        'docs': args.docs,
+        'repeat': args.repeat,
+        'corpus': corpus.describe(options),
+    }
+
+
+def run_suite(sizes, n_docs: int = 10, seed: int = 0, repeat: int = 3, only=None, options=None, log=sys.stderr):
+    """Run every (selected) case at every size and return {key: summary}."""
+    options = options or {}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, kind, prepare, run, context, available in _cases(Path(tmp)):
+            if only and not any(o in name for o in only):
+                continue
+            if not available():
+                if log is not None:
+                    print(f'skip {name} (unavailable)', file=log)
+                continue
+            for n_chars in sizes:
+                kind_options = options if kind != 'parser' else {'param_every': options.get('param_every', 4)}
+                docs = corpus.generate(kind, n_docs, n_chars, seed, **kind_options)
+                inputs = [prepare(d) for d in docs] if prepare else docs
+                with context():
+                    timings = time_case(run, inputs, repeat)
+                row = summarize(name, n_chars, docs, timings)
+                results[f'{name}@{n_chars}'] = row
+                if log is not None:
+                    print(f"{name:<42} {n_chars:>8} {row['median_ms']:>10.3f} ms "
+                          f"{(row['chars_per_s'] or 0) / 1e6:>8.2f} Mchar/s", file=log)
+    return results
+
+
+def worker_memory(n_workers: int, docs, start_method: str = None):
+    """Extract `docs` on a WarmPool and return its timing and per-process memory (MiB)."""
+    t0 = time.perf_counter()
+    with warm_workers.WarmPool(n_workers, start_method=start_method) as pool:
+        pool.extract(docs)
+        memory = pool.memory()
+        start_method = pool.start_method
+    seconds = time.perf_counter() - t0
+    per_worker = [m for m in memory['workers'] if m is not None]
+    return {
+        'workers': n_workers,
+        'start_method': start_method,
+        'docs': len(docs),
+        'seconds': seconds,
+        'parent': memory['parent'],
+        'per_worker': per_worker,
+        'mean_private_mb': statistics.mean(m['private'] for m in per_worker) if per_worker else None,
+        'mean_rss_mb': statistics.mean(m['rss'] for m in per_worker) if per_worker else None,
+    }
+
+
+def backend_throughput(results):
+    """Return {backend: {chars: chars_per_s}} from the extract_parameters cases."""
+    table = {}
+    for row in results.values():
+        case = row['case']
+        if case.startswith('extract_parameters/'):
+            table.setdefault(case.split('/', 1)[1], {})[row['chars']] = row['chars_per_s']
+    return table
+
+
+def compare(new, old, fail_over: float = None, out=sys.stdout) -> bool:
+    """Print median-time ratios new/old per shared key; return False on a regression."""
+    ok = True
+    print(f"{'benchmark':<52} {'old ms':>10} {'new ms':>10} {'ratio':>7}", file=out)
+    for key in sorted(set(new) & set(old)):
+        before, after = old[key]['median_ms'], new[key]['median_ms']
+        ratio = after / before if before else float('inf')
+        flag = ''
+        if fail_over is not None and ratio > fail_over:
+            flag = '  REGRESSION'
+            ok = False
+        print(f"{key:<52} {before:>10.3f} {after:>10.3f} {ratio:>7.2f}{flag}", file=out)
+    return ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Run the AstroCore benchmark suite on a synthetic corpus')
+    ap.add_argument('--sizes', type=int, nargs='+', help='Document sizes in characters')
+    ap.add_argument('--docs', type=int, default=10, help='Documents per size')
+    ap.add_argument('--repeat', type=int, default=3, help='Timed runs per document (best is kept)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--param-every', type=int, default=8, help='One parameter sentence per N sentences')
+    ap.add_argument('--units', nargs='+', choices=corpus.UNIT_VARIANTS, default=list(corpus.UNIT_VARIANTS))
+    ap.add_argument('--paths', nargs='+', choices=corpus.PATH_VARIANTS, default=list(corpus.PATH_VARIANTS))
+    ap.add_argument('--only', nargs='+', help='Run only cases whose name contains one of these strings')
+    ap.add_argument('--quick', action='store_true', help='Small sizes and few documents')
+    ap.add_argument('--workers', type=int, default=0,
+                    help='Also extract the corpus on a WarmPool of this many workers and report their memory')
+    ap.add_argument('--start-method', choices=('fork', 'spawn', 'forkserver'),
+                    help='WarmPool start method (default: fork where available)')
+    ap.add_argument('--out', default='bench_results.json', help='Where to write the JSON results')
+    ap.add_argument('--compare', help='Earlier results file to compare against')
+    ap.add_argument('--fail-over', type=float, help='Exit with status 1 if a median time grows by more than this factor')
+    args = ap.parse_args(argv)
+
+    if args.quick:
+        args.docs = min(args.docs, 3)
+        args.repeat = 1
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    options = {'param_every': args.param_every, 'units': tuple(args.units), 'paths': tuple(args.paths)}
+
+    results = run_suite(sizes, args.docs, args.seed, args.repeat, args.only, options)
+    throughput = backend_throughput(results)
+    report = {'meta': _metadata(args, options), 'results': results, 'throughput': throughput}
+    if args.workers:
+        docs = corpus.generate('methods', max(args.docs, 4 * args.workers), sizes[-1], args.seed, **options)
+        report['workers'] = worker_memory(args.workers, docs, args.start_method)
+    Path(args.out).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'Wrote {len(results)} results to {args.out}')
+    for backend, by_size in throughput.items():
+        rates = ', '.join(f'{n} chars: {(r or 0) / 1e6:.2f} Mchar/s' for n, r in sorted(by_size.items()))
+        print(f'{backend:<12} {rates}')
+    pool = report.get('workers')
+    if pool:
+        parent = pool['parent'] or {}
+        if pool['mean_private_mb'] is None:
+            print(f"WarmPool ({pool['workers']} x {pool['start_method']}): {pool['seconds']:.2f}s, memory unavailable")
+        else:
+            print(f"WarmPool ({pool['workers']} x {pool['start_method']}): {pool['seconds']:.2f}s, "
+                  f"parent RSS {parent.get('rss', 0):.1f} MiB, per-worker RSS {pool['mean_rss_mb']:.1f} MiB "
+                  f"of which private {pool['mean_private_mb']:.1f} MiB")
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        if not compare(results, old['results'], args.fail_over):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+"""Run the AstroCore daemon: keeps extraction models loaded for CLI calls.
+
+Usage: python scripts/astrocore_daemon.py [--socket PATH] [--backend NAME]
+       python scripts/astrocore_daemon.py --stop
+
+See astrocore.daemon for the protocol and socket location.
+"""
+import sys
+from pathlib import Path
+
+# Ensure local src/ is on sys.path so the script works when invoked directly
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from astrocore.daemon import main
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
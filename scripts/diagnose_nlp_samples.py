@@ -6,10 +6,17 @@ SRC = ROOT / 'src'
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from astrocore.nlp_extractor import extract_parameters
+from astrocore import nlp_extractor, nlp_stats
+from astrocore.nlp_extractor import extract_parameters_batch
+import os
 import json
+import time
 import argparse
 import csv
+import itertools
+import contextlib
+import collections
+from concurrent.futures import ProcessPoolExecutor
 
 BUILTIN_SAMPLES = [
     "We used Welch's method with nperseg=1024 and window='hann' and a bandpass of 1-40 Hz.",
@@ -22,10 +29,10 @@ BUILTIN_SAMPLES = [
 ]
 
 
-def run(samples, out_path: str = 'diagnose_report.json', fmt: str = 'json'):
+def run(samples, out_path: str = 'diagnose_report.json', fmt: str = 'json', deadline_ms: float = None,
+        fields=None):
     rows = []
-    for s in samples:
-        res = extract_parameters(s)
+    for s, res in zip(samples, extract_parameters_batch(samples, deadline_ms=deadline_ms, fields=fields)):
         rows.append({'text': s, 'extraction': res})
 
     if fmt == 'json':
@@ -40,19 +47,180 @@ def run(samples, out_path: str = 'diagnose_report.json', fmt: str = 'json'):
     return rows
 
 
+def iter_samples(path):
+    """Yield non-blank, stripped lines of `path` without reading the whole file."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def _extract_chunk(chunk, options=None):
+    # runs in worker processes; must be a top-level function to be picklable.
+    # `options` are keyword arguments for extract_parameters_batch
+    return list(extract_parameters_batch(chunk, **(options or {})))
+
+
+def _extract_chunk_with_stats(chunk, options=None):
+    # worker variant that also returns the extractor counters for this chunk
+    with nlp_stats.collect() as stats:
+        results = _extract_chunk(chunk, options)
+    return results, stats.as_dict()
+
+
+def _read_checkpoint(path: Path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(path: Path, state) -> None:
+    # write-then-rename so an interrupted write never leaves a torn checkpoint
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(state), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def _ordered_results(chunks, workers: int, options=None):
+    """Yield (chunk, results) in input order, keeping at most 2*workers chunks in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, _extract_chunk(chunk, options)
+        return
+    stats = nlp_stats.current()
+
+    def result(fut):
+        if stats is None:
+            return fut.result()
+        results, snapshot = fut.result()
+        stats.merge(snapshot)
+        return results
+
+    task = _extract_chunk if stats is None else _extract_chunk_with_stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = collections.deque()
+        for chunk in chunks:
+            inflight.append((chunk, pool.submit(task, chunk, options)))
+            if len(inflight) >= 2 * workers:
+                chunk, fut = inflight.popleft()
+                yield chunk, result(fut)
+        while inflight:
+            chunk, fut = inflight.popleft()
+            yield chunk, result(fut)
+
+
+def run_stream(samples, out_path: str = 'diagnose_report.jsonl', workers: int = 1, checkpoint: str = None,
+               resume: bool = False, chunk_size: int = 64, progress_every: float = 5.0, log=sys.stderr,
+               deadline_ms: float = None, fields=None):
+    """Diagnose an arbitrarily long sample stream, appending one JSON row per sample.
+
+    Rows are written to `out_path` as JSONL as soon as their chunk finishes, and
+    a checkpoint (samples done + output byte offset) is updated after every
+    chunk. With `resume=True` the output is truncated back to the checkpointed
+    offset and the already-processed samples are skipped, so an interrupted run
+    continues where it stopped. With `deadline_ms`, each sample's extraction
+    is capped at that budget, and `fields` limits the extracted fields (see
+    extract_parameters). Returns the total number of samples written.
+    """
+    out = Path(out_path)
+    ckpt = Path(checkpoint) if checkpoint else out.with_name(out.name + '.ckpt')
+    state = _read_checkpoint(ckpt) if resume and out.exists() else None
+    if state is None:
+        state = {'done': 0, 'offset': 0}
+    done_before = state['done']
+
+    samples = itertools.islice(iter(samples), done_before, None)
+    chunks = iter(lambda: list(itertools.islice(samples, chunk_size)), [])
+
+    t0 = time.perf_counter()
+    last_report = t0
+    done = done_before
+    with open(out, 'r+b' if done_before else 'wb') as f:
+        f.truncate(state['offset'])
+        f.seek(state['offset'])
+        options = {'deadline_ms': deadline_ms, 'fields': fields}
+        for chunk, results in _ordered_results(chunks, workers, options):
+            for text, res in zip(chunk, results):
+                row = {'index': done, 'text': text, 'extraction': res}
+                f.write(json.dumps(row, ensure_ascii=False).encode('utf-8') + b'\n')
+                done += 1
+            f.flush()
+            _write_checkpoint(ckpt, {'done': done, 'offset': f.tell()})
+            now = time.perf_counter()
+            if log is not None and now - last_report >= progress_every:
+                rate = (done - done_before) / (now - t0)
+                print(f'{done} samples, {rate:.1f} samples/s', file=log, flush=True)
+                last_report = now
+    _write_checkpoint(ckpt, {'done': done, 'offset': out.stat().st_size, 'complete': True})
+
+    if log is not None:
+        elapsed = time.perf_counter() - t0
+        rate = (done - done_before) / elapsed if elapsed > 0 else 0.0
+        print(f'Processed {done - done_before} samples in {elapsed:.1f}s ({rate:.1f} samples/s)', file=log)
+    return done
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument('--infile', help='Optional file with one sample per line')
-    parser.add_argument('--out', default='diagnose_report.json', help='Output report path')
-    parser.add_argument('--format', default='json', choices=['json', 'csv'], help='Output format')
+    parser.add_argument('--out', help='Output report path (default: diagnose_report.json, '
+                                      'or diagnose_report.jsonl in streaming mode)')
+    parser.add_argument('--format', default='json', choices=['json', 'csv', 'jsonl'], help='Output format')
+    parser.add_argument('--workers', type=int, default=0, help='Process pool size; enables streaming JSONL mode')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Samples per worker task in streaming mode')
+    parser.add_argument('--checkpoint', help='Checkpoint path for streaming mode (default: <out>.ckpt)')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted streaming run from its checkpoint')
+    parser.add_argument('--cache', help="Extraction cache file (SQLite) or 'memory'; reused across runs")
+    parser.add_argument('--deadline-ms', type=float,
+                        help='Per-sample extraction budget; slow samples return partial results')
+    parser.add_argument('--backend', choices=('auto',) + nlp_extractor.backends(),
+                        help='Extraction backend (default: $ASTROCORE_BACKEND or auto)')
+    parser.add_argument('--fields', nargs='+', choices=nlp_extractor.FIELDS,
+                        help='Extract only these fields (faster single-field sweeps)')
+    parser.add_argument('--stats', nargs='?', const='-', metavar='JSON',
+                        help='Print per-rule/per-stage timing and hit counts; optionally also write them as JSON')
     args = parser.parse_args(argv)
 
-    samples = BUILTIN_SAMPLES
-    if args.infile:
-        samples = [l.strip() for l in Path(args.infile).read_text(encoding='utf-8').splitlines() if l.strip()]
+    # worker processes report their counters per chunk; they are merged here
+    with (nlp_stats.collect() if args.stats else contextlib.nullcontext()) as stats:
+        _main(args)
+    if stats is not None:
+        print(stats.report())
+        if args.stats != '-':
+            stats.to_json(args.stats)
+            print(f'Wrote extractor stats to {args.stats}')
+
+
+def _main(args):
+    if args.cache:
+        # exported so worker processes open the same cache
+        os.environ[nlp_extractor.CACHE_ENV_VAR] = args.cache
+    if args.backend:
+        # likewise for the backend, which workers resolve from the environment
+        os.environ[nlp_extractor.BACKEND_ENV_VAR] = args.backend
+
+    stream = bool(args.workers or args.format == 'jsonl' or args.resume)
+    if args.out is None:
+        args.out = 'diagnose_report.jsonl' if stream else 'diagnose_report.json'
+    if stream:
+        samples = iter_samples(args.infile) if args.infile else BUILTIN_SAMPLES
+        n = run_stream(samples, out_path=args.out, workers=max(1, args.workers), checkpoint=args.checkpoint,
+                       resume=args.resume, chunk_size=args.chunk_size, deadline_ms=args.deadline_ms,
+                       fields=args.fields)
+        print(f'Wrote {n} entries to {args.out}')
+    else:
+        samples = BUILTIN_SAMPLES
+        if args.infile:
+            samples = [l.strip() for l in Path(args.infile).read_text(encoding='utf-8').splitlines() if l.strip()]
+
+        rows = run(samples, out_path=args.out, fmt=args.format, deadline_ms=args.deadline_ms, fields=args.fields)
+        print(f'Wrote {len(rows)} entries to {args.out}')
 
-    rows = run(samples, out_path=args.out, fmt=args.format)
-    print(f'Wrote {len(rows)} entries to {args.out}')
+    cache = nlp_extractor.get_default_cache()
+    if cache is not None:
+        print(f'Extraction cache (this process): {json.dumps(cache.stats())}')
 
 
 if __name__ == '__main__':
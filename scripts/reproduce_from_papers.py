@@ -1,5 +1,17 @@
 #!/usr/bin/env python
-"""Command-line wrapper to generate reproduction notebooks from paper text files."""
+"""Command-line wrapper to generate reproduction notebooks from paper text files.
+
+Given a directory or a quoted glob pattern instead of a single paper, every
+matching .txt/.pdf paper is processed into the output directory, regenerating
+only out-of-date notebooks (see astrocore.batch). With --watch DIR --out
+OUTDIR it keeps running and regenerates notebooks as papers land in DIR
+(see astrocore.watch).
+
+Single papers are handed to a running AstroCore daemon when there is one
+(see astrocore.daemon), which keeps the models loaded between invocations;
+otherwise, or with --no-daemon, the work is done in this process.
+"""
+import os
 import sys
 from pathlib import Path
 
@@ -9,45 +21,116 @@ SRC = ROOT / 'src'
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+from astrocore import nlp_extractor
 from astrocore.replicator import generate_notebook_from_paper_file
 
 
 def main(argv):
     import argparse
     parser = argparse.ArgumentParser(description='Generate reproduction notebook from paper text or PDF')
-    parser.add_argument('paper', help='Path to paper text (.txt) or PDF (.pdf)')
-    parser.add_argument('out', help='Output notebook path (.ipynb)')
+    parser.add_argument('paper', nargs='?', help='Path to paper text (.txt) or PDF (.pdf), or a directory / glob of papers')
+    parser.add_argument('out', nargs='?', help='Output notebook path (.ipynb), or output directory for a directory / glob')
     parser.add_argument('--populate-code', action='store_true', help='Auto-populate code cell from Methods via NLP extraction')
     parser.add_argument('--dump-extraction-only', action='store_true', help='Only extract structured parameters and write a sidecar JSON without generating a notebook')
+    parser.add_argument('--backend', choices=('auto',) + nlp_extractor.backends(),
+                        help='Extraction backend (default: $ASTROCORE_BACKEND or auto)')
+    parser.add_argument('--methods-first', action='store_true',
+                        help='For PDFs, stop reading pages once the Methods section has ended')
+    parser.add_argument('--pdf-workers', type=int, default=None,
+                        help='Processes extracting PDF pages in parallel (default: $ASTROCORE_PDF_WORKERS or up to 8)')
+    parser.add_argument('--pdf-cache', default=None,
+                        help='SQLite file caching text extracted from PDFs (default: $ASTROCORE_PDF_CACHE, off if unset)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Batch mode: papers processed in parallel (default: 1)')
+    parser.add_argument('--force', action='store_true', help='Batch mode: regenerate up-to-date notebooks too')
+    parser.add_argument('--no-daemon', action='store_true', help='Do not use a running AstroCore daemon')
+    parser.add_argument('--watch', metavar='DIR', help='Watch DIR and regenerate notebooks as papers are added or changed')
+    parser.add_argument('--out', dest='watch_out', metavar='OUTDIR', help='Output directory for --watch')
     args = parser.parse_args(argv[1:])
 
+    if args.watch:
+        if not args.watch_out or args.paper or args.dump_extraction_only:
+            parser.error('--watch takes --out OUTDIR and no paper arguments')
+        from astrocore import replicator, watch
+        if args.backend:
+            nlp_extractor.set_default_backend(args.backend)
+        if args.pdf_cache:
+            replicator.set_default_pdf_cache(replicator.open_pdf_cache(args.pdf_cache))
+        print(f"Watching {args.watch} -> {args.watch_out} (Ctrl-C to stop)", flush=True)
+        try:
+            watch.watch(args.watch, args.watch_out, populate_code=args.populate_code, methods_first=args.methods_first,
+                        on_build=lambda report: print(report.summary(), flush=True))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if not args.paper or not args.out:
+        parser.error('paper and out are required')
+
+    from astrocore import batch
+    if batch.is_batch_spec(args.paper):
+        if args.dump_extraction_only:
+            print('--dump-extraction-only takes a single paper')
+            return 2
+        report = batch.build(args.paper, args.out, workers=args.workers, populate_code=args.populate_code,
+                             methods_first=args.methods_first, force=args.force, backend=args.backend,
+                             pdf_cache=args.pdf_cache, pdf_workers=args.pdf_workers)
+        print(report.summary())
+        return 0 if report.ok else 1
+
     paper = Path(args.paper)
     out = Path(args.out)
     if not paper.exists():
         print(f"Paper file not found: {paper}")
         return 2
 
-    from astrocore import nlp_extractor
+    from astrocore import daemon, replicator
     from astrocore.replicator import generate_notebook_from_paper_file
+    # the daemon has its own PDF text cache, so --pdf-cache runs in process
+    use_daemon = not args.no_daemon and not args.pdf_cache
+    remote = {'methods_first': args.methods_first, 'pdf_workers': args.pdf_workers,
+              'backend': nlp_extractor.resolve_backend(args.backend)}
+    if args.backend:
+        nlp_extractor.set_default_backend(args.backend)
+    if args.pdf_cache:
+        replicator.set_default_pdf_cache(replicator.open_pdf_cache(args.pdf_cache))
 
     if args.dump_extraction_only:
-        text = None
-        if paper.suffix.lower() == '.pdf':
+        extraction = None
+        if use_daemon:
             try:
-                from astrocore.replicator import pdf_to_text
-                text = pdf_to_text(paper)
-            except Exception as e:
-                print(str(e))
-                return 2
-        else:
-            text = paper.read_text(encoding='utf-8')
-        extraction = nlp_extractor.extract_parameters(text)
+                extraction = daemon.request('extract', paper=str(paper.resolve()), **remote)
+            except daemon.DaemonUnavailable:
+                extraction = None  # no usable daemon: extract here
+        if extraction is None:
+            text = None
+            if paper.suffix.lower() == '.pdf':
+                try:
+                    from astrocore.replicator import pdf_to_text, pdf_to_text_until_methods
+                    if args.methods_first:
+                        text = pdf_to_text_until_methods(paper, workers=args.pdf_workers)
+                    else:
+                        text = pdf_to_text(paper, workers=args.pdf_workers)
+                except Exception as e:
+                    print(str(e))
+                    return 2
+            else:
+                text = paper.read_text(encoding='utf-8')
+            extraction = nlp_extractor.extract_parameters(text)
         sidecar = out.with_suffix('.extraction.json')
         sidecar.write_text(__import__('json').dumps(extraction, ensure_ascii=False, indent=2), encoding='utf-8')
         print(f"Extraction written to: {sidecar}")
         return 0
 
-    generate_notebook_from_paper_file(paper, out, populate_code=args.populate_code)
+    if use_daemon:
+        try:
+            daemon.request('notebook', paper=str(paper.resolve()), out=str(out.resolve()),
+                           populate_code=args.populate_code, **remote)
+            print(f"Notebook written to: {out}")
+            return 0
+        except daemon.DaemonUnavailable:
+            pass  # as above: generate in process
+    generate_notebook_from_paper_file(paper, out, populate_code=args.populate_code,
+                                      methods_first=args.methods_first, pdf_workers=args.pdf_workers)
     print(f"Notebook written to: {out}")
     return 0
 
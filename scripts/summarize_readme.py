@@ -1,5 +1,8 @@
 #!/usr/bin/env python
-"""Command-line utility: read a text file and print JSON summary."""
+"""Command-line utility: read a text file and print JSON summary.
+
+Uses a running AstroCore daemon (astrocore.daemon) when there is one.
+"""
 import sys
 import json
 from pathlib import Path
@@ -17,7 +20,12 @@ def main():
         sys.exit(2)
 
     text = path.read_text(encoding="utf-8")
-    summary = summarize_to_json(text)
+    from astrocore import daemon
+    try:
+        summary = daemon.request('summarize', text=text)
+    except daemon.DaemonUnavailable:
+        # no usable daemon: summarize in process
+        summary = summarize_to_json(text)
     print(json.dumps(summary, ensure_ascii=False, indent=2))
 
 
@@ -1,3 +1,22 @@
-"""AstroCore package - minimal utilities for parsing project brief."""
+"""AstroCore package - minimal utilities for parsing project brief.
 
-__all__ = ["parser"]
+Submodules are imported lazily on first attribute access (PEP 562), so
+``import astrocore`` does not pull in the NLP or notebook tooling.
+"""
+import importlib
+
+__all__ = ["parser", "nlp_extractor", "codegen", "replicator"]
+
+# advanced_parser is importable explicitly but is not listed in __all__ because
+# it raises ImportError when spaCy is missing.
+_SUBMODULES = frozenset(__all__) | {"advanced_parser"}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
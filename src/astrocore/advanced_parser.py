@@ -3,27 +3,49 @@
 This module attempts to provide a richer NLP-based extraction. It's
 optional: if spaCy is not installed, callers should fall back to the
 heuristic parser in parser.py.
+
+The model comes from the process-wide pool in model_pool, so it is loaded
+and warmed up once per process, with the components entity extraction does
+not use disabled.
 """
-from typing import Dict
+from typing import Dict, Iterable, Iterator
 
 try:
     import spacy
 except Exception as e:
     raise ImportError("spaCy not available; install spacy to use advanced_parser")
 
+from astrocore import model_pool
 
-def parse_text_advanced(text: str) -> Dict:
-    """Perform named-entity-like extraction using spaCy.
+DEFAULT_MODEL = "en_core_web_sm"
+# only the NER (and the tok2vec it may listen to) is used
+DISABLED_COMPONENTS = ("tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer")
+_MATERIAL_LABELS = ("PRODUCT", "ORG", "NORP")
 
-    Returns a dict similar to parser.parse_text but with possibly richer
-    extracted fields.
-    """
-    nlp = spacy.load("en_core_web_sm")
-    doc = nlp(text)
+
+def _summarize_doc(doc) -> Dict:
     # Very small proof-of-concept: extract ORG/PRODUCT-like tokens as materials
     materials = []
     for ent in doc.ents:
-        if ent.label_ in ("PRODUCT", "ORG", "NORP"):
+        if ent.label_ in _MATERIAL_LABELS:
             materials.append(ent.text)
 
     return {"materials": materials}
+
+
+def parse_text_advanced(text: str, model: str = DEFAULT_MODEL) -> Dict:
+    """Perform named-entity-like extraction using spaCy.
+
+    Returns a dict similar to parser.parse_text but with possibly richer
+    extracted fields.
+    """
+    nlp = model_pool.get_model(model, disable=DISABLED_COMPONENTS)
+    return _summarize_doc(nlp(text))
+
+
+def parse_many_advanced(texts: Iterable[str], model: str = DEFAULT_MODEL, batch_size: int = 64,
+                        n_process: int = 1) -> Iterator[Dict]:
+    """Yield parse_text_advanced results for many texts, in order, batched via nlp.pipe."""
+    for doc in model_pool.pipe(texts, model, disable=DISABLED_COMPONENTS,
+                               batch_size=batch_size, n_process=n_process):
+        yield _summarize_doc(doc)
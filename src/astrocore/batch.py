@@ -0,0 +1,284 @@
+"""Incremental batch generation of reproduction notebooks.
+
+`build` turns a directory or glob of papers (.txt/.pdf) into notebooks and
+extraction sidecars under an output directory, like `make`: a manifest
+(``.astrocore-manifest.json`` in the output directory) records, for every
+paper, the hash of its bytes, the extractor and codegen versions and the
+generation options, and a paper is regenerated only when one of them changed
+or one of its outputs is missing. Papers are spread over a process pool, so
+interpreter start-up and model loading are paid once per worker, not per paper::
+
+    from astrocore import batch
+    report = batch.build('papers/', 'notebooks/', workers=8)
+    print(report.summary())
+
+Failed papers are reported and left out of the manifest, so the next run
+retries them.
+"""
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import os
+import glob
+import json
+import time
+import multiprocessing
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from astrocore import cache, codegen, nlp_extractor, replicator
+
+MANIFEST_NAME = '.astrocore-manifest.json'
+MANIFEST_VERSION = 1
+PAPER_SUFFIXES = ('.txt', '.pdf')
+
+
+@dataclass
+class BatchReport:
+    """Outcome of a build: (paper, seconds) for rebuilt papers, (paper, error) for failures."""
+    rebuilt: List[Tuple[str, float]] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def summary(self) -> str:
+        busy = sum(t for _, t in self.rebuilt)
+        lines = [f"rebuilt {len(self.rebuilt)}, skipped {len(self.skipped)}, failed {len(self.failed)} "
+                 f"in {self.seconds:.2f}s ({busy:.2f}s generating)"]
+        for paper, seconds in sorted(self.rebuilt, key=lambda r: -r[1])[:10]:
+            lines.append(f"  rebuilt {paper} ({seconds:.2f}s)")
+        for paper, error in self.failed:
+            lines.append(f"  FAILED {paper}: {error}")
+        return "\n".join(lines)
+
+
+def is_batch_spec(spec) -> bool:
+    """True if `spec` names a directory or is a glob pattern rather than a single paper."""
+    return Path(spec).is_dir() or glob.has_magic(str(spec))
+
+
+def collect_papers(spec) -> Tuple[Path, List[Path]]:
+    """Return (base directory, sorted paper paths) for a directory or glob pattern.
+
+    A directory is searched recursively for .txt and .pdf files; for a glob,
+    the base is the directory part before the first wildcard. Output paths
+    mirror paper paths relative to the base.
+    """
+    spec = str(spec)
+    if Path(spec).is_dir():
+        base = Path(spec)
+        papers = [p for p in base.rglob('*') if p.suffix.lower() in PAPER_SUFFIXES and p.is_file()]
+    else:
+        parts = Path(spec).parts
+        fixed = parts[:next(i for i, part in enumerate(parts) if glob.has_magic(part))]
+        base = Path(*fixed) if fixed else Path('.')
+        papers = [Path(p) for p in glob.glob(spec, recursive=True)
+                  if Path(p).suffix.lower() in PAPER_SUFFIXES and Path(p).is_file()]
+    return base, sorted(papers)
+
+
+def output_paths(paper: Path, base: Path, out_dir: Path) -> Tuple[Path, Path]:
+    """The notebook and extraction sidecar written for `paper`."""
+    notebook = Path(out_dir) / Path(paper).relative_to(base).with_suffix('.ipynb')
+    return notebook, notebook.with_suffix('.extraction.json')
+
+
+def load_manifest(out_dir: Path) -> Dict[str, Dict]:
+    """Return the manifest entries of `out_dir`, keyed by notebook path relative to it ({} if none)."""
+    try:
+        data = json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return {}
+    return dict(data.get('entries') or {})
+
+
+def save_manifest(out_dir: Path, entries: Dict[str, Dict]) -> None:
+    path = Path(out_dir) / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps({'version': MANIFEST_VERSION, 'entries': entries}, indent=1, sort_keys=True),
+                   encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def _fingerprint(paper: Path, previous: Optional[Dict]) -> Dict:
+    # hashing every paper each night would dominate a no-op rebuild, so the
+    # digest is reused while size and mtime are unchanged
+    st = paper.stat()
+    digest = None
+    if previous and previous.get('size') == st.st_size and previous.get('mtime_ns') == st.st_mtime_ns:
+        digest = previous.get('sha256')
+    if not digest:
+        digest = cache.file_digest(paper)
+    return {'paper': str(paper), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+
+
+def _stale(entry: Dict, previous: Optional[Dict], outputs: Iterable[Path]) -> bool:
+    if not previous:
+        return True
+    if any(entry[k] != previous.get(k) for k in ('sha256', 'extractor', 'codegen', 'options')):
+        return True
+    return not all(p.exists() for p in outputs)
+
+
+def _output_owner(previous: Optional[Dict], paper: Path) -> Optional[str]:
+    # the other paper an existing output was generated from, while it exists
+    if not previous or previous.get('paper') == str(paper):
+        return None
+    try:
+        return None if os.path.samefile(previous['paper'], paper) else previous['paper']
+    except OSError:
+        return None
+
+
+def _start_method() -> Optional[str]:
+    # the start method the caller chose, else fork where available so workers
+    # share the warm models (see astrocore.workers); asking with allow_none
+    # leaves the caller free to call set_start_method later
+    method = multiprocessing.get_start_method(allow_none=True)
+    if method is None and 'fork' in multiprocessing.get_all_start_methods():
+        method = 'fork'
+    return method
+
+
+# PDF text cache of a pool worker, opened in the worker by _init_worker
+_worker_pdf_cache = None
+
+
+def _init_worker(pdf_cache: Optional[str]) -> None:
+    global _worker_pdf_cache
+    if pdf_cache:
+        _worker_pdf_cache = replicator.open_pdf_cache(pdf_cache)
+
+
+def _generate(paper: str, notebook: str, options: Dict, pdf_workers: Optional[int], backend: str,
+              pdf_cache=None) -> float:
+    t0 = time.perf_counter()
+    replicator.generate_notebook_from_paper_file(Path(paper), Path(notebook), populate_code=options['populate_code'],
+                                                 methods_first=options['methods_first'], pdf_workers=pdf_workers,
+                                                 backend=backend,
+                                                 pdf_cache=pdf_cache if pdf_cache is not None else _worker_pdf_cache)
+    return time.perf_counter() - t0
+
+
+def build(spec, out_dir, workers: int = 1, populate_code: bool = False, methods_first: bool = False,
+          force: bool = False, backend: Optional[str] = None, pdf_cache=None,
+          pdf_workers: Optional[int] = None) -> BatchReport:
+    """Generate notebooks for the papers matched by `spec` that are out of date.
+
+    `spec` is a directory or glob pattern (see collect_papers); outputs go to
+    `out_dir`, mirroring the papers' relative paths. With `workers` > 1
+    papers are generated in that many processes, each extracting PDF pages
+    serially; otherwise PDFs use `pdf_workers` (see iter_pdf_pages). `force`
+    regenerates everything. `backend` and `pdf_cache` (a path) select the
+    extraction backend and PDF text cache for this build only; by default
+    they follow the process defaults, as in a single run.
+
+    Two papers that map to the same outputs (``a.txt`` and ``a.pdf``) are
+    reported as failed instead of overwriting each other's notebook. Manifest
+    entries of papers no longer matched by `spec` (deleted or renamed) are
+    dropped; their old outputs are left in place.
+    """
+    base, papers = collect_papers(spec)
+    return build_papers(papers, base, out_dir, workers=workers, populate_code=populate_code,
+                        methods_first=methods_first, force=force, backend=backend, pdf_cache=pdf_cache,
+                        pdf_workers=pdf_workers, prune=True)
+
+
+def build_papers(papers: Iterable[Path], base: Path, out_dir, workers: int = 1, populate_code: bool = False,
+                 methods_first: bool = False, force: bool = False, backend: Optional[str] = None,
+                 pdf_cache=None, pdf_workers: Optional[int] = None, prune: bool = False) -> BatchReport:
+    """Like build, for the given papers (paths under `base`) instead of a directory or glob.
+
+    Other papers' manifest entries are kept, unless `prune` says that
+    `papers` are all the papers there are.
+    """
+    t_start = time.perf_counter()
+    out_dir = Path(out_dir)
+    base = Path(base)
+    pdf_cache = str(pdf_cache) if pdf_cache else None
+    backend = nlp_extractor.resolve_backend(backend)
+    options = {'populate_code': bool(populate_code), 'methods_first': bool(methods_first)}
+    versions = {'extractor': f'{nlp_extractor.cache_version()}+{backend}',
+                'codegen': codegen.codegen_version()}
+    manifest = load_manifest(out_dir)
+    report = BatchReport()
+
+    claims: Dict[str, List[Tuple[Path, Path, Path]]] = {}
+    for paper in papers:
+        paper = Path(paper)
+        notebook, sidecar = output_paths(paper, base, out_dir)
+        claims.setdefault(notebook.relative_to(out_dir).as_posix(), []).append((paper, notebook, sidecar))
+    if prune:
+        for key in set(manifest) - set(claims):
+            del manifest[key]
+
+    todo = []
+    for key, claimants in claims.items():
+        previous = manifest.get(key)
+        if len(claimants) > 1:
+            manifest.pop(key, None)
+            names = ', '.join(str(p) for p, _, _ in claimants)
+            report.failed.extend((str(p), f'output {key} would be generated from each of {names}')
+                                 for p, _, _ in claimants)
+            continue
+        paper, notebook, sidecar = claimants[0]
+        owner = _output_owner(previous, paper)
+        if owner is not None:
+            report.failed.append((str(paper), f'output {key} is already generated from {owner}'))
+            continue
+        try:
+            entry = dict(_fingerprint(paper, previous), options=options, **versions)
+        except OSError as e:
+            report.failed.append((str(paper), f'{type(e).__name__}: {e}'))
+            continue
+        if force or _stale(entry, previous, (notebook, sidecar)):
+            todo.append((key, entry, notebook))
+        else:
+            manifest[key] = entry
+            report.skipped.append(str(paper))
+
+    def done(key, entry, seconds=None, error=None):
+        if error is None:
+            manifest[key] = entry
+            report.rebuilt.append((entry['paper'], seconds))
+        else:
+            manifest.pop(key, None)
+            report.failed.append((entry['paper'], f'{type(error).__name__}: {error}'))
+
+    cache = None
+    try:
+        if workers <= 1 or len(todo) <= 1:
+            cache = replicator.open_pdf_cache(pdf_cache) if pdf_cache and todo else None
+            for key, entry, notebook in todo:
+                try:
+                    done(key, entry, _generate(entry['paper'], str(notebook), options, pdf_workers, backend, cache))
+                except Exception as e:
+                    done(key, entry, error=e)
+        else:
+            method = _start_method()
+            if method == 'fork':
+                # forked workers then share the loaded models copy-on-write (see astrocore.workers)
+                nlp_extractor.warm_up(backend)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                                     initializer=_init_worker, initargs=(pdf_cache,)) as pool:
+                futures = {pool.submit(_generate, entry['paper'], str(notebook), options, 1, backend): (key, entry)
+                           for key, entry, notebook in todo}
+                for fut in as_completed(futures):
+                    key, entry = futures[fut]
+                    try:
+                        done(key, entry, fut.result())
+                    except Exception as e:
+                        done(key, entry, error=e)
+    finally:
+        # keep finished work recorded even if the build is interrupted
+        save_manifest(out_dir, manifest)
+        if cache is not None:
+            cache.close()
+    report.seconds = time.perf_counter() - t_start
+    return report
@@ -0,0 +1,376 @@
+"""Content-addressed caches for deterministic, expensive results.
+
+`ExtractionCache` memoizes `nlp_extractor.extract_parameters` results keyed by
+a hash of the input text plus the extractor version and options. It has two
+tiers: an in-memory LRU and an optional persistent SQLite file with
+size-based eviction (least recently used rows are dropped first).
+
+`PdfTextCache` keeps the text PyMuPDF extracted from PDFs, keyed by a hash of
+the PDF file's bytes, one zlib-compressed row per page, in the same kind of
+SQLite file.
+
+Cached values are pickled. The cache file is trusted local data; do not point
+it at files from untrusted sources.
+"""
+from pathlib import Path
+import os
+import time
+import zlib
+import pickle
+import sqlite3
+import hashlib
+import threading
+import collections
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+def content_key(text: str, version: str, **options) -> str:
+    """Return a hex digest identifying `text` under an extractor version and options.
+
+    The text is hashed verbatim: extraction depends on exact characters and
+    offsets, so any normalization that could change results would make cached
+    entries unsound.
+    """
+    h = hashlib.sha256()
+    h.update(version.encode('utf-8'))
+    for k in sorted(options):
+        h.update(b'\0' + k.encode('utf-8') + b'=' + repr(options[k]).encode('utf-8'))
+    h.update(b'\0\0')
+    h.update((text or '').encode('utf-8', 'surrogatepass'))
+    return h.hexdigest()
+
+
+class _SqliteStore:
+    """Key -> blob store in a single SQLite file, bounded by total blob size.
+
+    Rows carry a version tag; rows written under another version are deleted
+    when the store is opened. Connections are per process, so a store can be
+    inherited by forked workers. Access times of rows read are written lazily,
+    in batches, with the next write or eviction check, or on close.
+    """
+
+    _EVICT_CHECK_EVERY = 64
+    _TOUCH_FLUSH_EVERY = 64
+
+    def __init__(self, path, version: str, max_bytes: int, table: str = 'entries'):
+        self.path = Path(path)
+        self.version = version
+        self.max_bytes = int(max_bytes)
+        self.table = table
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._puts = 0
+        # key -> access time not yet written
+        self._touched = {}
+
+    def _connect(self):
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                     'key TEXT PRIMARY KEY, version TEXT, value BLOB, size INTEGER, atime REAL)')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_atime ON {self.table}(atime)')
+        # automatic invalidation: drop everything written by other versions
+        conn.execute(f'DELETE FROM {self.table} WHERE version != ?', (self.version,))
+        conn.commit()
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(f'SELECT value FROM {self.table} WHERE key = ? AND version = ?',
+                               (key, self.version)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= self._TOUCH_FLUSH_EVERY:
+                self._flush_touched(conn)
+                conn.commit()
+            return row[0]
+
+    def _flush_touched(self, conn) -> None:
+        if self._touched:
+            conn.executemany(f'UPDATE {self.table} SET atime = ? WHERE key = ?',
+                             [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            conn = self._connect()
+            self._flush_touched(conn)
+            conn.execute(f'INSERT OR REPLACE INTO {self.table} (key, version, value, size, atime) VALUES (?, ?, ?, ?, ?)',
+                         (key, self.version, sqlite3.Binary(value), len(value), time.time()))
+            conn.commit()
+            self._puts += 1
+            if self._puts % self._EVICT_CHECK_EVERY == 0:
+                self._evict(conn)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        """Return {key: value} for those of `keys` that are stored, touching them all at once."""
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            # stay well below SQLite's limit on bound parameters
+            for i in range(0, len(keys), 500):
+                chunk = list(keys[i:i + 500])
+                marks = ','.join('?' * len(chunk))
+                found.update(conn.execute(f'SELECT key, value FROM {self.table} WHERE version = ? AND key IN ({marks})',
+                                          [self.version] + chunk).fetchall())
+            now = time.time()
+            self._touched.update((k, now) for k in found)
+            if len(self._touched) >= self._TOUCH_FLUSH_EVERY:
+                self._flush_touched(conn)
+                conn.commit()
+        return found
+
+    def put_many(self, items: Iterable) -> None:
+        """Store (key, value) pairs in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            self._flush_touched(conn)
+            now = time.time()
+            rows = [(k, self.version, sqlite3.Binary(v), len(v), now) for k, v in items]
+            conn.executemany(f'INSERT OR REPLACE INTO {self.table} (key, version, value, size, atime) VALUES (?, ?, ?, ?, ?)',
+                             rows)
+            conn.commit()
+            before = self._puts // self._EVICT_CHECK_EVERY
+            self._puts += len(rows)
+            if self._puts // self._EVICT_CHECK_EVERY != before:
+                self._evict(conn)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            return conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.table}').fetchone()[0]
+
+    def evict(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            self._flush_touched(conn)
+            conn.commit()
+            self._evict(conn)
+
+    def _evict(self, conn) -> None:
+        total = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.table}').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least recently used rows until the store is at 90% of its cap
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute(f'SELECT key, size FROM {self.table} ORDER BY atime ASC').fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany(f'DELETE FROM {self.table} WHERE key = ?', doomed)
+        conn.commit()
+        self.evictions += len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            self._touched.clear()
+            conn.execute(f'DELETE FROM {self.table}')
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._flush_touched(self._conn)
+                self._conn.commit()
+                self._conn.close()
+            self._conn = None
+            self._touched.clear()
+
+
+class ExtractionCache:
+    """Two-tier (memory LRU + optional SQLite file) cache for extraction results.
+
+    `version` must change whenever extraction output could change; the
+    extractor passes its EXTRACTOR_VERSION. Entries from other versions are
+    never returned and are purged from disk on open.
+    """
+
+    def __init__(self, path=None, version: str = '', max_memory_entries: int = 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.version = version
+        self.max_memory_entries = int(max_memory_entries)
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _SqliteStore(path, version, max_disk_bytes) if path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def key(self, text: str, **options) -> str:
+        return content_key(text, self.version, **options)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh copy of the cached value for `key`, or None."""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return pickle.loads(blob)
+        blob = self._disk.get(key) if self._disk is not None else None
+        if blob is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, bytes(blob))
+        return pickle.loads(blob)
+
+    def put(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.writes += 1
+            self._remember(key, blob)
+        if self._disk is not None:
+            self._disk.put(key, blob)
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for this process."""
+        hits = self.memory_hits + self.disk_hits
+        return {
+            'hits': hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'memory_entries': len(self._memory),
+            'disk_evictions': self._disk.evictions if self._disk is not None else 0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+
+# Bump when the layout of cached PDF text changes.
+PDF_TEXT_CACHE_VERSION = '2'
+
+
+def file_digest(path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's bytes (FileNotFoundError if it is missing)."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def pymupdf_version() -> str:
+    """Installed PyMuPDF version from package metadata ('none' if it is not installed)."""
+    from importlib import metadata
+    for dist in ('PyMuPDF', 'pymupdf'):
+        try:
+            return metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return 'none'
+
+
+class PdfTextCache:
+    """Persistent per-page cache of text extracted from PDF files.
+
+    Documents are identified by the SHA-256 of the PDF's bytes, so renamed or
+    copied files hit and edited files miss. The store is tagged with the
+    PyMuPDF version (plus PDF_TEXT_CACHE_VERSION), and text extracted by other
+    versions is purged on open. Each page is a separate row, so callers can
+    read a few pages of a document and eviction (least recently used first,
+    once `max_bytes` of compressed text is exceeded) can drop some pages of a
+    document; missing pages are reported as misses for the caller to re-extract.
+    Page counts live in a table of their own, so evicting pages never loses
+    the count needed to read back the pages that remain.
+    """
+
+    def __init__(self, path, max_bytes: int = 1024 * 1024 * 1024, version: Optional[str] = None):
+        if version is None:
+            version = f'{PDF_TEXT_CACHE_VERSION}-pymupdf-{pymupdf_version()}'
+        self.version = version
+        self._disk = _SqliteStore(path, version, max_bytes, table='pdf_pages')
+        # a few bytes per document: in practice never evicted
+        self._counts = _SqliteStore(path, version, max_bytes, table='pdf_documents')
+        self.page_hits = 0
+        self.page_misses = 0
+        self.writes = 0
+
+    @property
+    def path(self) -> Path:
+        return self._disk.path
+
+    def key(self, path) -> str:
+        """Return the cache key (content digest) of the PDF at `path`."""
+        return file_digest(path)
+
+    def page_count(self, key: str) -> Optional[int]:
+        """Number of pages recorded for the document, or None if it was never cached."""
+        blob = self._counts.get(key)
+        return None if blob is None else int(bytes(blob))
+
+    def set_page_count(self, key: str, count: int) -> None:
+        self._counts.put(key, str(int(count)).encode('ascii'))
+
+    def get_pages(self, key: str, start: int, stop: int) -> List[Optional[str]]:
+        """Text of pages start..stop-1 of the document, None for pages not cached."""
+        keys = [f'{key}:{i}' for i in range(start, stop)]
+        found = self._disk.get_many(keys)
+        pages = [None if k not in found else zlib.decompress(found[k]).decode('utf-8', 'surrogatepass') for k in keys]
+        hits = len(found)
+        self.page_hits += hits
+        self.page_misses += len(keys) - hits
+        return pages
+
+    def put_pages(self, key: str, start: int, texts: Sequence[str]) -> None:
+        """Store the text of consecutive pages starting at page `start`."""
+        if not texts:
+            return
+        self._disk.put_many((f'{key}:{start + i}', zlib.compress(t.encode('utf-8', 'surrogatepass')))
+                            for i, t in enumerate(texts))
+        self.writes += len(texts)
+
+    def total_bytes(self) -> int:
+        return self._disk.total_bytes()
+
+    def stats(self) -> Dict[str, int]:
+        """Return page hit/miss counters for this process."""
+        return {
+            'page_hits': self.page_hits,
+            'page_misses': self.page_misses,
+            'writes': self.writes,
+            'disk_evictions': self._disk.evictions,
+        }
+
+    def evict(self) -> None:
+        self._disk.evict()
+
+    def clear(self) -> None:
+        self._disk.clear()
+        self._counts.clear()
+
+    def close(self) -> None:
+        self._disk.close()
+        self._counts.close()
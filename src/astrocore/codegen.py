@@ -3,8 +3,33 @@
 Generates runnable Python code snippets (as list of source lines) given
 extracted parameters from `nlp_extractor`.
 """
+from pathlib import Path
+import hashlib
 from typing import Dict, List, Optional
 
+from astrocore import ontology
+
+# Bump when generated code or notebook layout changes. codegen_version() also
+# folds in a digest of this module, the notebook writer and the method
+# ontology, so outputs built by older sources are recognised as stale.
+CODEGEN_VERSION = '1'
+_CODEGEN_VERSION_TAG = None
+
+
+def codegen_version() -> str:
+    """Return the version tag of code and notebook generation (see CODEGEN_VERSION)."""
+    global _CODEGEN_VERSION_TAG
+    if _CODEGEN_VERSION_TAG is None:
+        try:
+            sha = hashlib.sha1(Path(__file__).read_bytes())
+            sha.update((Path(__file__).parent / 'replicator.py').read_bytes())
+            sha.update(ontology.ONTOLOGY_PATH.read_bytes())
+            digest = sha.hexdigest()[:12]
+        except OSError:
+            digest = 'nosrc'
+        _CODEGEN_VERSION_TAG = f'{CODEGEN_VERSION}-{digest}'
+    return _CODEGEN_VERSION_TAG
+
 
 def _load_data_lines(data_path: Optional[str], fs: Optional[float]) -> List[str]:
     lines = ["import numpy as np"]
@@ -145,38 +170,61 @@ def generate_bandpass_code(bandpass, filters):
     return lines
 
 
+def _method_note(name: str, extraction: Dict, onto: ontology.MethodOntology) -> List[str]:
+    """Comment lines for a detected method that has no code template."""
+    hints = onto.hints(name)
+    values = dict(extraction, **(extraction.get('params') or {}))
+    lines = [f"# {name}: no code template; implement manually"]
+    known = [f"{h}={values[h]!r}" for h in hints if values.get(h) is not None]
+    if known:
+        lines.append(f"#   detected {', '.join(known)}")
+    elif hints:
+        lines.append(f"#   relevant parameters: {', '.join(hints)}")
+    return lines
+
+
+# ontology "codegen" key -> template generator
+GENERATORS = {
+    'welch': generate_welch_code,
+    'fft': generate_fft_code,
+    'ica': generate_ica_code,
+    'mne_pipeline': generate_mne_pipeline_code,
+}
+
+
 def generate_code_from_extraction(extraction: Dict, data_path: Optional[str] = None, fs: Optional[float] = None) -> List[str]:
     """Dispatch to specific code generators based on extracted methods.
 
+    Method names are resolved to their canonical ontology names (aliases and
+    any case are accepted) and handled in ontology order; a method whose
+    entry names a template in GENERATORS gets its code, other known methods
+    get a comment listing the parameters relevant to them.
+
     Returns a list of source lines suitable for a single code cell in a notebook.
     """
-    methods = extraction.get('methods', [])
-    params = extraction.get('params', {})
+    onto = ontology.default_ontology()
+    methods = {onto.canonical(m) for m in extraction.get('methods', [])} - {None}
+    params = extraction.get('params') or {}
     bandpass = extraction.get('bandpass')
     code_lines: List[str] = []
-
-    # Order: Welch, FFT, ICA, MNE pipeline
-    if any('Welch' == m or 'welch' == m.lower() for m in methods):
-        code_lines += generate_welch_code(params, data_path=data_path, fs=fs)
-
-    if any('FFT' == m or 'fft' == m.lower() for m in methods):
-        if code_lines:
-            code_lines += ['\n']
-        code_lines += generate_fft_code(params, data_path=data_path, fs=fs)
-
-    if any('ICA' == m or 'ica' == m.lower() for m in methods):
-        if code_lines:
-            code_lines += ['\n']
-        code_lines += generate_ica_code(params, data_path=data_path, fs=fs)
-
-    if any('MNE' == m or 'mne' == m.lower() for m in methods):
+    notes: List[str] = []
+
+    for entry in onto.entries:
+        if entry['name'] not in methods:
+            continue
+        generator = GENERATORS.get(entry.get('codegen'))
+        if generator is None:
+            notes += _method_note(entry['name'], extraction, onto)
+            continue
         if code_lines:
             code_lines += ['\n']
-        code_lines += generate_mne_pipeline_code(params, data_path=data_path, fs=fs)
+        code_lines += generator(params, data_path=data_path, fs=fs)
 
     if bandpass:
         code_lines += ['\n'] + generate_bandpass_code(bandpass, extraction.get('filters', []))
 
     if not code_lines:
         code_lines = ["# No automatic code generated for the extracted methods. Fill manually."]
+    if notes:
+        code_lines += ['\n'] + notes
     return code_lines
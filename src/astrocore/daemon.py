@@ -0,0 +1,280 @@
+"""Optional local daemon that keeps extraction models loaded for CLI calls.
+
+Starting a CLI loads spaCy and the extraction pipeline every time; in shell
+loops and editor integrations that start-up dominates. The daemon loads them
+once and serves requests over a UNIX domain socket::
+
+    python scripts/astrocore_daemon.py            # or: python -m astrocore.daemon
+
+Clients (reproduce_from_papers.py, summarize_readme.py) call `request`,
+which raises DaemonUnavailable when no daemon is listening, it is running a
+different version of the sources or does not answer within the timeout, so
+the caller can do the work in process. Relative paths are resolved by the
+client before they are sent.
+
+The socket is ASTROCORE_DAEMON_SOCKET if set, else daemon.sock in a private
+(0700) directory astrocore-<uid> under $XDG_RUNTIME_DIR or the temp
+directory; the socket itself is only accessible to its owner, and clients
+only connect to a socket owned by their own user. Setting ASTROCORE_DAEMON=0
+makes clients ignore any daemon.
+
+The protocol is one JSON object per line each way: a request
+``{"op": ..., ...}`` is answered with ``{"ok": true, "result": ...}`` or
+``{"ok": false, "type": <exception class>, "error": <message>}``. Ops:
+ping, extract (text or paper), summarize (text), notebook (paper, out) and
+shutdown. This module imports only the standard library until a daemon is
+started, so checking for one is cheap.
+"""
+from pathlib import Path
+import os
+import sys
+import json
+import stat
+import socket
+import builtins
+import tempfile
+import threading
+import socketserver
+from typing import Any, Dict, Optional
+
+SOCKET_ENV_VAR = 'ASTROCORE_DAEMON_SOCKET'
+DISABLE_ENV_VAR = 'ASTROCORE_DAEMON'
+PROTOCOL_VERSION = 1
+CONNECT_TIMEOUT = 0.5
+# seconds a client waits for a reply before doing the work itself
+REQUEST_TIMEOUT = 120.0
+
+
+class DaemonUnavailable(ConnectionError):
+    """No usable daemon: none listening, another version, or an unsupported request."""
+
+
+class UnsupportedRequest(Exception):
+    """Raised by the daemon for requests it cannot serve as asked (e.g. for another backend)."""
+
+
+def socket_path() -> Path:
+    """Return the socket path clients connect to and the daemon listens on."""
+    configured = os.environ.get(SOCKET_ENV_VAR)
+    if configured:
+        return Path(configured)
+    runtime = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return Path(runtime) / f'astrocore-{os.getuid()}' / 'daemon.sock'
+
+
+def _owned_socket(st: os.stat_result) -> bool:
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _make_private_dir(directory: Path) -> None:
+    # in a shared temp directory another user could otherwise plant the socket
+    try:
+        directory.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    st = directory.lstat()
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        raise OSError(f'{directory} is not a directory owned by this user')
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        os.chmod(directory, 0o700)
+
+
+def source_version() -> str:
+    """Identify the astrocore sources on disk (a daemon started before an upgrade is not used)."""
+    package = Path(__file__).resolve().parent
+    stamp = 0
+    for p in list(package.glob('*.py')) + list(package.glob('*.json')):
+        try:
+            stamp = max(stamp, p.stat().st_mtime_ns)
+        except OSError:
+            continue
+    return f'{PROTOCOL_VERSION}-{stamp}'
+
+
+def _exception(kind: str, message: str) -> Exception:
+    cls = getattr(builtins, kind, None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        return cls(message)
+    return RuntimeError(f'{kind}: {message}')
+
+
+def request(op: str, path: Optional[Path] = None, timeout: Optional[float] = REQUEST_TIMEOUT,
+            **payload) -> Any:
+    """Send one request to the daemon and return its result.
+
+    Raises DaemonUnavailable when there is no daemon to use (the caller should
+    then work in process): no socket owned by this user, nothing listening,
+    other sources, or no reply within `timeout` seconds (None: no limit).
+    Errors raised by the work itself are re-raised here as the same built-in
+    exception type, or RuntimeError.
+    """
+    if os.environ.get(DISABLE_ENV_VAR, '1') == '0':
+        raise DaemonUnavailable('daemon disabled by ' + DISABLE_ENV_VAR)
+    path = Path(path) if path else socket_path()
+    try:
+        st = path.lstat()
+    except OSError:
+        raise DaemonUnavailable(f'no daemon socket at {path}')
+    if not _owned_socket(st):
+        raise DaemonUnavailable(f'{path} is not a socket owned by this user')
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except OSError as e:
+            raise DaemonUnavailable(f'cannot connect to {path}: {e}')
+        sock.settimeout(timeout)
+        message = dict(payload, op=op, version=source_version())
+        try:
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as fh:
+                line = fh.readline()
+        except OSError as e:  # socket.timeout included
+            raise DaemonUnavailable(f'no reply from the daemon at {path}: {e}')
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable('daemon closed the connection')
+    reply = json.loads(line)
+    if reply.get('ok'):
+        return reply.get('result')
+    if reply.get('type') in ('UnsupportedRequest', 'DaemonUnavailable'):
+        raise DaemonUnavailable(reply.get('error', ''))
+    raise _exception(reply.get('type', 'RuntimeError'), reply.get('error', ''))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                if message.get('version') != self.server.version:
+                    raise DaemonUnavailable(f'daemon runs sources {self.server.version}, '
+                                            f'client {message.get("version")}')
+                reply = {'ok': True, 'result': self.server.dispatch(message)}
+            except Exception as e:
+                reply = {'ok': False, 'type': type(e).__name__, 'error': str(e)}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+def _listening(path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded UNIX-socket server running requests against warm, in-process models."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Optional[Path] = None, backend: Optional[str] = None):
+        from astrocore import nlp_extractor
+        self.path = Path(path) if path else socket_path()
+        if backend:
+            nlp_extractor.set_default_backend(backend)
+        self.backend = nlp_extractor.resolve_backend()
+        self.version = source_version()
+        if path or os.environ.get(SOCKET_ENV_VAR):
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        else:
+            _make_private_dir(self.path.parent)
+        if os.path.lexists(self.path):
+            if not _owned_socket(self.path.lstat()):
+                raise OSError(f'{self.path} exists and is not a socket owned by this user')
+            if _listening(self.path):
+                raise OSError(f'a daemon is already listening on {self.path}')
+            self.path.unlink()  # left behind by a daemon that died
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def warm_up(self) -> None:
+        from astrocore import nlp_extractor, parser, replicator  # noqa: F401
+        nlp_extractor.warm_up()
+        parser.summarize_to_json('PEG hydrogel with EEG monitoring.')
+        try:
+            import fitz  # noqa: F401  (PyMuPDF)
+        except Exception:
+            pass
+
+    def dispatch(self, message: Dict) -> Any:
+        from astrocore import nlp_extractor, parser, replicator
+        op = message.get('op')
+        if op == 'ping':
+            return {'pid': os.getpid(), 'backend': self.backend, 'version': self.version}
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'pid': os.getpid()}
+        if op == 'summarize':
+            return parser.summarize_to_json(message['text'])
+        if op == 'extract':
+            text = message.get('text')
+            if text is None:
+                paper = Path(message['paper'])
+                if paper.suffix.lower() == '.pdf':
+                    pdf_workers = message.get('pdf_workers')
+                    if message.get('methods_first'):
+                        text = replicator.pdf_to_text_until_methods(paper, workers=pdf_workers)
+                    else:
+                        text = replicator.pdf_to_text(paper, workers=pdf_workers)
+                else:
+                    text = paper.read_text(encoding='utf-8')
+            return nlp_extractor.extract_parameters(text, fields=message.get('fields'),
+                                                    backend=message.get('backend'))
+        if op == 'notebook':
+            # notebook generation uses the process default backend
+            if nlp_extractor.resolve_backend(message.get('backend')) != self.backend:
+                raise UnsupportedRequest(f'daemon runs the {self.backend} backend')
+            out = replicator.generate_notebook_from_paper_file(
+                Path(message['paper']), Path(message['out']), populate_code=bool(message.get('populate_code')),
+                methods_first=bool(message.get('methods_first')), pdf_workers=message.get('pdf_workers'))
+            return str(out)
+        raise ValueError(f'unknown op {op!r}')
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def main(argv=None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(description='Serve warm AstroCore extraction over a UNIX domain socket')
+    ap.add_argument('--socket', default=None, help=f'Socket path (default: ${SOCKET_ENV_VAR} or {socket_path()})')
+    ap.add_argument('--backend', default=None, help='Extraction backend (default: $ASTROCORE_BACKEND or auto)')
+    ap.add_argument('--stop', action='store_true', help='Ask a running daemon to exit')
+    args = ap.parse_args(argv)
+    if args.stop:
+        try:
+            request('shutdown', args.socket)
+        except DaemonUnavailable as e:
+            print(str(e))
+            return 1
+        return 0
+    server = DaemonServer(args.socket, backend=args.backend)
+    server.warm_up()
+    print(f'AstroCore daemon (pid {os.getpid()}, {server.backend} backend) listening on {server.path}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Process-wide pool of loaded, warmed-up spaCy models.
+
+Loading a trained spaCy model takes seconds, so callers should not call
+``spacy.load`` per document. `get_model` loads each (model, disabled
+components) combination once per process, runs one warm-up document through
+it so lazily initialised state is built before the first real call, and
+returns the same object afterwards::
+
+    from astrocore import model_pool
+    nlp = model_pool.get_model('en_core_web_sm', disable=('parser', 'lemmatizer'))
+    docs = model_pool.pipe(texts, 'en_core_web_sm', disable=('parser', 'lemmatizer'))
+
+Components listed in `disable` are loaded but skipped when processing
+(names the model does not have are ignored). Model names are anything
+``spacy.load`` accepts, including ``blank:en``. spaCy is imported on first
+use only; without it `get_model` raises ImportError.
+"""
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+WARMUP_TEXT = 'Warm-up sentence: the model was loaded at 10:00 in Berlin by ACME Corp.'
+
+_MODELS: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_LOAD_SECONDS: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+_LOCK = threading.Lock()
+
+
+def _key(name: str, disable: Iterable[str]) -> Tuple[str, Tuple[str, ...]]:
+    return name, tuple(sorted(set(disable)))
+
+
+def _load(name: str, disable: Tuple[str, ...]):
+    try:
+        import spacy
+    except Exception:
+        raise ImportError("spaCy not available; install spacy to use the model pool")
+    return spacy.load(name, disable=list(disable))
+
+
+def get_model(name: str = 'en_core_web_sm', disable: Iterable[str] = (), warmup: bool = True):
+    """Return the shared pipeline for `name` with `disable` components off, loading it once.
+
+    Errors from loading (ImportError without spaCy, OSError for a model that
+    is not installed) propagate and nothing is cached, so a later call retries.
+    """
+    key = _key(name, disable)
+    try:
+        return _MODELS[key]
+    except KeyError:
+        pass
+    with _LOCK:
+        if key not in _MODELS:
+            t0 = time.perf_counter()
+            nlp = _load(*key)
+            if warmup:
+                nlp(WARMUP_TEXT)
+            _LOAD_SECONDS[key] = time.perf_counter() - t0
+            _MODELS[key] = nlp
+        return _MODELS[key]
+
+
+def pipe(texts: Iterable[str], name: str = 'en_core_web_sm', disable: Iterable[str] = (),
+         batch_size: int = 64, n_process: int = 1) -> Iterator:
+    """Yield Docs for `texts` in input order, batched through the pooled model's nlp.pipe."""
+    nlp = get_model(name, disable)
+    return nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+
+
+def loaded() -> Dict[Tuple[str, Tuple[str, ...]], float]:
+    """The pooled (name, disabled components) keys, with their load + warm-up seconds."""
+    with _LOCK:
+        return dict(_LOAD_SECONDS)
+
+
+def clear(name: Optional[str] = None) -> None:
+    """Drop pooled models (all of them, or those loaded under `name`)."""
+    with _LOCK:
+        for key in [k for k in _MODELS if name is None or k[0] == name]:
+            del _MODELS[key]
+            _LOAD_SECONDS.pop(key, None)
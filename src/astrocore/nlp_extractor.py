@@ -4,36 +4,47 @@ This module provides a lightweight, dependency-free heuristic extractor for
 common analysis parameters (e.g., Welch nperseg, window, bandpass ranges,
 filter types). If spaCy is available, an advanced API may be used later.
 """
+import os
 import re
-from typing import Dict, Any
+import time
+import bisect
+import hashlib
+import functools
+import threading
+import collections
+import importlib.util
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Optional, Union
 
-# Optional spaCy support
-_SPACY_NLP = None
-_HAS_SPACY = False
-try:
-    import spacy
+from astrocore import nlp_stats, ontology, scanners
+
+# Optional spaCy support. Pipelines are loaded lazily by _get_pipeline() on
+# the first extraction that needs them, so importing this module stays cheap.
+_HAS_SPACY = importlib.util.find_spec('spacy') is not None
+_PIPELINES = {}
+_PIPELINE_LOCK = threading.Lock()
+
+
+def _load_spacy_pipeline():
+    """Load en_core_web_sm (or a blank English model) plus the EntityRuler."""
+    try:
+        import spacy
+    except Exception:
+        return None
     try:
         # try load small English model; may raise if not installed
-        _SPACY_NLP = spacy.load('en_core_web_sm')
-        _HAS_SPACY = True
+        nlp = spacy.load('en_core_web_sm')
     except Exception:
         try:
             # fallback to blank English model (no pretrained NER)
-            _SPACY_NLP = spacy.blank('en')
-            _HAS_SPACY = True
+            nlp = spacy.blank('en')
         except Exception:
-            _SPACY_NLP = None
-            _HAS_SPACY = False
-except Exception:
-    _SPACY_NLP = None
-    _HAS_SPACY = False
-
-# If spaCy is available, try to add an EntityRuler with a few helpful patterns
-_SPACY_RULER = None
-if _HAS_SPACY and _SPACY_NLP is not None:
+            return None
+
+    # try to add an EntityRuler with a few helpful patterns
     try:
         from spacy.pipeline import EntityRuler
-        ruler = EntityRuler(_SPACY_NLP, overwrite_ents=False)
+        ruler = EntityRuler(nlp, overwrite_ents=False)
         patterns = []
         # token patterns: fs 1000, sampling rate 1000 Hz, or bare 1000Hz
         patterns.append({
@@ -59,10 +70,183 @@ if _HAS_SPACY and _SPACY_NLP is not None:
             'pattern': [{'TEXT': {'REGEX': r".*/.*\\.(csv|mat|npy|fif|edf)$"}}]
         })
         ruler.add_patterns(patterns)
-        _SPACY_NLP.add_pipe(ruler, name='entity_ruler', first=True)
-        _SPACY_RULER = ruler
+        nlp.add_pipe(ruler, name='entity_ruler', first=True)
+    except Exception:
+        pass
+    return nlp
+
+
+def _load_blank_pipeline():
+    """Load a blank English model: the tokenizer only, no NER or EntityRuler."""
+    try:
+        import spacy
+        return spacy.blank('en')
     except Exception:
-        _SPACY_RULER = None
+        return None
+
+
+# Extraction backends, selectable per call (`backend=`), per process
+# (set_default_backend or the ASTROCORE_BACKEND environment variable), or left
+# to 'auto': 'spacy-full' when spaCy is importable, else 'regex'.
+# - regex: the rule table only, no NLP
+# - spacy-blank: adds the token candidates of a blank English tokenizer
+# - spacy-full: en_core_web_sm NER plus the EntityRuler (blank model if the
+#   trained one is not installed)
+# A loader returns a spaCy-compatible pipeline (callable returning a Doc, with
+# .pipe), or None when unavailable; extraction then runs the rules only.
+BACKEND_ENV_VAR = 'ASTROCORE_BACKEND'
+_BACKENDS = {
+    'regex': None,
+    'spacy-blank': _load_blank_pipeline,
+    'spacy-full': _load_spacy_pipeline,
+}
+_DEFAULT_BACKEND = None
+
+
+def register_backend(name: str, loader) -> None:
+    """Register (or replace) a backend; `loader()` returns a pipeline or None."""
+    with _PIPELINE_LOCK:
+        _BACKENDS[name] = loader
+        _PIPELINES.pop(name, None)
+
+
+def backends():
+    """Return the names of the registered backends."""
+    return tuple(_BACKENDS)
+
+
+def set_default_backend(name: Optional[str]) -> None:
+    """Set the process-wide backend (None restores env var / 'auto' selection)."""
+    global _DEFAULT_BACKEND
+    if name is not None:
+        resolve_backend(name)
+    _DEFAULT_BACKEND = name
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Return the backend name in effect for `backend` (None: process default)."""
+    name = backend or _DEFAULT_BACKEND or os.environ.get(BACKEND_ENV_VAR) or 'auto'
+    if name == 'auto':
+        return 'spacy-full' if _HAS_SPACY else 'regex'
+    if name not in _BACKENDS:
+        raise ValueError(f"unknown backend {name!r}; expected 'auto' or one of {tuple(_BACKENDS)}")
+    return name
+
+
+def _get_pipeline(backend: Optional[str] = None):
+    """Return the pipeline of a backend, loading it on first use; None for rules only."""
+    name = resolve_backend(backend)
+    try:
+        return _PIPELINES[name]
+    except KeyError:
+        pass
+    with _PIPELINE_LOCK:
+        if name not in _PIPELINES:
+            loader = _BACKENDS[name]
+            _PIPELINES[name] = loader() if loader is not None else None
+        return _PIPELINES[name]
+
+
+def backend_available(backend: Optional[str] = None) -> bool:
+    """True if the backend runs its NLP stage here (always True for 'regex')."""
+    name = resolve_backend(backend)
+    return _BACKENDS[name] is None or _get_pipeline(name) is not None
+
+
+_WARMUP_TEXT = 'Signals were sampled at 1000 Hz, band-pass filtered 1-40 Hz and analysed with Welch PSD.'
+
+
+def warm_up(backend: Optional[str] = None) -> None:
+    """Load the backend's pipeline and run one extraction, for long-lived processes."""
+    extract_parameters(_WARMUP_TEXT, cache=False, backend=backend)
+
+
+def _get_spacy_nlp():
+    """Return the shared 'spacy-full' pipeline, loading it on first call.
+
+    Returns None when spaCy (or any English model) is unavailable.
+    """
+    return _get_pipeline('spacy-full') if _HAS_SPACY else None
+
+
+# Bump when extraction semantics change. The cache version also folds in a
+# digest of the extraction sources (this file, the scanners, the ontology code
+# and its methods.json) and the installed spaCy/model versions, so stale
+# cached results are never served after an upgrade even if this is not bumped.
+EXTRACTOR_VERSION = '1'
+
+# Optional result cache (see astrocore.cache). Configured explicitly with
+# set_default_cache() or through the ASTROCORE_EXTRACTION_CACHE environment
+# variable (path to an SQLite file, or 'memory' for an in-process LRU only).
+CACHE_ENV_VAR = 'ASTROCORE_EXTRACTION_CACHE'
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_SET = False
+_CACHE_VERSION = None
+
+
+def _spacy_signature() -> str:
+    # uses package metadata so computing a cache key never imports spaCy
+    if not _HAS_SPACY:
+        return 'regex'
+    try:
+        from importlib import metadata
+        sig = 'spacy-' + metadata.version('spacy')
+        try:
+            sig += '+en_core_web_sm-' + metadata.version('en_core_web_sm')
+        except metadata.PackageNotFoundError:
+            sig += '+blank'
+        return sig
+    except Exception:
+        return 'spacy'
+
+
+def cache_version() -> str:
+    """Return the version tag used to key and invalidate cached extractions."""
+    global _CACHE_VERSION
+    if _CACHE_VERSION is None:
+        try:
+            sha = hashlib.sha1()
+            for source in (__file__, scanners.__file__, ontology.__file__, ontology.ONTOLOGY_PATH):
+                sha.update(Path(source).read_bytes())
+            digest = sha.hexdigest()[:12]
+        except OSError:
+            digest = 'nosrc'
+        _CACHE_VERSION = f'{EXTRACTOR_VERSION}-{digest}-{_spacy_signature()}'
+    return _CACHE_VERSION
+
+
+def open_extraction_cache(path=None, **kwargs):
+    """Create an ExtractionCache tagged with the current extractor version."""
+    from astrocore.cache import ExtractionCache
+    return ExtractionCache(path, version=cache_version(), **kwargs)
+
+
+def set_default_cache(cache) -> None:
+    """Use `cache` for extract_parameters calls that do not pass one (None disables)."""
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_SET
+    _DEFAULT_CACHE = cache
+    _DEFAULT_CACHE_SET = True
+
+
+def get_default_cache():
+    """Return the process-wide extraction cache, or None if caching is off."""
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_SET
+    if not _DEFAULT_CACHE_SET:
+        target = os.environ.get(CACHE_ENV_VAR)
+        if target:
+            _DEFAULT_CACHE = open_extraction_cache(None if target == 'memory' else target)
+        _DEFAULT_CACHE_SET = True
+    return _DEFAULT_CACHE
+
+
+def _resolve_cache(cache):
+    if cache is None:
+        return get_default_cache()
+    return cache or None
+
+
+# Confidence factor for results missing the stages a deadline skipped.
+_PARTIAL_CONFIDENCE = 0.75
 
 
 def compute_confidence(out: Dict[str, Any]) -> float:
@@ -76,6 +260,7 @@ def compute_confidence(out: Dict[str, Any]) -> float:
     - +0.15 if bandpass present
     - +0.1 if any filters present
     - clamp to 1.0
+    - scaled by 0.75 if `partial` (a deadline cut extraction short)
     """
     score = 0.0
     if 'fs' in out and out.get('fs'):
@@ -92,6 +277,8 @@ def compute_confidence(out: Dict[str, Any]) -> float:
             score += 0.1
     if score > 1.0:
         score = 1.0
+    if out.get('partial'):
+        score *= _PARTIAL_CONFIDENCE
     return round(score, 3)
 
 
@@ -106,84 +293,707 @@ def _freq_to_hz(s: str) -> float:
     # strip non-numeric
     return float(re.sub(r'[^0-9\.]', '', s))
 
-def extract_parameters(text: str) -> Dict[str, Any]:
+# Declarative rule table, compiled once at import.
+#
+# Each rule is (name, anchors, pattern, source, seek):
+# - anchors: lowercase literals, at least one of which must occur for the
+#   pattern to match. They are looked up in a case-folded copy of the text, and
+#   rules whose anchors are all absent are skipped without running the regex.
+# - source: 'text' (raw input) or 'lowered' (input with unicode dashes folded).
+# - seek: the pattern starts with one of its anchors, so the search may begin
+#   at the first anchor hit instead of at offset 0. Otherwise anchors only gate.
+# Rules with anchors None always run. All patterns are case-insensitive.
+# A pattern may also be a scanner object from astrocore.scanners: a
+# linear-time replacement for a regex that backtracks quadratically on long
+# tokens, with the same search() results, or the method ontology, whose
+# search() returns an ontology.MethodHits.
+_RULES = (
+    # methods: every alias in the method ontology (methods.json), matched in
+    # one pass; the hit lists all canonical methods found, not just the first
+    ('methods', None, ontology.default_ontology(), 'lowered', False),
+    # parameters: nperseg=2048, window='hann', nfft 512
+    ('nperseg', ('nperseg',), r'\bnperseg\b\s*(?:[=:]\s*)?(\d+)', 'text', True),
+    ('window', ('window',), r"\bwindow\b\s*(?:[=:]\s*)?'?([A-Za-z0-9_\-]+)'?", 'text', True),
+    ('nfft', ('nfft',), r'\bnfft\b\s*(?:[=:]\s*)?(\d+)', 'text', True),
+    # bandpass ranges like 1-40 Hz, 1 to 40 Hz, 1-2 kHz (no literal anchor)
+    ('bandpass', None, scanners.NumberTailScanner(
+        '[0-9]', r'\s*(?:-|to)\s*([0-9]+(?:\.[0-9]+)?)\s*(k?m?hz|hz)?'), 'lowered', False),
+    # lowpass / highpass cutoffs
+    ('lowpass', ('lowpass', 'low-pass'), r'low-?pass\s*(?:[:=]\s*)?(\d+(?:\.\d+)?)\s*Hz', 'text', True),
+    ('highpass', ('highpass', 'high-pass'), r'high-?pass\s*(?:[:=]\s*)?(\d+(?:\.\d+)?)\s*Hz', 'text', True),
+    # filter design mention; the reported value comes from 'design_value'
+    ('design', ('butter', 'fir', 'iir'), r'butterworth|butter\b|fir\b|iir\b', 'text', True),
+    ('design_value', ('butter', 'fir', 'iir'), r'(butterworth|butter|fir|iir)', 'text', True),
+    # data path: windows paths, unix paths, quoted paths with common extensions
+    ('data_path', ('.csv', '.mat', '.npy', '.fif', '.edf'), scanners.DataPathScanner(), 'text', False),
+    ('data_path_loose', ('data',), scanners.LooseDataPathScanner(), 'text', True),
+    # sampling rate: fs=1000, fs=1 kHz, sampling rate 1000 Hz, 1000Hz near keywords
+    ('fs', ('fs',), r"\bfs\b\s*(?:[=:]\s*)?([0-9]+(?:\.[0-9]+)?\s*(?:k?m?hz|hz)?)", 'lowered', True),
+    ('fs_sampling_rate', ('sampling rate',), r"sampling rate\s*(?:(?:is|was)\s*)?([0-9]+(?:\.[0-9]+)?\s*(?:k?m?hz|hz)?)", 'lowered', True),
+    ('fs_hz', ('hz',), scanners.NumberTailScanner(r'\d', r'\s*hz'), 'lowered', False),
+)
+
+_METHOD_RULES = ('methods',)
+
+_COMPILED_RULES = tuple(
+    (name, anchors, re.compile(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern, source, seek)
+    for name, anchors, pattern, source, seek in _RULES
+)
+
+_RULE_PATTERNS = {name: pattern for name, _, pattern, _, _ in _COMPILED_RULES}
+
+# Characters for which str.lower() either changes length or does not agree with
+# re.IGNORECASE; when present, anchor gating is bypassed to keep results exact.
+_CASEFOLD_HAZARDS = re.compile('[\u0130\u0131\u017f]')
+
+# Field projection: the output fields a caller may ask for, the rules each is
+# computed from, and how much of the spaCy stage can contribute to it
+# ('tokens': the token pass only; 'entities': also the entity and raw-text
+# scans). 'confidence' is derived from the fields listed in
+# _CONFIDENCE_INPUTS, which are computed whenever it is requested.
+FIELDS = ('methods', 'params', 'bandpass', 'filters', 'data_path', 'fs', 'confidence')
+_FIELD_RULES = {
+    'methods': _METHOD_RULES,
+    'params': ('nperseg', 'window', 'nfft'),
+    'bandpass': ('bandpass',),
+    'filters': ('lowpass', 'highpass', 'design', 'design_value'),
+    'data_path': ('data_path', 'data_path_loose'),
+    'fs': ('fs', 'fs_sampling_rate', 'fs_hz'),
+    'confidence': (),
+}
+_FIELD_SPACY = {'params': 'tokens', 'bandpass': 'tokens', 'data_path': 'entities', 'fs': 'entities'}
+_CONFIDENCE_INPUTS = ('fs', 'data_path', 'methods', 'bandpass', 'filters')
+
+# fields: output keys to keep (None keeps all); rules: the compiled rules to
+# run; spacy / entities: whether to parse, and whether to scan entities
+_FieldPlan = collections.namedtuple('_FieldPlan', 'fields rules spacy entities')
+_FULL_PLAN = _FieldPlan(None, _COMPILED_RULES, True, True)
+
+
+@functools.lru_cache(maxsize=128)
+def _plan_for(fields: frozenset) -> _FieldPlan:
+    computed = set(fields)
+    if 'confidence' in fields:
+        computed.update(_CONFIDENCE_INPUTS)
+    names = {name for f in computed for name in _FIELD_RULES[f]}
+    scans = {_FIELD_SPACY.get(f) for f in computed}
+    return _FieldPlan(fields, tuple(r for r in _COMPILED_RULES if r[0] in names),
+                      bool(scans - {None}), 'entities' in scans)
+
+
+def _field_plan(fields) -> _FieldPlan:
+    if fields is None:
+        return _FULL_PLAN
+    fields = frozenset((fields,) if isinstance(fields, str) else fields)
+    unknown = fields.difference(FIELDS)
+    if unknown:
+        raise ValueError(f'unknown fields {sorted(unknown)}; expected a subset of {FIELDS}')
+    return _plan_for(fields)
+
+
+def _project(out: Dict[str, Any], plan: _FieldPlan) -> Dict[str, Any]:
+    if plan.fields is None:
+        return out
+    return {k: v for k, v in out.items() if k in plan.fields or k in _DEADLINE_KEYS}
+
+
+def _match_rules(text: str, lowered: str, start: int = 0, end: Optional[int] = None,
+                 rules=_COMPILED_RULES) -> Dict[str, Any]:
+    """Run the rule table over one document and return the first match per rule.
+
+    With `start`/`end`, only matches starting in that range are reported; the
+    text around it still serves as context (word boundaries, lookarounds).
+    `rules` restricts the pass to a subset of the compiled table.
+    """
+    folded = lowered.lower()
+    gated = lowered.isascii() or not _CASEFOLD_HAZARDS.search(lowered)
+    stats = nlp_stats.current()
+    if stats is not None:
+        return _match_rules_timed(text, lowered, folded, gated, start, end, stats, rules)
+    hits = {}
+    for name, anchors, pattern, source, seek in rules:
+        pos = start
+        if anchors is not None and gated:
+            # every gated rule's match starts at or before its anchor
+            found = [i for i in (folded.find(a, start) for a in anchors) if i >= 0]
+            if not found:
+                continue
+            if seek:
+                pos = min(found)
+        m = pattern.search(lowered if source == 'lowered' else text, pos)
+        if m and (end is None or m.start() < end):
+            hits[name] = m
+    return hits
+
+
+def _match_rules_timed(text, lowered, folded, gated, start, end, stats, rules) -> Dict[str, Any]:
+    """_match_rules with per-rule timing; kept separate so the default path stays lean."""
+    perf_counter = time.perf_counter
+    hits = {}
+    for name, anchors, pattern, source, seek in rules:
+        t0 = perf_counter()
+        pos = start
+        if anchors is not None and gated:
+            found = [i for i in (folded.find(a, start) for a in anchors) if i >= 0]
+            if not found:
+                stats.record_skip(name)
+                continue
+            if seek:
+                pos = min(found)
+        m = pattern.search(lowered if source == 'lowered' else text, pos)
+        if m and (end is None or m.start() < end):
+            hits[name] = m
+        stats.record_rule(name, perf_counter() - t0, name in hits)
+    return hits
+
+
+# Keyword prefilter. Everything the spaCy stage can contribute is anchored on
+# a unit, a sampling keyword, nperseg or a data file extension, so on long
+# inputs only the sentences around those terms are parsed. They are matched as
+# plain substrings of the lowercased text, exactly as the token and entity
+# checks see them. Method names only add NER context and must start a word
+# ("ica" would otherwise hit every "statistical"). Each term is located with
+# str.find, which is far cheaper than one regex alternation over long texts.
+_PREFILTER_KEYWORDS = ('fs', 'sampl', 'frequen', 'hz', 'nperseg', '.csv', '.mat', '.npy', '.fif', '.edf')
+_PREFILTER_WORDS = ('welch', 'fft', 'ica', 'filter', 'window')
+_PREFILTER_MIN_CHARS = 2000    # shorter texts are parsed whole
+_PREFILTER_PAD = 80            # context kept on each side of a keyword
+_PREFILTER_SNAP = 300          # how far to look for a sentence boundary
+_PREFILTER_MAX_RATIO = 0.5     # parse the whole text if windows cover more
+_PREFILTER_SEP = '\n\n'
+_SENTENCE_END_RE = re.compile(r'[.!?]\s|\n')
+
+
+def _snap_start(text: str, pos: int) -> int:
+    if pos <= 0:
+        return 0
+    lo = max(0, pos - _PREFILTER_SNAP)
+    best = -1
+    for sep in ('\n', '. ', '! ', '? '):
+        i = text.rfind(sep, lo, pos)
+        if i >= 0:
+            best = max(best, i + len(sep))
+    return best if best >= 0 else pos
+
+
+def _snap_end(text: str, pos: int) -> int:
+    if pos >= len(text):
+        return len(text)
+    m = _SENTENCE_END_RE.search(text, pos, pos + _PREFILTER_SNAP)
+    return m.end() if m else pos
+
+
+def _keyword_hits(folded: str):
+    """Return sorted (start, end) spans of prefilter keywords in lowercased text."""
+    hits = []
+    for words_only, terms in ((False, _PREFILTER_KEYWORDS), (True, _PREFILTER_WORDS)):
+        for term in terms:
+            i = folded.find(term)
+            while i >= 0:
+                if not (words_only and i and folded[i - 1].isalpha()):
+                    hits.append((i, i + len(term)))
+                i = folded.find(term, i + 1)
+    hits.sort()
+    return hits
+
+
+def _prefilter_windows(text: str):
+    """Return sorted, disjoint (start, end) spans of `text` worth parsing.
+
+    Returns None when the whole text should be parsed instead: short inputs,
+    inputs whose lowercase form changes length (offsets would not line up),
+    and inputs where the windows would cover most of the text anyway.
+    """
+    if len(text) < _PREFILTER_MIN_CHARS:
+        return None
+    folded = text.lower()
+    if len(folded) != len(text):
+        return None
+    windows = []
+    for start, end in _keyword_hits(folded):
+        start, end = start - _PREFILTER_PAD, end + _PREFILTER_PAD
+        if windows and start <= windows[-1][1]:
+            if end > windows[-1][1]:
+                windows[-1][1] = _snap_end(text, end)
+        else:
+            windows.append([_snap_start(text, start), _snap_end(text, end)])
+    if sum(e - s for s, e in windows) > len(text) * _PREFILTER_MAX_RATIO:
+        return None
+    return [(s, e) for s, e in windows]
+
+
+def _nlp_input(text: str):
+    """Return (text for the spaCy stage, offset map) for one document.
+
+    The offset map is a list of (doc_start, text_start) pairs, one per window,
+    for `doc_offset_to_text`; it is None when the text is passed unchanged.
+    An empty string means nothing in the text can feed the spaCy stage.
+    """
+    windows = _prefilter_windows(text) if text else None
+    if windows is None:
+        return text or '', None
+    parts = []
+    offsets = []
+    doc_pos = 0
+    for start, end in windows:
+        offsets.append((doc_pos, start))
+        parts.append(text[start:end])
+        doc_pos += end - start + len(_PREFILTER_SEP)
+    return _PREFILTER_SEP.join(parts), offsets
+
+
+def doc_offset_to_text(doc, offset: int) -> int:
+    """Map a character offset in a prefiltered Doc back to the original text."""
+    offsets = doc.user_data.get('astrocore_offsets') if doc is not None else None
+    if not offsets:
+        return offset
+    i = bisect.bisect_right(offsets, (offset, float('inf'))) - 1
+    doc_start, text_start = offsets[max(i, 0)]
+    return text_start + offset - doc_start
+
+
+def _parse(nlp, text: str):
+    """Run the spaCy stage over the prefiltered form of `text`; None if unused."""
+    with nlp_stats.stage('prefilter'):
+        nlp_text, offsets = _nlp_input(text)
+    return _parse_input(nlp, nlp_text, offsets)
+
+
+# Running estimate of spaCy parse cost in seconds per character, learned from
+# parses of at least _PARSE_RATE_MIN_CHARS (shorter ones are dominated by
+# per-call overhead). Deadline-bound extractions use it to skip parses that
+# would not finish in time; nlp() itself cannot be interrupted.
+_PARSE_SECONDS_PER_CHAR = None
+_PARSE_RATE_MIN_CHARS = 1000
+
+
+def _parse_input(nlp, nlp_text: str, offsets):
+    global _PARSE_SECONDS_PER_CHAR
+    if not nlp_text:
+        return None
+    t0 = time.perf_counter()
+    with nlp_stats.stage('spacy_parse'):
+        doc = nlp(nlp_text)
+    if len(nlp_text) >= _PARSE_RATE_MIN_CHARS:
+        rate = (time.perf_counter() - t0) / len(nlp_text)
+        est = _PARSE_SECONDS_PER_CHAR
+        _PARSE_SECONDS_PER_CHAR = rate if est is None else 0.8 * est + 0.2 * rate
+    doc.user_data['astrocore_offsets'] = offsets
+    return doc
+
+
+def _parse_fits(n_chars: int, deadline: float) -> bool:
+    est = _PARSE_SECONDS_PER_CHAR
+    remaining = deadline - time.perf_counter()
+    return remaining > 0 and (est is None or est * n_chars <= remaining)
+
+
+def extract_parameters(text: str, cache=None, deadline_ms: Optional[float] = None,
+                       fields: Optional[Union[str, Iterable[str]]] = None, backend: Optional[str] = None) -> Dict[str, Any]:
     """Extract common analysis methods and parameters from given text.
 
     Returns a dict with keys like 'methods', 'params', 'bandpass', 'filters'.
     This is heuristic and intended to be a best-effort extractor for prototyping.
+    On long texts only the sentences around parameter keywords are parsed by
+    spaCy (see _prefilter_windows); the regex rules always see the full text.
+
+    `cache` is an ExtractionCache (see open_extraction_cache); None uses the
+    default cache if one is configured, False disables caching for this call.
+
+    With `deadline_ms`, the cheap regex rules run first and the spaCy stages
+    last, each only if the time budget (counted from the call) is not spent;
+    a parse that is not expected to finish in time is skipped too. The result
+    then carries 'partial' (True if any stage was skipped) and
+    'skipped_stages', and its confidence is lowered when partial. Partial
+    results are never cached.
+
+    `fields` (a subset of FIELDS) limits the result to those keys; only the
+    rules they depend on are run, and spaCy is skipped entirely when none of
+    them can use it (methods, filters). Unknown fields raise ValueError.
+
+    `backend` selects the extraction backend for this call ('regex',
+    'spacy-blank', 'spacy-full' or 'auto'); None uses the process default.
     """
-    out = {
-        'methods': [],
-        'params': {},
-        'bandpass': None,
-        'filters': [],
-    }
+    t0 = time.perf_counter()
+    plan = _field_plan(fields)
+    backend = resolve_backend(backend)
+    cache = _resolve_cache(cache)
+    key = None
+    if cache is not None and text:
+        with nlp_stats.stage('cache_lookup'):
+            key = content_key_for(text, plan.fields, backend)
+            hit = cache.get(key)
+        if hit is not None:
+            if deadline_ms is not None:
+                hit.update(partial=False, skipped_stages=[])
+            return hit
 
-    if not text:
+    if deadline_ms is not None:
+        out = _extract_within(text, t0 + deadline_ms / 1000.0, plan, backend)
+        if key is not None and not out['partial']:
+            cache.put(key, {k: v for k, v in out.items() if k not in _DEADLINE_KEYS})
         return out
 
-    lowered = text
-    # normalize unicode dashes to simple hyphen for range detection
-    lowered = lowered.replace('\u2013', '-').replace('\u2014', '-')
-
     # If spaCy model is available, we can enhance detection using tokenization
     doc = None
-    if _HAS_SPACY and _SPACY_NLP is not None:
+    nlp = _get_pipeline(backend) if (text and plan.spacy) else None
+    if nlp is not None:
         try:
-            doc = _SPACY_NLP(text)
+            doc = _parse(nlp, text)
         except Exception:
             doc = None
+    out = _extract_with_doc(text, doc, plan)
+    if key is not None:
+        cache.put(key, out)
+    return out
+
+
+# Stages of a deadline-bound extraction, cheapest first, and the result keys
+# that report on them.
+DEADLINE_STAGES = ('regex_rules', 'spacy_parse', 'spacy_enrich')
+_DEADLINE_KEYS = ('partial', 'skipped_stages')
+
+
+def _extract_within(text: str, deadline: float, plan: _FieldPlan = _FULL_PLAN,
+                    backend: Optional[str] = None) -> Dict[str, Any]:
+    """_extract_with_doc, with the stages run in DEADLINE_STAGES order until `deadline`."""
+    out = _empty_result()
+    skipped = []
+    out.update(partial=False, skipped_stages=skipped)
+    if not text:
+        return _project(out, plan)
+
+    stats = nlp_stats.current()
+    if stats is not None:
+        stats.record_document()
+    hits = {}
+    if time.perf_counter() < deadline:
+        with nlp_stats.stage('regex_rules'):
+            hits = _match_rules(text, _normalize_dashes(text), rules=plan.rules)
+    else:
+        skipped.append('regex_rules')
+
+    scan = None
+    nlp = _get_pipeline(backend) if plan.spacy else None
+    if nlp is not None:
+        doc = None
+        if time.perf_counter() >= deadline:
+            skipped.append('spacy_parse')
+        else:
+            with nlp_stats.stage('prefilter'):
+                nlp_text, offsets = _nlp_input(text)
+            if nlp_text and not _parse_fits(len(nlp_text), deadline):
+                skipped.append('spacy_parse')
+            elif nlp_text:
+                try:
+                    doc = _parse_input(nlp, nlp_text, offsets)
+                except Exception:
+                    doc = None
+        if 'spacy_parse' in skipped or (doc is not None and time.perf_counter() >= deadline):
+            skipped.append('spacy_enrich')
+        elif doc is not None:
+            try:
+                scan = _scan_doc(doc, entities=plan.entities)
+                with nlp_stats.stage('spacy_enrich'):
+                    spacy_enrich_extraction(doc, out, scan=scan)
+            except Exception:
+                # spaCy enrichment stays best-effort, as in _extract_with_doc
+                pass
+
+    out['partial'] = bool(skipped)
+    with nlp_stats.stage('apply_rules'):
+        return _project(_apply_rules(out, hits, scan), plan)
+
+
+def content_key_for(text: str, fields=None, backend: Optional[str] = None) -> str:
+    """Return the cache key of `text` for the extractor version, backend and field projection."""
+    from astrocore.cache import content_key
+    options = {'backend': resolve_backend(backend)}
+    if fields is not None:
+        options['fields'] = tuple(sorted(fields))
+    return content_key(text, cache_version(), **options)
+
+
+def extract_parameters_batch(texts: Iterable[str], batch_size: int = 64, n_process: int = 1,
+                             cache=None, deadline_ms: Optional[float] = None,
+                             fields: Optional[Union[str, Iterable[str]]] = None,
+                             backend: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Extract parameters from many texts, yielding one result per input in order.
+
+    Documents are streamed through spaCy's ``nlp.pipe`` so the pipeline
+    overhead is paid per batch rather than per document. This is a generator:
+    only the documents in flight inside ``nlp.pipe`` are held in memory.
+    Results are identical to calling `extract_parameters` on each text.
+    Cache hits (see `extract_parameters`) bypass the pipeline entirely.
+    With `deadline_ms` (a per-document budget) documents are extracted one at
+    a time, since a batched pipeline cannot be cut short per document.
+    `fields` and `backend` apply to every result as in `extract_parameters`.
+    """
+    texts = iter(texts)
+    plan = _field_plan(fields)
+    backend = resolve_backend(backend)
+    cache = _resolve_cache(cache)
+    nlp = _get_pipeline(backend) if plan.spacy else None
+    if nlp is None or deadline_ms is not None:
+        for text in texts:
+            yield extract_parameters(text, cache=cache or False, deadline_ms=deadline_ms, fields=fields,
+                                     backend=backend)
+        return
+
+    # (text, cache key, cached result, offset map) handed to nlp.pipe or
+    # served from the cache but not yet yielded, oldest first; only misses
+    # enter the pipeline, as their prefiltered form (see _nlp_input)
+    pending = collections.deque()
+
+    def feed():
+        for text in texts:
+            key = hit = offsets = None
+            if cache is not None and text:
+                key = content_key_for(text, plan.fields, backend)
+                hit = cache.get(key)
+            if hit is None:
+                with nlp_stats.stage('prefilter'):
+                    nlp_text, offsets = _nlp_input(text)
+            pending.append((text, key, hit, offsets))
+            if hit is None:
+                yield nlp_text
+
+    def drain_hits():
+        while pending and pending[0][2] is not None:
+            yield pending.popleft()[2]
+
+    docs = nlp.pipe(feed(), batch_size=batch_size, n_process=n_process)
+    if nlp_stats.current() is not None:
+        docs = _timed_iter(docs, 'spacy_pipe')
+    try:
+        for doc in docs:
+            yield from drain_hits()
+            # the document stays pending until its result is stored, so the
+            # fallback below also covers a failure while extracting it
+            text, key, _, offsets = pending[0]
+            if len(doc.text):
+                doc.user_data['astrocore_offsets'] = offsets
+            out = _extract_with_doc(text, doc if len(doc.text) else None, plan)
+            if key is not None:
+                cache.put(key, out)
+            pending.popleft()
+            yield out
+        yield from drain_hits()
+    except Exception:
+        # a pipeline failure must not drop documents: finish the remaining
+        # ones one at a time, as extract_parameters would
+        for text, _, hit, _ in pending:
+            yield hit if hit is not None else extract_parameters(text, cache=cache or False, fields=fields,
+                                                                 backend=backend)
+        for text in texts:
+            yield extract_parameters(text, cache=cache or False, fields=fields, backend=backend)
+
+
+# Streaming: windows of STREAM_WINDOW_CHARS owned characters, each parsed with
+# STREAM_OVERLAP_CHARS of context on both sides. A match is reported by the
+# window owning its first character, so the overlap must exceed the longest
+# match (plus the 40 characters of context the fs_hz rule inspects).
+STREAM_WINDOW_CHARS = 100000
+STREAM_OVERLAP_CHARS = 2000
+
+
+def _iter_chunks(source) -> Iterator[str]:
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(1 << 16), '')
+    else:
+        yield from source
+
+
+def _stream_windows(chunks: Iterable[str], window_chars: int, overlap: int):
+    """Yield (window_text, owned_start, owned_end) over the concatenated chunks.
+
+    Owned ranges tile the text without gaps; offsets are relative to the
+    window. At most one window plus one chunk is buffered.
+    """
+    parts = []
+    size = 0
+    owned = 0           # start of the next owned range within the buffer
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts.append(chunk)
+        size += len(chunk)
+        if size - owned < window_chars + overlap:
+            continue
+        buf = ''.join(parts)
+        while len(buf) - owned >= window_chars + overlap:
+            lo = max(0, owned - overlap)
+            hi = owned + window_chars
+            yield buf[lo:hi + overlap], owned - lo, hi - lo
+            cut = max(0, hi - overlap)
+            buf = buf[cut:]
+            owned = hi - cut
+        parts = [buf]
+        size = len(buf)
+    buf = ''.join(parts)
+    if len(buf) > owned:
+        lo = max(0, owned - overlap)
+        yield buf[lo:], owned - lo, len(buf) - lo
+
+
+def _text_to_doc_offset(doc, offset: int) -> int:
+    """Inverse of doc_offset_to_text; offsets outside all windows move forward."""
+    offsets = doc.user_data.get('astrocore_offsets')
+    if not offsets:
+        return offset
+    for i, (doc_start, text_start) in enumerate(offsets):
+        if i + 1 < len(offsets):
+            doc_end = offsets[i + 1][0] - len(_PREFILTER_SEP)
+        else:
+            doc_end = len(doc.text)
+        if offset < text_start:
+            return doc_start
+        if offset < text_start + doc_end - doc_start:
+            return doc_start + offset - text_start
+    return len(doc.text)
+
+
+def extract_parameters_stream(chunks, window_chars: int = STREAM_WINDOW_CHARS,
+                              overlap: int = STREAM_OVERLAP_CHARS, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Extract parameters from a document delivered as an iterable of text chunks.
+
+    `chunks` may be any iterable of strings (lines, pages, ...), a text file
+    object, or a single string; chunks are concatenated as-is. The text is
+    processed in overlapping windows so matches across chunk boundaries are
+    kept, and per-window candidates are merged with the same precedence as
+    `extract_parameters` (first match for regex rules, last mention for the
+    spaCy unit/proximity rules). Memory stays bounded by the window size
+    whatever the document length. Results are not cached. `backend` is as
+    in `extract_parameters`.
+    """
+    if overlap < 0 or window_chars <= 0:
+        raise ValueError('window_chars must be positive and overlap non-negative')
+    hits = {}
+    scan = None
+    seen_text = False
+    nlp = _get_pipeline(backend)
+    for window, start, end in _stream_windows(_iter_chunks(chunks), window_chars, overlap):
+        seen_text = True
+        with nlp_stats.stage('regex_rules'):
+            window_hits = _match_rules(window, _normalize_dashes(window), start, end)
+        for name, m in window_hits.items():
+            if name == 'methods':
+                # every method mentioned in the owned ranges, not only the first window's
+                m = m.before(end)
+                hits[name] = hits[name].union(m) if name in hits else m
+            else:
+                hits.setdefault(name, m)
+        if nlp is None:
+            continue
+        try:
+            doc = _parse(nlp, window)
+            if doc is None:
+                continue
+            span = (_text_to_doc_offset(doc, start), _text_to_doc_offset(doc, end))
+            window_scan = _scan_doc(doc, span)
+        except Exception:
+            # spaCy enrichment is best-effort, as in extract_parameters
+            continue
+        if scan is None:
+            scan = window_scan
+        else:
+            scan.merge(window_scan)
+    out = _empty_result()
+    if not seen_text:
+        return out
+    stats = nlp_stats.current()
+    if stats is not None:
+        stats.record_document()
+    if scan is not None:
+        spacy_enrich_extraction(None, out, scan=scan)
+    return _apply_rules(out, hits, scan)
+
+
+def _timed_iter(it, stage: str):
+    # time spent producing each item; for nlp.pipe this includes feeding it
+    it = iter(it)
+    while True:
+        with nlp_stats.stage(stage):
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+        yield item
+
+
+def _extract_with_doc(text: str, doc, plan: _FieldPlan = _FULL_PLAN) -> Dict[str, Any]:
+    """Run the regex rules and spaCy enrichment for one text and its Doc (or None)."""
+    out = _empty_result()
+    if not text:
+        return _project(out, plan)
+
+    stats = nlp_stats.current()
+    if stats is not None:
+        stats.record_document()
+    lowered = _normalize_dashes(text)
 
     # If spaCy provided a doc, attempt to enrich extraction with entity/dependency cues
+    scan = None
     if doc is not None:
         try:
-            spacy_enrich_extraction(doc, out)
+            scan = _scan_doc(doc, entities=plan.entities)
+            with nlp_stats.stage('spacy_enrich'):
+                spacy_enrich_extraction(doc, out, scan=scan)
         except Exception:
             # ensure spaCy enrich is best-effort and doesn't break pipeline
             pass
 
-    # Methods detection (Welch, FFT, ICA, Welch's method)
-    # handle variations like "Welch", "Welch's method", "Welch method"
-    if re.search(r"\bwelch(?:'s)?(?:\s+method)?\b", lowered, flags=re.IGNORECASE):
-        out['methods'].append('Welch')
-    if re.search(r'\bfft\b', lowered, flags=re.IGNORECASE):
-        out['methods'].append('FFT')
-    if re.search(r'\bica\b', lowered, flags=re.IGNORECASE):
-        out['methods'].append('ICA')
-    if re.search(r'\bmne\b', lowered, flags=re.IGNORECASE):
-        out['methods'].append('MNE')
+    with nlp_stats.stage('regex_rules'):
+        hits = _match_rules(text, lowered, rules=plan.rules)
+    with nlp_stats.stage('apply_rules'):
+        return _project(_apply_rules(out, hits, scan), plan)
+
+
+def _empty_result() -> Dict[str, Any]:
+    return {
+        'methods': [],
+        'params': {},
+        'bandpass': None,
+        'filters': [],
+    }
+
+
+def _normalize_dashes(text: str) -> str:
+    # normalize unicode dashes to simple hyphen for range detection
+    return text.replace('\u2013', '-').replace('\u2014', '-')
+
+
+def _apply_rules(out: Dict[str, Any], hits: Dict[str, Any], scan: Optional['_TokenScan']) -> Dict[str, Any]:
+    """Fill `out` from the first match per rule, falling back to spaCy candidates."""
+    # Methods detection: canonical names from the method ontology, in its order
+    m = hits.get('methods')
+    if m:
+        out['methods'].extend(m.names())
 
     # nperseg or nperseg=2048 or nperseg : 2048
-    m = re.search(r'\bnperseg\b\s*[=:\s]?\s*(\d+)', text, flags=re.IGNORECASE)
+    m = hits.get('nperseg')
     if m:
         out['params']['nperseg'] = int(m.group(1))
     else:
         # try spaCy-based numeric proximity detection (e.g., "nperseg 1024")
-        if doc is not None:
-            for i, token in enumerate(doc):
-                if token.text.lower().startswith('nperseg') and i + 1 < len(doc) and doc[i+1].like_num:
-                    try:
-                        out['params']['nperseg'] = int(float(doc[i+1].text))
-                        break
-                    except Exception:
-                        pass
+        if scan is not None and scan.nperseg is not None:
+            out['params']['nperseg'] = scan.nperseg
 
-    # window=\'hann\' or window=hann or window: hann
     # window may be specified as window=hann or window: 'hann'
-    m2 = re.search(r"\bwindow\b\s*[=:\s]?\s*'?([A-Za-z0-9_\-]+)'?", text, flags=re.IGNORECASE)
+    m2 = hits.get('window')
     if m2:
         out['params']['window'] = m2.group(1)
 
     # nfft
-    m3 = re.search(r'\bnfft\b\s*[=:\s]?\s*(\d+)', text, flags=re.IGNORECASE)
+    m3 = hits.get('nfft')
     if m3:
         out['params']['nfft'] = int(m3.group(1))
 
-    # bandpass ranges like 1-40 Hz or 1 to 40 Hz
     # bandpass ranges like 1-40 Hz or 1 to 40 Hz; also allow parentheses
     # handle units like kHz, Hz, and unicode dashes
-
-    m4 = re.search(r'([0-9]+(?:\.[0-9]+)?)\s*(?:-|to)\s*([0-9]+(?:\.[0-9]+)?)\s*(k?m?hz|hz)?', lowered, flags=re.IGNORECASE)
+    m4 = hits.get('bandpass')
     if m4:
         g1 = m4.group(1)
         g2 = m4.group(2)
@@ -200,78 +1010,61 @@ def extract_parameters(text: str) -> Dict[str, Any]:
         else:
             out['bandpass'] = (float(g1), float(g2))
     else:
-        if doc is not None:
-            # try to find pattern like "1 to 40 Hz" using tokens
-            for i, token in enumerate(doc[:-2]):
-                if token.like_num and doc[i+1].text.lower() in ('to', '-') and doc[i+2].like_num:
-                    # check following token for Hz
-                    j = i + 3
-                    if j < len(doc) and doc[j].text.lower().startswith('hz'):
-                        try:
-                            out['bandpass'] = (float(token.text), float(doc[i+2].text))
-                            break
-                        except Exception:
-                            pass
+        # try to find pattern like "1 to 40 Hz" using tokens
+        if scan is not None and scan.bandpass is not None:
+            out['bandpass'] = scan.bandpass
 
     # lowpass / highpass
-    m5 = re.search(r'low-?pass\s*(?:[:=]\s*)?(\d+(?:\.\d+)?)\s*Hz', text, flags=re.IGNORECASE)
+    m5 = hits.get('lowpass')
     if m5:
         out['filters'].append({'type': 'lowpass', 'cutoff': float(m5.group(1))})
-    m6 = re.search(r'high-?pass\s*(?:[:=]\s*)?(\d+(?:\.\d+)?)\s*Hz', text, flags=re.IGNORECASE)
+    m6 = hits.get('highpass')
     if m6:
         out['filters'].append({'type': 'highpass', 'cutoff': float(m6.group(1))})
 
     # filter design mention
-    if re.search(r'butterworth|butter\b|fir\b|iir\b', text, flags=re.IGNORECASE):
-        out['filters'].append({'type': 'design_hint', 'value': re.search(r'(butterworth|butter|fir|iir)', text, flags=re.IGNORECASE).group(1)})
+    if 'design' in hits:
+        out['filters'].append({'type': 'design_hint', 'value': hits['design_value'].group(1)})
 
     # data path: enhanced heuristics for file paths ending with common extensions
     # support windows paths, unix paths, quoted paths
-    m_data = re.search(r"(?P<path>['\"]?([A-Za-z]:)?[\\/\w\-\.]+\.(?:csv|mat|npy|fif|edf)['\"]?)", text, flags=re.IGNORECASE)
+    m_data = hits.get('data_path')
     if m_data:
         p = m_data.group('path')
         # strip quotes
         out['data_path'] = p.strip("'\"")
     else:
-        m_data2 = re.search(r"data\s*(?:file|set)?\s*(?:[:=\-])?\s*['\"]?(?P<p>[\w\-/\\\.]+)['\"]?", text, flags=re.IGNORECASE)
+        m_data2 = hits.get('data_path_loose')
         if m_data2:
             out['data_path'] = m_data2.group('p')
         # spaCy-based detection: look for token that looks like a PATH (contains '/')
-        if 'data_path' not in out and doc is not None:
-            for token in doc:
-                if '/' in token.text and any(ext in token.text.lower() for ext in ('.csv', '.mat', '.npy', '.fif', '.edf')):
-                    out['data_path'] = token.text.strip("'\"")
-                    break
+        if 'data_path' not in out and scan is not None and scan.path is not None:
+            out['data_path'] = scan.path
 
-    # sampling rate detection: e.g., fs=1000 or sampling rate 1000 Hz
     # sampling rate detection: e.g., fs=1000, fs=1 kHz, sampling rate 1000 Hz, 1000Hz
-    m_fs = re.search(r"\bfs\b\s*[=:\s]?\s*([0-9]+(?:\.[0-9]+)?\s*(?:k?m?hz|hz)?)", lowered, flags=re.IGNORECASE)
+    m_fs = hits.get('fs')
     if m_fs:
         try:
             out['fs'] = _freq_to_hz(m_fs.group(1))
         except Exception:
             out['fs'] = float(re.sub(r'[^0-9\.]', '', m_fs.group(1)))
     else:
-        m_fs2 = re.search(r"sampling rate\s*(?:is|was)?\s*([0-9]+(?:\.[0-9]+)?\s*(?:k?m?hz|hz)?)", lowered, flags=re.IGNORECASE)
+        m_fs2 = hits.get('fs_sampling_rate')
         if m_fs2:
             try:
                 out['fs'] = _freq_to_hz(m_fs2.group(1))
             except Exception:
                 out['fs'] = float(re.sub(r'[^0-9\.]', '', m_fs2.group(1)))
         # spaCy fallback: look for token 'fs' followed by numeric token
-        if 'fs' not in out and doc is not None:
-            for i, token in enumerate(doc[:-1]):
-                if token.text.lower() == 'fs' and doc[i+1].like_num:
-                    try:
-                        out['fs'] = float(doc[i+1].text)
-                        break
-                    except Exception:
-                        pass
+        if 'fs' not in out and scan is not None and scan.fs_after_keyword is not None:
+            out['fs'] = scan.fs_after_keyword
 
         # regex-based fallback: number + Hz with nearby sampling/downsample keywords
         if 'fs' not in out:
-            m_numhz = re.search(r"(\d+(?:\.\d+)?)\s*hz", lowered, flags=re.IGNORECASE)
+            m_numhz = hits.get('fs_hz')
             if m_numhz:
+                # m_numhz searched the dash-normalized text
+                lowered = m_numhz.string
                 start, end = m_numhz.span()
                 ctx = lowered[max(0, start - 40): min(len(lowered), end + 40)]
                 if any(k in ctx for k in ('sampling', 'sampled', 'downsampl', 'fs', 'sampling rate')):
@@ -284,17 +1077,8 @@ def extract_parameters(text: str) -> Dict[str, Any]:
                             pass
 
     # Additional spaCy-driven numeric extraction: look for patterns like 'sampling frequency 1000 Hz' or bare numbers near keywords
-    if 'fs' not in out and doc is not None:
-        for i, token in enumerate(doc[:-2]):
-            if token.like_num and doc[i+1].text.lower() in ('hz', 'hz.', 'hz,'):
-                # look backwards for 'sampling' or 'fs' within a few tokens
-                window = doc[max(0, i-4):i]
-                if any(t.text.lower() in ('sampling', 'rate', 'frequency', 'fs') for t in window):
-                    try:
-                        out['fs'] = float(token.text)
-                        break
-                    except Exception:
-                        pass
+    if 'fs' not in out and scan is not None and scan.fs_before_hz is not None:
+        out['fs'] = scan.fs_before_hz
     # compute a small heuristic confidence score if not provided
     if 'confidence' not in out:
         out['confidence'] = compute_confidence(out)
@@ -302,39 +1086,171 @@ def extract_parameters(text: str) -> Dict[str, Any]:
     return out
 
 
-def spacy_enrich_extraction(doc, out: Dict[str, Any]):
-    """Use spaCy Doc to refine numeric/path/entity extraction.
+_SAMPLING_KEYWORDS = ('sampling', 'rate', 'frequency', 'fs')
+_PATH_EXTENSIONS = ('.csv', '.mat', '.npy', '.fif', '.edf')
+_UNIT_RE = re.compile(r'(\d+(?:\.\d+)?\s*(?:k?m?hz|hz))')
+_PATH_RE = _RULE_PATTERNS['data_path']
+
+# Single-token patterns formerly run through a spaCy Matcher rebuilt on every
+# call; they are now checked inside the fused token pass below.
+# number + 'Hz' attached (token may be like '1000hz')
+_FREQ_ATTACHED_RE = re.compile('^[0-9]+(\\.[0-9]+)?(k|m)?hz$')
+# windows path-like token containing backslash and a known extension
+_PATH_WIN_RE = re.compile(r"^[A-Za-z]:\\\\.*\\.(csv|mat|npy|fif|edf)$")
+# unix path
+_PATH_UNIX_RE = re.compile(r"^/.*/.*\\.(csv|mat|npy|fif|edf)$")
+
 
-    This is best-effort: it updates `out` in-place.
+class _TokenScan:
+    """Token and entity candidates collected in a single pass over a Doc.
+
+    Fields in `_LAST` are the last values written by the unit pattern,
+    proximity and entity rules of spacy_enrich_extraction (later mentions
+    win); the other fields hold the first match of each rule. `merge` folds
+    the scan of a later part of the same document into this one.
     """
-    # If matcher available, try pattern matches first
-    try:
-        from spacy.matcher import Matcher
-        matcher = Matcher(doc.vocab)
-        # pattern: number + (hz|kHz|MHz)
-        matcher.add('FREQ_HZ', [[{'LIKE_NUM': True}, {'LOWER': {'IN': ['hz','khz','mhz']}}]])
-        # pattern: number + 'Hz' attached (token may be like '1000Hz')
-        matcher.add('FREQ_ATTACHED', [[{'TEXT': {'REGEX': '^[0-9]+(\\.[0-9]+)?(k|m)?hz$'}}]])
-        # pattern: windows path-like token containing backslash and a known extension
-        matcher.add('PATH_WIN', [[{'TEXT': {'REGEX': r"^[A-Za-z]:\\\\.*\\.(csv|mat|npy|fif|edf)$"}}]])
-        # pattern: unix path
-        matcher.add('PATH_UNIX', [[{'TEXT': {'REGEX': r"^/.*/.*\\.(csv|mat|npy|fif|edf)$"}}]])
-        matches = matcher(doc)
-        for mid, start, end in matches:
-            name = doc.vocab.strings[mid]
-            span = doc[start:end]
-            txt = span.text
-            if name in ('FREQ_HZ','FREQ_ATTACHED'):
+    __slots__ = ('pattern_fs', 'pattern_path', 'enrich_fs', 'nperseg', 'bandpass', 'path',
+                 'fs_after_keyword', 'fs_before_hz', 'ent_unit_fs', 'ent_bare_fs', 'ent_path',
+                 'raw_path')
+    _LAST = ('pattern_fs', 'enrich_fs', 'ent_unit_fs', 'ent_path')
+
+    def __init__(self):
+        self.pattern_fs = None
+        self.pattern_path = None
+        self.enrich_fs = None
+        self.nperseg = None
+        self.bandpass = None
+        self.path = None
+        self.fs_after_keyword = None
+        self.fs_before_hz = None
+        # entity rules: last unit-aware fs, first bare numeric fs, last path
+        self.ent_unit_fs = None
+        self.ent_bare_fs = None
+        self.ent_path = None
+        # first path found by the raw-text regex fallback
+        self.raw_path = None
+
+    def merge(self, later: '_TokenScan') -> None:
+        for name in self.__slots__:
+            value = getattr(later, name)
+            if value is not None and (name in self._LAST or getattr(self, name) is None):
+                setattr(self, name, value)
+
+
+def _scan_doc(doc, span=None, entities: bool = True) -> _TokenScan:
+    """Scan tokens, entities and raw text of `doc` for enrichment candidates.
+
+    `span` is an optional (start, end) character range of `doc.text`: only
+    candidates starting inside it are collected, with the surrounding tokens
+    still used as context. With `entities=False` only the token pass runs.
+    """
+    lo, hi, char_lo, char_hi = 0, len(doc), 0, len(doc.text)
+    if span is not None:
+        char_lo, char_hi = span
+        starts = [t.idx for t in doc]
+        lo, hi = bisect.bisect_left(starts, char_lo), bisect.bisect_left(starts, char_hi)
+    with nlp_stats.stage('token_scan'):
+        scan = _scan_tokens(doc, lo, hi)
+    if entities:
+        with nlp_stats.stage('entity_scan'):
+            _scan_entities(doc, scan, lo, hi)
+        with nlp_stats.stage('raw_path_scan'):
+            text = doc.text
+            folded = text.lower()
+            if _CASEFOLD_HAZARDS.search(text) or any(ext in folded for ext in _PATH_EXTENSIONS):
+                m = _PATH_RE.search(text, char_lo)
+                if m and m.start() < char_hi:
+                    scan.raw_path = m.group('path').strip('"\'')
+    stats = nlp_stats.current()
+    if stats is not None:
+        # token/entity rules share one pass: hits per document, time per stage
+        for name in _TokenScan.__slots__:
+            stats.record_rule('spacy:' + name, 0.0, getattr(scan, name) is not None)
+    return scan
+
+
+def _scan_tokens(doc, lo: int = 0, hi: Optional[int] = None) -> _TokenScan:
+    """Collect every numeric/unit/path token candidate in one pass over `doc`.
+
+    Only tokens ``doc[lo:hi]`` are considered as candidates.
+    """
+    from spacy.attrs import LIKE_NUM, LOWER
+    scan = _TokenScan()
+    arr = doc.to_array([LIKE_NUM, LOWER])
+    nums = arr[:, 0].tolist()
+    strings = doc.vocab.strings
+    lowers = [strings[h] for h in arr[:, 1].tolist()]
+    n = len(lowers)
+    for i in range(lo, n if hi is None else hi):
+        low = lowers[i]
+        num = nums[i]
+        # unit patterns: "1000 Hz" / "1 kHz" and attached "1000hz"
+        if num and i + 1 < n and lowers[i + 1] in ('hz', 'khz', 'mhz'):
+            try:
+                scan.pattern_fs = _freq_to_hz(doc[i:i + 2].text)
+            except Exception:
+                pass
+        if low.endswith('hz') and _FREQ_ATTACHED_RE.search(doc[i].text):
+            try:
+                scan.pattern_fs = _freq_to_hz(doc[i].text)
+            except Exception:
+                pass
+        # path patterns
+        if scan.pattern_path is None and (':' in low or low.startswith('/')):
+            txt = doc[i].text
+            if _PATH_WIN_RE.search(txt) or _PATH_UNIX_RE.search(txt):
+                scan.pattern_path = txt.strip('"\'')
+        if i + 1 < n:
+            nxt = lowers[i + 1]
+            # number followed by 'hz' with a sampling keyword on the left
+            if num and nxt.startswith('hz') and any(t in _SAMPLING_KEYWORDS for t in lowers[max(0, i - 4):i]):
                 try:
-                    out['fs'] = _freq_to_hz(txt)
+                    scan.enrich_fs = float(doc[i].text)
                 except Exception:
                     pass
-            if name in ('PATH_WIN','PATH_UNIX') and 'data_path' not in out:
-                out['data_path'] = txt.strip('"\'')
-    except Exception:
-        pass
-    # Entities: look for PATH-like tokens or quoted strings
+            # 'fs' followed by a number
+            if low == 'fs' and nums[i + 1]:
+                try:
+                    value = float(doc[i + 1].text)
+                    scan.enrich_fs = value
+                    if scan.fs_after_keyword is None:
+                        scan.fs_after_keyword = value
+                except Exception:
+                    pass
+            # "nperseg 1024"
+            if scan.nperseg is None and nums[i + 1] and low.startswith('nperseg'):
+                try:
+                    scan.nperseg = int(float(doc[i + 1].text))
+                except Exception:
+                    pass
+        if i + 2 < n and num:
+            # "1 to 40 Hz"
+            if (scan.bandpass is None and lowers[i + 1] in ('to', '-') and nums[i + 2]
+                    and i + 3 < n and lowers[i + 3].startswith('hz')):
+                try:
+                    scan.bandpass = (float(doc[i].text), float(doc[i + 2].text))
+                except Exception:
+                    pass
+            # "sampling frequency 1000 Hz"
+            if (scan.fs_before_hz is None and lowers[i + 1] in ('hz', 'hz.', 'hz,')
+                    and any(t in _SAMPLING_KEYWORDS for t in lowers[max(0, i - 4):i])):
+                try:
+                    scan.fs_before_hz = float(doc[i].text)
+                except Exception:
+                    pass
+        # path-like token containing '/' and a known extension
+        if scan.path is None and '/' in low and any(ext in low for ext in _PATH_EXTENSIONS):
+            scan.path = doc[i].text.strip("'\"")
+    return scan
+
+
+def _scan_entities(doc, scan: _TokenScan, lo: int = 0, hi: Optional[int] = None) -> None:
+    """Record numeric and path-like entity candidates starting in ``doc[lo:hi]``."""
     for ent in doc.ents:
+        if ent.start < lo:
+            continue
+        if hi is not None and ent.start >= hi:
+            break
         # numeric entities
         if ent.label_ in ('CARDINAL', 'QUANTITY', 'PERCENT') and ent.text:
             # look for keyword nearby and prefer unit-aware matches
@@ -343,48 +1259,51 @@ def spacy_enrich_extraction(doc, out: Dict[str, Any]):
             txt = window.text.lower()
             if 'fs' in txt or 'sampling' in txt or 'frequency' in txt:
                 # if unit present in window, extract unit-aware numeric
-                m_unit = re.search(r'(\d+(?:\.\d+)?\s*(?:k?m?hz|hz))', txt)
+                m_unit = _UNIT_RE.search(txt)
                 if m_unit:
                     try:
-                        out['fs'] = _freq_to_hz(m_unit.group(1))
+                        scan.ent_unit_fs = _freq_to_hz(m_unit.group(1))
                     except Exception:
                         pass
-                else:
-                    # only set bare numeric if fs not already set (don't override unit-aware)
-                    if 'fs' not in out:
-                        try:
-                            out['fs'] = float(ent.text)
-                        except Exception:
-                            pass
-        # path-like patterns
-        if '/' in ent.text or '\\' in ent.text:
-            t = ent.text.strip("'\"")
-            if any(t.lower().endswith(ext) for ext in ('.csv', '.mat', '.npy', '.fif', '.edf')):
-                out['data_path'] = t
-
-    # token-based proximity: find numeric tokens followed by 'hz' or preceded by 'fs'
-    for i, token in enumerate(doc[:-1]):
-        if token.like_num:
-            nxt = doc[i+1]
-            if nxt.text.lower().startswith('hz'):
-                # check left context
-                left = doc[max(0, i-4):i]
-                if any(t.text.lower() in ('sampling', 'rate', 'frequency', 'fs') for t in left):
+                elif scan.ent_bare_fs is None:
                     try:
-                        out['fs'] = float(token.text)
+                        scan.ent_bare_fs = float(ent.text)
                     except Exception:
                         pass
-        if token.text.lower() == 'fs' and i + 1 < len(doc) and doc[i+1].like_num:
-            try:
-                out['fs'] = float(doc[i+1].text)
-            except Exception:
-                pass
+        # path-like patterns
+        if '/' in ent.text or '\\' in ent.text:
+            t = ent.text.strip("'\"")
+            if any(t.lower().endswith(ext) for ext in _PATH_EXTENSIONS):
+                scan.ent_path = t
+
+
+def spacy_enrich_extraction(doc, out: Dict[str, Any], scan: Optional[_TokenScan] = None):
+    """Use spaCy Doc to refine numeric/path/entity extraction.
+
+    This is best-effort: it updates `out` in-place. `scan` may pass a
+    precomputed `_scan_doc(doc)` to avoid walking the document twice.
+    """
+    if scan is None:
+        scan = _scan_doc(doc)
+    # unit and path patterns first (number + Hz/kHz/MHz, attached 1000hz, paths)
+    if scan.pattern_fs is not None:
+        out['fs'] = scan.pattern_fs
+    if scan.pattern_path is not None and 'data_path' not in out:
+        out['data_path'] = scan.pattern_path
+    # Entities: a unit-aware value near a sampling keyword wins (the last
+    # one); a bare number only fills in when nothing set fs before it
+    if scan.ent_unit_fs is not None:
+        out['fs'] = scan.ent_unit_fs
+    elif scan.ent_bare_fs is not None and 'fs' not in out:
+        out['fs'] = scan.ent_bare_fs
+    if scan.ent_path is not None:
+        out['data_path'] = scan.ent_path
 
+    # token-based proximity: numeric tokens followed by 'hz' or preceded by 'fs'
+    # (collected by the fused token pass; the last mention wins)
+    if scan.enrich_fs is not None:
+        out['fs'] = scan.enrich_fs
 
-    # end of spacy_enrich_extraction
     # fallback: search the raw text for paths if none found
-    if 'data_path' not in out:
-        txt = doc.text
-        m = re.search(r"(?P<path>['\"]?([A-Za-z]:)?[\\/\w\-\.]+\.(?:csv|mat|npy|fif|edf)['\"]?)", txt, flags=re.IGNORECASE)
-        if m:
-            out['data_path'] = m.group('path').strip('"\'')
+    if 'data_path' not in out and scan.raw_path is not None:
+        out['data_path'] = scan.raw_path
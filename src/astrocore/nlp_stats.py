@@ -0,0 +1,164 @@
+"""Opt-in timing and hit-rate counters for the parameter extractor.
+
+Collection is off by default and costs one attribute lookup per rule table
+pass when disabled. Enable it for a block of code with::
+
+    from astrocore import nlp_stats
+    with nlp_stats.collect() as stats:
+        extract_parameters(text)
+    print(stats.report())
+
+or for a whole process (and its worker processes) by setting the environment
+variable ASTROCORE_NLP_STATS=1; the process-wide collector is then returned
+by `current()`.
+
+Rules are the regex rules of the rule table (`calls` counts searches that
+passed the literal anchor gate, `skipped` those the gate ruled out) and the
+spaCy token/entity candidates (prefixed ``spacy:``; counted per document
+scanned, timed as part of their stage). Stages are the coarse steps of one
+extraction: prefilter, spacy_parse, token_scan, entity_scan, ...
+"""
+import os
+import json
+import time
+import threading
+import contextlib
+from typing import Any, Dict, Optional
+
+STATS_ENV_VAR = 'ASTROCORE_NLP_STATS'
+
+
+class ExtractionStats:
+    """Per-rule and per-stage counters; safe to share between threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        # name -> [calls, hits, skipped, seconds]
+        self.rules = {}
+        # name -> [calls, seconds]
+        self.stages = {}
+
+    def record_rule(self, name: str, seconds: float, hit: bool) -> None:
+        with self._lock:
+            r = self.rules.get(name)
+            if r is None:
+                r = self.rules[name] = [0, 0, 0, 0.0]
+            r[0] += 1
+            r[1] += bool(hit)
+            r[3] += seconds
+
+    def record_skip(self, name: str) -> None:
+        with self._lock:
+            r = self.rules.get(name)
+            if r is None:
+                r = self.rules[name] = [0, 0, 0, 0.0]
+            r[2] += 1
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            s = self.stages.get(name)
+            if s is None:
+                s = self.stages[name] = [0, 0.0]
+            s[0] += 1
+            s[1] += seconds
+
+    def record_document(self) -> None:
+        with self._lock:
+            self.documents += 1
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - t0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of all counters."""
+        with self._lock:
+            rules = {
+                name: {'calls': c, 'hits': h, 'skipped': s, 'seconds': sec,
+                       'hit_rate': h / c if c else 0.0}
+                for name, (c, h, s, sec) in sorted(self.rules.items())
+            }
+            stages = {name: {'calls': c, 'seconds': sec} for name, (c, sec) in sorted(self.stages.items())}
+            return {'documents': self.documents, 'rules': rules, 'stages': stages}
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """Add the counters of an `as_dict` snapshot (e.g. from a worker process)."""
+        with self._lock:
+            self.documents += snapshot.get('documents', 0)
+            for name, r in snapshot.get('rules', {}).items():
+                mine = self.rules.setdefault(name, [0, 0, 0, 0.0])
+                mine[0] += r['calls']
+                mine[1] += r['hits']
+                mine[2] += r['skipped']
+                mine[3] += r['seconds']
+            for name, s in snapshot.get('stages', {}).items():
+                mine = self.stages.setdefault(name, [0, 0.0])
+                mine[0] += s['calls']
+                mine[1] += s['seconds']
+
+    def take(self) -> Dict[str, Any]:
+        """Return a snapshot and reset the counters."""
+        snapshot = self.as_dict()
+        self.reset()
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self.documents = 0
+            self.rules = {}
+            self.stages = {}
+
+    def to_json(self, path=None, indent: int = 2) -> str:
+        """Serialize the snapshot; also write it to `path` when given."""
+        data = json.dumps(self.as_dict(), indent=indent)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        return data
+
+    def report(self) -> str:
+        """Return a plain-text table, slowest rules and stages first."""
+        snap = self.as_dict()
+        lines = [f"documents: {snap['documents']}", '',
+                 f"{'stage':<24} {'calls':>8} {'total ms':>10} {'ms/call':>9}"]
+        for name, s in sorted(snap['stages'].items(), key=lambda kv: -kv[1]['seconds']):
+            per = s['seconds'] * 1000.0 / s['calls'] if s['calls'] else 0.0
+            lines.append(f"{name:<24} {s['calls']:>8} {s['seconds'] * 1000.0:>10.2f} {per:>9.3f}")
+        lines += ['', f"{'rule':<24} {'calls':>8} {'skipped':>8} {'hits':>8} {'hit rate':>9} {'total ms':>10}"]
+        for name, r in sorted(snap['rules'].items(), key=lambda kv: (-kv[1]['seconds'], kv[0])):
+            lines.append(f"{name:<24} {r['calls']:>8} {r['skipped']:>8} {r['hits']:>8} "
+                         f"{r['hit_rate']:>9.1%} {r['seconds'] * 1000.0:>10.2f}")
+        return '\n'.join(lines)
+
+
+_NULL_STAGE = contextlib.nullcontext()
+_ENV_STATS = ExtractionStats() if os.environ.get(STATS_ENV_VAR, '') not in ('', '0') else None
+_LOCAL = threading.local()
+
+
+def current() -> Optional[ExtractionStats]:
+    """Return the collector in effect for this thread, or None when disabled."""
+    return getattr(_LOCAL, 'stats', None) or _ENV_STATS
+
+
+def stage(name: str):
+    """Context manager timing a stage on the current collector (no-op if disabled)."""
+    stats = current()
+    return _NULL_STAGE if stats is None else stats.stage(name)
+
+
+@contextlib.contextmanager
+def collect(stats: Optional[ExtractionStats] = None):
+    """Collect extractor statistics in this thread for the duration of the block."""
+    stats = stats if stats is not None else ExtractionStats()
+    previous = getattr(_LOCAL, 'stats', None)
+    _LOCAL.stats = stats
+    try:
+        yield stats
+    finally:
+        _LOCAL.stats = previous
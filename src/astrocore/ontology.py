@@ -0,0 +1,195 @@
+"""Method ontology: canonical analysis-method names, their aliases and hints.
+
+The ontology is data (``methods.json`` next to this module): each method has
+a canonical name, the aliases it is written as in papers, a category, the
+extracted parameters relevant to it and, optionally, the codegen template
+that implements it. Aliases are matched case-insensitively as whole words; a
+space inside an alias also matches a whitespace run or a hyphen, so
+"fast Fourier transform" and "fast-Fourier transform" are the same alias.
+
+All aliases are compiled into one regex shaped as a trie (a shared prefix is
+matched once, and the longest alias at a position wins), so a search costs
+about one pass over the text however many aliases the ontology holds::
+
+    from astrocore import ontology
+    hits = ontology.default_ontology().search("ICA and the fast Fourier transform")
+    hits.names()   # ['FFT', 'ICA'], in ontology order
+"""
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+ONTOLOGY_PATH = Path(__file__).with_name('methods.json')
+
+_SEPARATOR = r'(?:\s+|-)'
+_END = ''  # trie key marking the end of an alias
+# The only characters for which str.lower() does not agree with IGNORECASE
+# matching against ASCII letters (or changes the string length). Texts
+# without them are lowercased and searched case-sensitively, which is
+# several times faster than an IGNORECASE search.
+_CASE_HAZARDS = re.compile('[\u0130\u0131\u017f]')
+
+
+class MethodHits:
+    """Canonical methods found by `MethodOntology.search`, with their first offsets.
+
+    Plays the part of a match object in the extractor's rule table: it is
+    truthy when something was found and `start()` is the earliest offset.
+    """
+    __slots__ = ('_ontology', '_first')
+
+    def __init__(self, ontology: 'MethodOntology', first: Dict[str, int]):
+        self._ontology = ontology
+        self._first = first
+
+    def __bool__(self):
+        return bool(self._first)
+
+    def __contains__(self, name):
+        return name in self._first
+
+    def start(self) -> int:
+        return min(self._first.values()) if self._first else -1
+
+    def offsets(self) -> Dict[str, int]:
+        return dict(self._first)
+
+    def names(self) -> List[str]:
+        """Canonical names found, in ontology order."""
+        order = self._ontology._order
+        return sorted(self._first, key=order.__getitem__)
+
+    def before(self, end: int) -> 'MethodHits':
+        """The hits whose first offset is before `end`."""
+        return MethodHits(self._ontology, {k: v for k, v in self._first.items() if v < end})
+
+    def union(self, other: 'MethodHits') -> 'MethodHits':
+        first = dict(other._first)
+        for name, pos in self._first.items():
+            first[name] = min(pos, first.get(name, pos))
+        return MethodHits(self._ontology, first)
+
+    def __repr__(self):
+        return f'<MethodHits {self.names()}>'
+
+
+class MethodOntology:
+    """A set of methods loaded from an ontology document (see the module docstring)."""
+
+    def __init__(self, doc: Dict[str, Any]):
+        self.version = doc.get('version')
+        self.entries: Tuple[Dict[str, Any], ...] = tuple(doc['methods'])
+        self._order = {}
+        self._by_alias = {}
+        for i, entry in enumerate(self.entries):
+            name = entry['name']
+            if name in self._order:
+                raise ValueError(f'duplicate method {name!r} in ontology')
+            self._order[name] = i
+            for alias in [name] + list(entry.get('aliases', ())):
+                key = _alias_key(alias)
+                owner = self._by_alias.setdefault(key, name)
+                if owner != name:
+                    raise ValueError(f'alias {alias!r} maps to both {owner!r} and {name!r}')
+        self._trie_pattern = None
+        self._regexes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(entry['name'] for entry in self.entries)
+
+    def entry(self, name: str) -> Optional[Dict[str, Any]]:
+        canonical = self.canonical(name)
+        return self.entries[self._order[canonical]] if canonical else None
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical name for a method name or alias (any case), or None."""
+        return self._by_alias.get(_alias_key(name))
+
+    def hints(self, name: str) -> Tuple[str, ...]:
+        """Extracted parameters relevant to a method, e.g. ('fs', 'nperseg')."""
+        entry = self.entry(name)
+        return tuple(entry.get('params', ())) if entry else ()
+
+    def search(self, string: str, pos: int = 0) -> Optional[MethodHits]:
+        """Find every method mentioned in `string[pos:]`; None if there are none."""
+        if string.isascii() or not _CASE_HAZARDS.search(string):
+            regex, group_names = self._compiled(0)
+            string = string.lower()
+        else:
+            regex, group_names = self._compiled(re.IGNORECASE)
+        first = {}
+        for m in regex.finditer(string, pos):
+            name = group_names[m.lastindex]
+            if name not in first:
+                first[name] = m.start()
+        return MethodHits(self, first) if first else None
+
+    def _compiled(self, flags):
+        # compiled on first search so importing the extractor stays cheap
+        compiled = self._regexes.get(flags)
+        if compiled is None:
+            with self._lock:
+                if self._trie_pattern is None:
+                    self._trie_pattern = _trie_pattern(self.entries)
+                pattern, group_names = self._trie_pattern
+                compiled = self._regexes[flags] = (re.compile(pattern, flags), group_names)
+        return compiled
+
+
+def _alias_key(alias: str) -> str:
+    return ' '.join(alias.lower().replace('-', ' ').split())
+
+
+def _alias_tokens(alias: str) -> List[str]:
+    tokens = []
+    for i, word in enumerate(_alias_key(alias).split(' ')):
+        if i:
+            tokens.append(_SEPARATOR)
+        tokens.extend(re.escape(ch) for ch in word)
+    return tokens
+
+
+def _trie_pattern(entries):
+    trie = {}
+    for entry in entries:
+        for alias in [entry['name']] + list(entry.get('aliases', ())):
+            node = trie
+            for token in _alias_tokens(alias):
+                node = node.setdefault(token, {})
+            node.setdefault(_END, entry['name'])
+    group_names = [None]
+
+    def emit(node):
+        # continuations first, the alias ending here last: the regex prefers
+        # the longest alias and backtracks to shorter ones at word boundaries
+        branches = [token + emit(child) for token, child in node.items() if token != _END]
+        if _END in node:
+            group_names.append(node[_END])
+            branches.append(r'\b()')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    pattern = r'\b' + emit(trie)
+    return pattern, tuple(group_names)
+
+
+def load_ontology(path: Union[str, Path] = ONTOLOGY_PATH) -> MethodOntology:
+    """Load a method ontology from a JSON file."""
+    return MethodOntology(json.loads(Path(path).read_text(encoding='utf-8')))
+
+
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_ontology() -> MethodOntology:
+    """The ontology shipped with astrocore (loaded once per process)."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = load_ontology()
+    return _DEFAULT
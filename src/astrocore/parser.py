@@ -5,18 +5,28 @@ This module contains a lightweight, forward-compatible parser. It
 provides a heuristic implementation that can be used as a fallback if
 an enhanced NLP pipeline is not available.
 """
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+import os
+import sys
+import csv
+import functools
+import collections
+import itertools
 import re
 
+# slotted records (no per-instance __dict__) where the interpreter supports it
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Goal:
     title: str
     description: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MaterialSpec:
     name: str
     features: Optional[str] = None
@@ -26,70 +36,336 @@ class MaterialSpec:
     mechanical: Optional[str] = None
 
 
+_PORE_KDA_RE = re.compile(r"(\d{1,3}\s*-\s*\d{1,3}\s*kDa)", flags=re.IGNORECASE)
+_PORE_RANGE_RE = re.compile(r"(\d{1,3}\s*-\s*\d{1,3})\s*(kDa)?", flags=re.IGNORECASE)
+
+
 def _extract_pore_size(text: str) -> Optional[str]:
-    m = re.search(r"(\d{1,3}\s*-\s*\d{1,3}\s*kDa)", text, flags=re.IGNORECASE)
+    m = _PORE_KDA_RE.search(text)
     if m:
         return m.group(1)
     # also try ranges like 50-100
-    m2 = re.search(r"(\d{1,3}\s*-\s*\d{1,3})\s*(kDa)?", text, flags=re.IGNORECASE)
+    m2 = _PORE_RANGE_RE.search(text)
     if m2:
         return m2.group(1) + (" kDa" if m2.group(2) else "")
     return None
 
 
-def parse_text(text: str) -> Dict:
+# Vocabularies: each label is reported when any of its keywords occurs in the
+# text (plain substring test, case-sensitive). Goals carry their description.
+GOAL_KEYWORDS = (
+    ("能量辅助", "对抗线粒体功能障碍，优化代谢，保证 ATP 供应", ("能量供给", "能量辅助")),
+    ("有害物质清除", "增强细胞内外废物处理，防止有毒蛋白质积累", ("有害物质清除", "废物清除")),
+)
+MATERIAL_KEYWORDS = (
+    ("Alginate", ("海藻酸盐", "Alginate")),
+    ("PEG", ("聚乙二醇", "PEG")),
+    ("PES", ("聚醚砜", "PES")),
+    ("PAN", ("聚丙烯腈", "PAN")),
+)
+SURFACE_KEYWORDS = (
+    ("亲水性", ("亲水性", "亲水")),
+    ("中性电荷", ("中性电荷", "中性")),
+)
+MECHANICAL_KEYWORDS = (
+    ("弹性与稳定性要求", ("弹性", "稳定性")),
+)
+# reported once per occurrence in this list (MRS appears twice)
+MONITORING_KEYWORDS = ("MRS", "EEG", "MEG", "PET", "MRI", "AQP4", "脑电图", "MRS")
+
+
+class KeywordMatcher:
+    """Find which of a set of keywords occur in a text, in one pass.
+
+    The keywords are compiled into a single regex shaped as a trie, which
+    reports the longest keyword at each position; shorter keywords contained
+    in a hit are implied by it, and the search resumes one character after
+    the hit's start so overlapping keywords are still seen. The result is the
+    same as testing ``keyword in text`` for each keyword, but the text is
+    scanned once whatever the vocabulary size, and the scan stops as soon as
+    every keyword has been seen.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(k for k in keywords if k)
+        self._regex = re.compile(_trie_pattern(self.keywords)) if self.keywords else None
+        self._implied = {k: frozenset(o for o in self.keywords if o in k) for k in self.keywords}
+
+    def find(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if self._regex is None:
+            return found
+        search = self._regex.search
+        pos = 0
+        while len(found) < len(self.keywords):
+            m = search(text, pos)
+            if m is None:
+                break
+            found |= self._implied[m.group()]
+            pos = m.start() + 1
+        return found
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def emit(node):
+        # continuations before the keyword ending here: longest match first
+        branches = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+        if '' in node:
+            branches.append('')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return emit(trie)
+
+
+def _frozen(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class KeywordTable:
+    """The vocabularies `parse_text` looks for; defaults to the module tables."""
+    goals: Tuple = GOAL_KEYWORDS
+    materials: Tuple = MATERIAL_KEYWORDS
+    surface: Tuple = SURFACE_KEYWORDS
+    mechanical: Tuple = MECHANICAL_KEYWORDS
+    monitoring: Tuple = MONITORING_KEYWORDS
+
+    def __post_init__(self):
+        # tables key the matcher cache, so nested lists become tuples
+        for f in fields(self):
+            object.__setattr__(self, f.name, _frozen(getattr(self, f.name)))
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        return _matcher_for(self)
+
+
+@functools.lru_cache(maxsize=16)
+def _matcher_for(table: KeywordTable) -> KeywordMatcher:
+    keywords = [k for _, _, kws in table.goals for k in kws]
+    for group in (table.materials, table.surface, table.mechanical):
+        keywords += [k for _, kws in group for k in kws]
+    return KeywordMatcher(keywords + list(table.monitoring))
+
+
+DEFAULT_KEYWORDS = KeywordTable()
+
+
+def _parse(text: str, table: KeywordTable) -> Tuple[List[Goal], List[MaterialSpec], List[str]]:
+    found = table.matcher.find(text)
+
+    # Goals
+    goals = [Goal(title, description) for title, description, keywords in table.goals
+             if found.intersection(keywords)]
+
+    # Materials table (heuristic detection); the document-level properties
+    # are the same for every material, so they are computed once
+    materials_found: List[MaterialSpec] = []
+    materials = [name for name, aliases in table.materials if found.intersection(aliases)]
+    if materials:
+        pore_size = _extract_pore_size(text)
+        surface = [label for label, keywords in table.surface if found.intersection(keywords)]
+        mechanical = [label for label, keywords in table.mechanical if found.intersection(keywords)]
+        for canonical in materials:
+            ms = MaterialSpec(name=canonical)
+            ms.features = "提到在文件中"
+            ms.impact = "见文档"
+            ms.pore_size = pore_size
+            ms.surface_property = ", ".join(surface) or None
+            ms.mechanical = ", ".join(mechanical) or None
+            materials_found.append(ms)
+
+    # Monitoring: canonical keywords, in table order
+    monitoring = [kw for kw in table.monitoring if kw in found]
+    return goals, materials_found, monitoring
+
+
+_GOAL_FIELDS = tuple(f.name for f in fields(Goal))
+_MATERIAL_FIELDS = tuple(f.name for f in fields(MaterialSpec))
+
+
+def _record(obj, names) -> Dict:
+    # a shallow dataclasses.asdict: the fields are all plain strings
+    return {name: getattr(obj, name) for name in names}
+
+
+def parse_text(text: str, table: Optional[KeywordTable] = None) -> Dict:
     """Parse the provided text and return structured summary.
 
     Heuristic parser that extracts:
     - project core goals (energy and waste)
     - material specifications (name + optional properties)
     - monitoring methods list
+
+    `table` overrides the keyword vocabularies (see KeywordTable). All
+    keywords are located in a single scan of the text.
     """
-    summary = {"goals": [], "materials": [], "monitoring": []}
+    goals, materials, monitoring = _parse(text, table or DEFAULT_KEYWORDS)
+    return {
+        "goals": [_record(g, _GOAL_FIELDS) for g in goals],
+        "materials": [_record(m, _MATERIAL_FIELDS) for m in materials],
+        "monitoring": monitoring,
+    }
 
-    # Goals
-    if "能量供给" in text or "能量辅助" in text:
-        summary["goals"].append(asdict(Goal("能量辅助", "对抗线粒体功能障碍，优化代谢，保证 ATP 供应")))
-    if "有害物质清除" in text or "废物清除" in text:
-        summary["goals"].append(asdict(Goal("有害物质清除", "增强细胞内外废物处理，防止有毒蛋白质积累")))
 
-    # Materials table (heuristic detection)
-    materials_found: List[MaterialSpec] = []
-    known = [
-        ("Alginate", ["海藻酸盐", "Alginate"]),
-        ("PEG", ["聚乙二醇", "PEG"]),
-        ("PES", ["聚醚砜", "PES"]),
-        ("PAN", ["聚丙烯腈", "PAN"]),
-    ]
-    for canonical, aliases in known:
-        for a in aliases:
-            if a in text:
-                ms = MaterialSpec(name=canonical)
-                ms.features = "提到在文件中"
-                ms.impact = "见文档"
-                ms.pore_size = _extract_pore_size(text)
-                # surface hints
-                if "亲水性" in text or "亲水" in text:
-                    ms.surface_property = "亲水性"
-                if "中性电荷" in text or "中性" in text:
-                    ms.surface_property = (ms.surface_property + ", 中性电荷") if ms.surface_property else "中性电荷"
-                # mechanical
-                if "弹性" in text or "稳定性" in text:
-                    ms.mechanical = "弹性与稳定性要求"
-                materials_found.append(ms)
-                break
+def summarize_to_json(text: str) -> Dict:
+    return parse_text(text)
 
-    summary["materials"] = [asdict(m) for m in materials_found]
 
-    # Monitoring: look for canonical keywords
-    monitors = []
-    for kw in ["MRS", "EEG", "MEG", "PET", "MRI", "AQP4", "脑电图", "MRS"]:
-        if kw in text:
-            monitors.append(kw)
-    summary["monitoring"] = monitors
+# Columnar bulk summaries: one flat table per entity type, each a dict of
+# equal-length column lists keyed by column name.
+SUMMARY_COLUMNS = {
+    "goals": ("doc_id",) + _GOAL_FIELDS,
+    "materials": ("doc_id",) + _MATERIAL_FIELDS,
+    "monitoring": ("doc_id", "keyword"),
+}
 
-    return summary
 
+@dataclass(**_SLOTS)
+class SummaryColumns:
+    """Summaries of many documents as flat column tables.
 
-def summarize_to_json(text: str) -> Dict:
-    return parse_text(text)
+    `goals`, `materials` and `monitoring` map each column name in
+    SUMMARY_COLUMNS to a list of values; row i of a table is the i-th value
+    of every column, and its `doc_id` names the document it came from.
+    """
+    goals: Dict[str, list]
+    materials: Dict[str, list]
+    monitoring: Dict[str, list]
+
+    @classmethod
+    def empty(cls) -> 'SummaryColumns':
+        return cls(**{name: {c: [] for c in cols} for name, cols in SUMMARY_COLUMNS.items()})
+
+    def tables(self) -> Dict[str, Dict[str, list]]:
+        return {name: getattr(self, name) for name in SUMMARY_COLUMNS}
+
+    def extend(self, other: 'SummaryColumns') -> None:
+        for name, table in self.tables().items():
+            for column, values in getattr(other, name).items():
+                table[column].extend(values)
+
+    def num_rows(self, name: str) -> int:
+        return len(getattr(self, name)["doc_id"])
+
+    def rows(self, name: str):
+        """Iterate over one table as row dicts."""
+        table = getattr(self, name)
+        columns = SUMMARY_COLUMNS[name]
+        for values in zip(*(table[c] for c in columns)):
+            yield dict(zip(columns, values))
+
+    def to_csv(self, directory: Union[str, Path]) -> Dict[str, Path]:
+        """Write goals.csv, materials.csv and monitoring.csv; returns their paths."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for name, table in self.tables().items():
+            columns = SUMMARY_COLUMNS[name]
+            paths[name] = directory / f"{name}.csv"
+            with paths[name].open("w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(columns)
+                writer.writerows(zip(*(table[c] for c in columns)))
+        return paths
+
+    def to_arrow(self) -> Dict[str, object]:
+        """Return one pyarrow.Table per entity type (for Parquet, Arrow IPC, pandas).
+
+        Raises ImportError if pyarrow is not installed.
+        """
+        try:
+            import pyarrow as pa
+        except Exception:
+            raise ImportError("pyarrow not available; install with 'pip install pyarrow' to enable Arrow/Parquet output")
+        return {name: pa.table({c: pa.array(table[c], type=pa.string()) for c in SUMMARY_COLUMNS[name]})
+                for name, table in self.tables().items()}
+
+    def to_parquet(self, directory: Union[str, Path]) -> Dict[str, Path]:
+        """Write goals.parquet, materials.parquet and monitoring.parquet (requires pyarrow)."""
+        tables = self.to_arrow()
+        import pyarrow.parquet as pq
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for name, table in tables.items():
+            paths[name] = directory / f"{name}.parquet"
+            pq.write_table(table, str(paths[name]))
+        return paths
+
+
+def _summarize_chunk(chunk, table: KeywordTable) -> SummaryColumns:
+    out = SummaryColumns.empty()
+    goal_cols, material_cols, monitoring_cols = out.goals, out.materials, out.monitoring
+    for doc_id, item in chunk:
+        text = Path(item).read_text(encoding="utf-8") if isinstance(item, os.PathLike) else item
+        goals, materials, monitoring = _parse(text, table)
+        for g in goals:
+            goal_cols["doc_id"].append(doc_id)
+            for name in _GOAL_FIELDS:
+                goal_cols[name].append(getattr(g, name))
+        for m in materials:
+            material_cols["doc_id"].append(doc_id)
+            for name in _MATERIAL_FIELDS:
+                material_cols[name].append(getattr(m, name))
+        monitoring_cols["doc_id"].extend([doc_id] * len(monitoring))
+        monitoring_cols["keyword"].extend(monitoring)
+    return out
+
+
+def _doc_items(paths_or_texts, ids):
+    for i, item in enumerate(paths_or_texts):
+        if ids is not None:
+            doc_id = ids[i]
+        else:
+            doc_id = os.fspath(item) if isinstance(item, os.PathLike) else str(i)
+        yield doc_id, item
+
+
+def _chunked(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def summarize_many(paths_or_texts: Iterable[Union[str, os.PathLike]], workers: int = 1,
+                   table: Optional[KeywordTable] = None, ids: Optional[List[str]] = None,
+                   chunk_size: int = 64) -> SummaryColumns:
+    """Summarize many documents into columnar tables (see SummaryColumns).
+
+    Items that are path objects (pathlib.Path, os.PathLike) are read as UTF-8
+    files and identified by their path; plain strings are document texts,
+    identified by their position in the input. `ids` overrides the document
+    ids. With `workers` > 1 the documents are parsed in that many processes,
+    `chunk_size` at a time, with at most 2*workers chunks in flight; files
+    are read by the workers. Row order always follows the input order.
+    """
+    table = table or DEFAULT_KEYWORDS
+    chunks = _chunked(_doc_items(paths_or_texts, ids), chunk_size)
+    out = SummaryColumns.empty()
+    if workers <= 1:
+        for chunk in chunks:
+            out.extend(_summarize_chunk(chunk, table))
+        return out
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = collections.deque()
+        for chunk in chunks:
+            inflight.append(pool.submit(_summarize_chunk, chunk, table))
+            if len(inflight) >= 2 * workers:
+                out.extend(inflight.popleft().result())
+        while inflight:
+            out.extend(inflight.popleft().result())
+    return out
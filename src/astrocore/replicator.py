@@ -6,9 +6,15 @@ and writes a Jupyter notebook with Markdown cells for those sections and a
 placeholder code cell for reproduction steps.
 """
 from pathlib import Path
+import os
 import re
 import json
-from typing import Dict, List
+import mmap
+import itertools
+import functools
+import contextlib
+import collections
+from typing import Dict, Iterator, List, Optional, Tuple
 from astrocore import nlp_extractor, codegen
 
 
@@ -20,36 +26,187 @@ def read_text_file(path: Path) -> str:
     return text
 
 
+# Section index. A heading is a line holding only a section name (any case)
+# and whitespace, with lines delimited as by str.splitlines(); a section runs
+# from the end of its heading line to the next heading, and a repeated
+# heading restarts its section. Sections are indexed as offsets into the
+# original buffer (characters for str, bytes for UTF-8 bytes or mmap), so
+# callers slice out only the sections they need instead of copying the paper.
+SECTION_NAMES = ("Abstract", "Introduction", "Methods", "Materials", "Results", "Discussion", "Conclusion", "References")
+SECTION_INDEX_VERSION = 1
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"  # those of str.splitlines()
+_RARE_BREAKS = _LINE_BREAKS[2:]
+_OTHER_BREAKS_RE = re.compile(f"[{_LINE_BREAKS[1:]}]")
+# whitespace that does not end a line
+_SPACES = "".join(c for c in map(chr, range(0x3001)) if c.isspace() and c not in _LINE_BREAKS)
+
+
+def _utf8_alternatives(chars) -> bytes:
+    return b"(?:" + b"|".join(re.escape(c.encode("utf-8")) for c in chars) + b")"
+
+
+@functools.lru_cache(maxsize=None)
+def _heading_patterns(utf8: bool):
+    """Heading regexes for str or UTF-8 bytes: (at a line start, after "\\n", after any line break).
+
+    The bytes patterns match the same text as the str ones: every character
+    class becomes an alternation of encoded characters, including the
+    non-ASCII characters IGNORECASE matches to ASCII letters (U+017F for "s").
+    Starting with a literal "\\n" lets the regex engine skip to candidates
+    quickly, so that pattern is used whenever it finds every line start.
+    Compiled on first use: the bytes patterns are large.
+    """
+    if not utf8:
+        body = f"[{_SPACES}]*(" + "|".join(n.lower() for n in SECTION_NAMES) + f")[{_SPACES}]*(?=[{_LINE_BREAKS}]|\\Z)"
+        return tuple(re.compile(head + body, re.IGNORECASE) for head in ("", "\n", f"[{_LINE_BREAKS}]"))
+
+    def letter(ch):
+        return _utf8_alternatives([c for c in (ch, ch.upper(), "\u0130", "\u0131", "\u017f", "\u212a")
+                                   if re.fullmatch(ch, c, re.IGNORECASE)])
+    spaces = _utf8_alternatives(_SPACES) + b"*"
+    names = b"|".join(b"".join(letter(ch) for ch in n.lower()) for n in SECTION_NAMES)
+    body = spaces + b"(" + names + b")" + spaces + b"(?=" + _utf8_alternatives(_LINE_BREAKS) + b"|\\Z)"
+    return tuple(re.compile(head + body) for head in (b"", b"\n", _utf8_alternatives(_LINE_BREAKS)))
+
+
+_LONE_CR_RES = {False: re.compile("\r(?!\n)"), True: re.compile(b"\r(?!\n)")}
+_RARE_BREAKS_BYTES = tuple(c.encode("utf-8") for c in _RARE_BREAKS)
+
+
+@functools.lru_cache(maxsize=None)
+def _leading_spaces(utf8: bool):
+    return re.compile(_utf8_alternatives(_SPACES + _LINE_BREAKS) + b"*") if utf8 else re.compile(r"\s*")
+
+_SPACE_BYTES = tuple(c.encode("utf-8") for c in _SPACES + _LINE_BREAKS)
+
+
+def _headings(buf, utf8: bool):
+    at_start, after_newline, after_break = _heading_patterns(utf8)
+    m = at_start.match(buf)
+    if m:
+        yield m
+    rare = _RARE_BREAKS_BYTES if utf8 else _RARE_BREAKS
+    only_newlines = not any(buf.find(r) >= 0 for r in rare) and not _LONE_CR_RES[utf8].search(buf)
+    yield from (after_newline if only_newlines else after_break).finditer(buf)
+
+
+def _is_space_before(buf, end: int) -> int:
+    """Length of the whitespace character ending at `end`, or 0."""
+    if isinstance(buf, str):
+        return 1 if buf[end - 1].isspace() else 0
+    for enc in _SPACE_BYTES:
+        n = len(enc)
+        if end >= n and buf[end - n:end] == enc:
+            return n
+    return 0
+
+
+def index_sections(buf) -> List[Tuple[str, int, int]]:
+    """Index the sections of a paper as (name, start, end) offsets into `buf`.
+
+    `buf` is a str (character offsets) or UTF-8 encoded bytes, including an
+    mmap (byte offsets). `buf[start:end]` holds the section with surrounding
+    whitespace trimmed; `section_text` turns it into the text
+    extract_sections_from_text returns. Sections that are empty are
+    left out, and the order is that of each name's first heading.
+    """
+    utf8 = not isinstance(buf, str)
+    ranges: Dict[str, List[int]] = {"Title": [0, len(buf)]}
+    current = "Title"
+    for m in _headings(buf, utf8):
+        ranges[current][1] = m.start()
+        name = m.group(1)
+        current = (name.decode("utf-8") if utf8 else name).title()
+        ranges[current] = [m.end(), len(buf)]
+    out = []
+    for name, (start, end) in ranges.items():
+        start = _leading_spaces(utf8).match(buf, start, end).end()
+        if start == end:
+            continue
+        n = _is_space_before(buf, end)
+        while n:
+            end -= n
+            n = _is_space_before(buf, end)
+        out.append((name, start, end))
+    return out
+
+
+def section_text(buf, start: int, end: int) -> str:
+    """Text of one indexed section: its lines joined with "\\n", as in extract_sections_from_text."""
+    chunk = buf[start:end]
+    if not isinstance(chunk, str):
+        chunk = chunk.decode("utf-8")
+    if _OTHER_BREAKS_RE.search(chunk):
+        chunk = "\n".join(chunk.splitlines())
+    return chunk
+
+
 def extract_sections_from_text(text: str) -> Dict[str, str]:
     """Heuristically extract major sections from a paper text.
 
     Returns a dict mapping section name to content.
     """
-    sections: Dict[str, List[str]] = {}
-    # Normalize headings: lines that are all caps or start with a common word
-    lines = text.splitlines()
+    return {name: section_text(text, start, end) for name, start, end in index_sections(text)}
 
-    current = "Title"
-    sections[current] = []
-    heading_re = re.compile(r"^(?:\s*)(Abstract|Introduction|Methods|Materials|Results|Discussion|Conclusion|References)\s*$", re.IGNORECASE)
-
-    for ln in lines:
-        m = heading_re.match(ln.strip())
-        if m:
-            current = m.group(1).title()
-            sections[current] = []
-        else:
-            sections.setdefault(current, []).append(ln)
 
-    # Join
-    out = {}
-    for k, v in sections.items():
-        # Trim leading/trailing blank lines
-        s = "\n".join(v).strip()
-        if s:
-            out[k] = s
+def section_index_path(path: Path) -> Path:
+    """Sidecar file holding the section index of a text file."""
+    return Path(str(path) + ".sections.json")
 
-    return out
+
+@contextlib.contextmanager
+def _mapped(path: Path):
+    with open(path, "rb") as fh:
+        try:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            yield b""
+            return
+        try:
+            yield buf
+        finally:
+            buf.close()
+
+
+def index_sections_file(path: Path, sidecar: bool = True) -> List[Tuple[str, int, int]]:
+    """Byte-offset section index of a UTF-8 text file, read through mmap.
+
+    With `sidecar`, the index is stored next to the file (see
+    section_index_path) and reused while the file's size and mtime match.
+    """
+    p = Path(path)
+    st = p.stat()
+    stamp = {"version": SECTION_INDEX_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    side = section_index_path(p)
+    if sidecar:
+        try:
+            data = json.loads(side.read_text(encoding="utf-8"))
+            if all(data.get(k) == v for k, v in stamp.items()):
+                return [tuple(entry) for entry in data["sections"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    with _mapped(p) as buf:
+        sections = index_sections(buf)
+    if sidecar:
+        try:
+            side.write_text(json.dumps(dict(stamp, unit="bytes", sections=sections)), encoding="utf-8")
+        except OSError:
+            # a read-only location only costs re-indexing next time
+            pass
+    return sections
+
+
+def read_sections(path: Path, names=None, sidecar: bool = True) -> Dict[str, str]:
+    """Sections of a UTF-8 text file, as extract_sections_from_text(read_text_file(path)).
+
+    Only the sections in `names` (all by default) are decoded; the rest of
+    the file is never copied into memory.
+    """
+    sections = index_sections_file(path, sidecar=sidecar)
+    with _mapped(Path(path)) as buf:
+        return {name: section_text(buf, start, end) for name, start, end in sections
+                if names is None or name in names}
 
 
 def make_notebook_from_sections(sections: Dict[str, str], populate_code: bool = False, extraction: Dict = None) -> Dict:
@@ -135,20 +292,30 @@ def write_notebook(nb: Dict, out_path: Path) -> None:
     out_path.write_text(json.dumps(nb, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def generate_notebook_from_paper_file(paper_path: Path, out_path: Path, populate_code: bool = False) -> Path:
+def generate_notebook_from_paper_file(paper_path: Path, out_path: Path, populate_code: bool = False,
+                                      methods_first: bool = False, pdf_workers: Optional[int] = None,
+                                      backend: Optional[str] = None, pdf_cache=None) -> Path:
     """High-level helper: read paper text and generate notebook file.
 
-    If the input is a PDF, this function will raise a NotImplementedError and
-    suggest installing PyMuPDF or converting PDF to text externally.
+    PDFs are converted with PyMuPDF (ImportError if it is not installed),
+    `pdf_workers` processes extracting pages in parallel (see iter_pdf_pages);
+    pages already in the PDF text cache (`pdf_cache`, default: the process
+    default) are not parsed again. With `methods_first`, PDF pages are read
+    only until the Methods section has ended, so the notebook holds the
+    sections up to and including Methods. `backend` selects the extraction
+    backend (default: the process default).
     """
     p = Path(paper_path)
     if p.suffix.lower() == ".pdf":
         # attempt to extract text from PDF using PyMuPDF (fitz)
-        text = pdf_to_text(p)
+        if methods_first:
+            text = pdf_to_text_until_methods(p, workers=pdf_workers, cache=pdf_cache)
+        else:
+            text = pdf_to_text(p, workers=pdf_workers, cache=pdf_cache)
+        secs = extract_sections_from_text(text)
     else:
-        text = read_text_file(p)
-    secs = extract_sections_from_text(text)
-    extraction = nlp_extractor.extract_parameters(secs.get('Methods', ''))
+        secs = read_sections(p, sidecar=False)
+    extraction = nlp_extractor.extract_parameters(secs.get('Methods', ''), backend=backend)
     nb = make_notebook_from_sections(secs, populate_code=populate_code, extraction=extraction)
     write_notebook(nb, out_path)
     # also write a sidecar JSON with the structured extraction for auditing
@@ -157,13 +324,54 @@ def generate_notebook_from_paper_file(paper_path: Path, out_path: Path, populate
     return out_path
 
 
-def pdf_to_text(path: Path) -> str:
-    """Extract text from a PDF file using PyMuPDF (fitz).
+# PDF page extraction. Documents of at least PDF_PARALLEL_MIN_PAGES pages are
+# split into ranges of PDF_PAGES_PER_TASK pages extracted by a process pool,
+# each worker opening the document itself; ASTROCORE_PDF_WORKERS sets the
+# default pool size (1 disables the pool).
+PDF_WORKERS_ENV_VAR = 'ASTROCORE_PDF_WORKERS'
+PDF_PARALLEL_MIN_PAGES = 32
+PDF_PAGES_PER_TASK = 8
 
-    Raises ImportError if PyMuPDF is not installed. Raises FileNotFoundError
-    if the PDF path does not exist.
-    """
-    p = Path(path)
+
+# Optional PDF text cache (see astrocore.cache.PdfTextCache). Configured
+# explicitly with set_default_pdf_cache() or through the ASTROCORE_PDF_CACHE
+# environment variable (path to an SQLite file); off by default.
+PDF_CACHE_ENV_VAR = 'ASTROCORE_PDF_CACHE'
+_DEFAULT_PDF_CACHE = None
+_DEFAULT_PDF_CACHE_SET = False
+
+
+def open_pdf_cache(path, **kwargs):
+    """Create a PdfTextCache stored in the SQLite file at `path`."""
+    from astrocore.cache import PdfTextCache
+    return PdfTextCache(path, **kwargs)
+
+
+def set_default_pdf_cache(cache) -> None:
+    """Use `cache` for PDF extraction calls that do not pass one (None disables)."""
+    global _DEFAULT_PDF_CACHE, _DEFAULT_PDF_CACHE_SET
+    _DEFAULT_PDF_CACHE = cache
+    _DEFAULT_PDF_CACHE_SET = True
+
+
+def get_default_pdf_cache():
+    """Return the process-wide PDF text cache, or None if caching is off."""
+    global _DEFAULT_PDF_CACHE, _DEFAULT_PDF_CACHE_SET
+    if not _DEFAULT_PDF_CACHE_SET:
+        target = os.environ.get(PDF_CACHE_ENV_VAR)
+        if target:
+            _DEFAULT_PDF_CACHE = open_pdf_cache(target)
+        _DEFAULT_PDF_CACHE_SET = True
+    return _DEFAULT_PDF_CACHE
+
+
+def _resolve_pdf_cache(cache):
+    if cache is None:
+        return get_default_pdf_cache()
+    return cache or None
+
+
+def _open_pdf(p: Path):
     if not p.exists():
         raise FileNotFoundError(p)
 
@@ -172,8 +380,143 @@ def pdf_to_text(path: Path) -> str:
     except Exception as e:
         raise ImportError("PyMuPDF not available; install with 'pip install PyMuPDF' to enable PDF parsing")
 
-    doc = fitz.open(str(p))
-    parts = []
-    for page in doc:
-        parts.append(page.get_text())
-    return "\n".join(parts)
+    return fitz.open(str(p))
+
+
+def _pdf_page_texts(path: str, start: int, stop: int) -> List[str]:
+    # runs in a worker process: open the document independently
+    doc = _open_pdf(Path(path))
+    try:
+        return [doc[i].get_text() for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _default_pdf_workers() -> int:
+    try:
+        return max(1, int(os.environ.get(PDF_WORKERS_ENV_VAR, '')))
+    except ValueError:
+        return min(8, os.cpu_count() or 1)
+
+
+def _pdf_page_count(p: Path) -> int:
+    doc = _open_pdf(p)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def _extract_pdf_pages(p: Path, workers: int) -> Iterator[str]:
+    doc = _open_pdf(p)
+    if workers <= 1 or doc.page_count < PDF_PARALLEL_MIN_PAGES:
+        try:
+            for page in doc:
+                yield page.get_text()
+        finally:
+            doc.close()
+        return
+    n_pages = doc.page_count
+    doc.close()
+    ranges = iter([(i, min(i + PDF_PAGES_PER_TASK, n_pages)) for i in range(0, n_pages, PDF_PAGES_PER_TASK)])
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        inflight = collections.deque()
+        for start, stop in itertools.islice(ranges, 2 * workers):
+            inflight.append(pool.submit(_pdf_page_texts, str(p), start, stop))
+        while inflight:
+            texts = inflight.popleft().result()
+            for start, stop in itertools.islice(ranges, 1):
+                inflight.append(pool.submit(_pdf_page_texts, str(p), start, stop))
+            yield from texts
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _cached_pdf_pages(p: Path, workers: int, cache) -> Iterator[str]:
+    key = cache.key(p)
+    n_pages = cache.page_count(key)
+    if n_pages is None:
+        # first sight of this document: extract, storing pages as they are read
+        cache.set_page_count(key, _pdf_page_count(p))
+        batch, start = [], 0
+        try:
+            for text in _extract_pdf_pages(p, workers):
+                batch.append(text)
+                if len(batch) == PDF_PAGES_PER_TASK:
+                    cache.put_pages(key, start, batch)
+                    batch, start = [], start + len(batch)
+                yield text
+        finally:
+            # also keep what was read when the consumer stops early
+            cache.put_pages(key, start, batch)
+        return
+    # read back in ranges, so a consumer that stops early reads few pages;
+    # pages dropped by eviction are extracted again
+    for start in range(0, n_pages, PDF_PAGES_PER_TASK):
+        stop = min(start + PDF_PAGES_PER_TASK, n_pages)
+        texts = cache.get_pages(key, start, stop)
+        if None in texts:
+            texts = _pdf_page_texts(str(p), start, stop)
+            cache.put_pages(key, start, texts)
+        yield from texts
+
+
+def iter_pdf_pages(path: Path, workers: Optional[int] = None, cache=None) -> Iterator[str]:
+    """Yield the text of each page of a PDF, in page order.
+
+    With more than one worker and a long enough document, page ranges are
+    extracted in a process pool, at most two ranges per worker ahead of the
+    consumer; when the consumer stops early, ranges not yet started are
+    cancelled. `cache` is a PdfTextCache (see open_pdf_cache); None uses the
+    default cache and False disables caching. Pages found in the cache are
+    not parsed again. Raises ImportError if PyMuPDF is not installed and
+    FileNotFoundError if the PDF does not exist.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(p)
+    workers = _default_pdf_workers() if workers is None else workers
+    cache = _resolve_pdf_cache(cache)
+    if cache is None:
+        return _extract_pdf_pages(p, workers)
+    return _cached_pdf_pages(p, workers, cache)
+
+
+def pdf_to_text(path: Path, workers: Optional[int] = None, cache=None) -> str:
+    """Extract text from a PDF file using PyMuPDF (fitz).
+
+    Pages are joined with newlines; `workers` and `cache` are as in iter_pdf_pages.
+    Raises ImportError if PyMuPDF is not installed. Raises FileNotFoundError
+    if the PDF path does not exist.
+    """
+    return "\n".join(iter_pdf_pages(path, workers=workers, cache=cache))
+
+
+def pdf_to_text_until_methods(path: Path, workers: Optional[int] = None, cache=None) -> str:
+    """Like pdf_to_text, but stop reading pages once the Methods section has ended.
+
+    Pages are read until one holds a heading (other than Methods) after a
+    Methods heading; the text of the pages read so far is returned, so the
+    sections up to and including Methods come out as with pdf_to_text. A
+    PDF without a Methods heading is read in full.
+    """
+    pages = []
+    seen_methods = ended = False
+    pages_iter = iter_pdf_pages(path, workers=workers, cache=cache)
+    try:
+        for page in pages_iter:
+            pages.append(page)
+            # pages are joined with newlines, so each page starts a line
+            for m in _headings(page, False):
+                if m.group(1).title() == "Methods":
+                    # a repeated Methods heading restarts the section
+                    seen_methods, ended = True, False
+                elif seen_methods:
+                    ended = True
+            if ended:
+                break
+    finally:
+        pages_iter.close()
+    return "\n".join(pages)
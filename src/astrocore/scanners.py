@@ -0,0 +1,176 @@
+"""Linear-time scanners for the extractor rules that backtrack on long tokens.
+
+Each scanner reproduces, match for match, one case-insensitive regex from the
+nlp_extractor rule table (the original pattern is quoted in its docstring):
+`search(string, pos)` returns the same leftmost match, groups and span as
+``re.compile(pattern, re.IGNORECASE).search(string, pos)``. The originals
+retry their greedy character runs from every start position inside a long
+unbroken token (base64 blobs, URLs, PDF garbage), which is quadratic; the
+scanners try each candidate start once, using only regexes that cannot
+backtrack more than a constant amount per character.
+"""
+import re
+from typing import Optional, Sequence, Tuple
+
+_QUOTES = '\'"'
+_WS = re.compile(r'\s*')
+# one maximal run of path characters: [\\/\w\-\.]
+_PATH_RUN = re.compile(r'[\\/\w\-\.]+')
+_PATH_EXT = re.compile(r'\.(?:csv|mat|npy|fif|edf)', re.IGNORECASE)
+_DRIVE = re.compile(r'[A-Za-z]:', re.IGNORECASE)
+_DATA = re.compile(r'data', re.IGNORECASE)
+_FILE_OR_SET = re.compile(r'file|set', re.IGNORECASE)
+
+
+def _is_path_char(ch: str) -> bool:
+    # the \w of str patterns is str.isalnum() plus '_'
+    return ch.isalnum() or ch in '_\\/-.'
+
+
+class ScanMatch:
+    """The subset of re.Match used by the extractor, for scanner results."""
+    __slots__ = ('string', '_spans', '_names')
+
+    def __init__(self, string: str, spans: Sequence[Optional[Tuple[int, int]]], names=None):
+        self.string = string
+        self._spans = tuple(spans)
+        self._names = names or {}
+
+    def _index(self, g):
+        return self._names[g] if isinstance(g, str) else g
+
+    def span(self, g=0):
+        sp = self._spans[self._index(g)]
+        return sp if sp is not None else (-1, -1)
+
+    def start(self, g=0):
+        return self.span(g)[0]
+
+    def end(self, g=0):
+        return self.span(g)[1]
+
+    def group(self, *groups):
+        if not groups:
+            groups = (0,)
+        values = []
+        for g in groups:
+            sp = self._spans[self._index(g)]
+            values.append(self.string[sp[0]:sp[1]] if sp is not None else None)
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def groups(self):
+        return tuple(self.group(i) for i in range(1, len(self._spans)))
+
+    def groupdict(self):
+        return {name: self.group(name) for name in self._names}
+
+    def __repr__(self):
+        return f'<ScanMatch span={self.span()} match={self.group()!r}>'
+
+
+class DataPathScanner:
+    r"""Scanner for ``(?P<path>['"]?([A-Za-z]:)?[\\/\w\-\.]+\.(?:csv|mat|npy|fif|edf)['"]?)``.
+
+    A match lives in one maximal run of path characters: its greedy body ends
+    at the last ".ext" of the run that has at least one character before it,
+    and it starts at the run (or `pos`), extended left over an optional drive
+    and quote. Runs are located from extension hits and walked once.
+    """
+    pattern = r"""(?P<path>['"]?([A-Za-z]:)?[\\/\w\-\.]+\.(?:csv|mat|npy|fif|edf)['"]?)"""
+
+    def search(self, string: str, pos: int = 0) -> Optional[ScanMatch]:
+        n = len(string)
+        seek = pos
+        while True:
+            hit = _PATH_EXT.search(string, seek)
+            if hit is None:
+                return None
+            a = hit.start()
+            while a > pos and _is_path_char(string[a - 1]):
+                a -= 1
+            b = _PATH_RUN.match(string, hit.start()).end()
+            k = string.rfind('.', a + 1, b)
+            while k >= 0 and not _PATH_EXT.match(string, k):
+                k = string.rfind('.', a + 1, k)
+            if k < 0:
+                # the run holds no match; its last character may still be a drive letter
+                seek = b
+                continue
+            start, drive = a, None
+            if a - 2 >= pos and _DRIVE.match(string, a - 2):
+                start, drive = a - 2, (a - 2, a)
+                if a - 3 >= pos and string[a - 3] in _QUOTES:
+                    start = a - 3
+            elif a - 1 >= pos and string[a - 1] in _QUOTES:
+                start = a - 1
+            end = k + 4
+            if end < n and string[end] in _QUOTES:
+                end += 1
+            return ScanMatch(string, [(start, end), (start, end), drive], {'path': 1})
+
+
+class LooseDataPathScanner:
+    r"""Scanner for ``data\s*(?:file|set)?\s*(?:[:=\-])?\s*['"]?(?P<p>[\w\-/\\\.]+)['"]?``.
+
+    At each "data" the greedy parse is followed; when no path characters come
+    after it, the regex would backtrack to a consumed "-" separator (which is
+    itself a path character) or to a consumed "file"/"set" word, in that
+    order, and so does the scanner.
+    """
+    pattern = r"""data\s*(?:file|set)?\s*(?:[:=\-])?\s*['"]?(?P<p>[\w\-/\\\.]+)['"]?"""
+
+    def search(self, string: str, pos: int = 0) -> Optional[ScanMatch]:
+        while True:
+            head = _DATA.search(string, pos)
+            if head is None:
+                return None
+            m = self._match_at(string, head.start())
+            if m is not None:
+                return m
+            pos = head.start() + 1
+
+    @staticmethod
+    def _match_at(string: str, s: int) -> Optional[ScanMatch]:
+        n = len(string)
+        i = _WS.match(string, s + 4).end()
+        word = _FILE_OR_SET.match(string, i)
+        j = _WS.match(string, word.end() if word else i).end()
+        sep = j < n and string[j] in ':=-'
+        k = _WS.match(string, j + 1 if sep else j).end()
+        q = k + 1 if k < n and string[k] in _QUOTES else k
+        run = _PATH_RUN.match(string, q)
+        if run is not None:
+            p = run.span()
+        elif sep and string[j] == '-':
+            p = (j, j + 1)
+        elif word is not None:
+            p = _PATH_RUN.match(string, i).span()
+        else:
+            return None
+        end = p[1] + 1 if p[1] < n and string[p[1]] in _QUOTES else p[1]
+        return ScanMatch(string, [(s, end), p], {'p': 1})
+
+
+class NumberTailScanner:
+    r"""Scanner for ``(D+(?:\.D+)?)<tail>``, D being a digit class.
+
+    Within one run of digits every start position yields the same greedy
+    number end, and a shorter number is always followed by a digit or '.',
+    which no tail used here accepts; so only the first position of each digit
+    run (or `pos` itself) can start a match. The search is a regex that
+    rejects the other positions with a lookbehind, which keeps it linear while
+    returning the original pattern's matches.
+    """
+
+    def __init__(self, digit: str, tail: str):
+        self.pattern = f'({digit}+(?:\\.{digit}+)?){tail}'
+        self._digit = re.compile(digit)
+        self._at = re.compile(self.pattern, re.IGNORECASE)
+        self._run_start = re.compile(f'(?<!{digit}){self.pattern}', re.IGNORECASE)
+
+    def search(self, string: str, pos: int = 0):
+        if pos > 0 and self._digit.match(string, pos - 1):
+            m = self._at.match(string, pos)
+            if m is not None:
+                return m
+        return self._run_start.search(string, pos)
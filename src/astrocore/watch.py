@@ -0,0 +1,244 @@
+"""Watch an inbox directory and regenerate notebooks as papers land in it.
+
+`watch` runs in one long-lived process, so the extraction backend (spaCy
+model) and PDF tooling are loaded once and stay warm. New or modified
+.txt/.pdf files anywhere under the inbox are noticed through inotify on
+Linux (via ctypes, no extra dependency) or by polling elsewhere. They are
+debounced until their size and modification time have been stable for
+`settle` seconds, so half-copied files are not parsed, and then regenerated
+incrementally with astrocore.batch (same manifest, same outputs)::
+
+    from astrocore import watch
+    watch.watch('inbox/', 'notebooks/', on_build=lambda r: print(r.summary()))
+
+Hidden files (names starting with '.') are ignored, as are deletions.
+"""
+from pathlib import Path
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from astrocore import batch, nlp_extractor
+
+DEFAULT_SETTLE = 0.3
+DEFAULT_INTERVAL = 0.5
+
+
+def _is_paper(path: Path) -> bool:
+    return path.suffix.lower() in batch.PAPER_SUFFIXES and not path.name.startswith('.')
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class PollingWatcher:
+    """Reports papers whose size or mtime changed between directory scans."""
+
+    def __init__(self, root, interval: float = DEFAULT_INTERVAL):
+        self.root = Path(root)
+        self.interval = interval
+        self._seen = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        seen = {}
+        for p in self.root.rglob('*'):
+            if _is_paper(p):
+                sig = _signature(p)
+                if sig is not None:
+                    seen[p] = sig
+        return seen
+
+    def changes(self, timeout: float) -> Optional[Set[Path]]:
+        """Wait up to `timeout` seconds; return the papers added or modified since the last call."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {p for p, sig in current.items() if self._seen.get(p) != sig}
+        self._seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+# inotify(7) constants
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Reports papers created, written or moved into a directory tree, via Linux inotify.
+
+    New subdirectories are watched as they appear. Returns None from
+    `changes` when the kernel queue overflowed and events were lost, telling
+    the caller to rescan everything. Raises OSError where inotify is not
+    available.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs: Dict[int, Path] = {}
+        self._add_tree(self.root)
+
+    def _add(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if directory == self.root:
+                raise OSError(err, os.strerror(err), str(directory))
+            return
+        self._dirs[wd] = directory
+
+    def _add_tree(self, directory: Path) -> Set[Path]:
+        # returns the papers already inside, which a new directory may hold
+        # before its watch is in place
+        self._add(directory)
+        found = set()
+        for p in directory.rglob('*'):
+            if p.is_dir():
+                self._add(p)
+            elif _is_paper(p):
+                found.add(p)
+        return found
+
+    def changes(self, timeout: float) -> Optional[Set[Path]]:
+        """Wait up to `timeout` seconds for events; return the papers they touched (None: rescan)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: Set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _cookie, size = _EVENT.unpack_from(data, pos)
+                name = data[pos + _EVENT.size:pos + _EVENT.size + size].rstrip(b'\0')
+                pos += _EVENT.size + size
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        changed |= self._add_tree(path)
+                elif _is_paper(path):
+                    changed.add(path)
+        return None if overflow else changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(root, use_inotify: Optional[bool] = None, interval: float = DEFAULT_INTERVAL):
+    """Return an InotifyWatcher where possible (or if `use_inotify`), else a PollingWatcher."""
+    if use_inotify is not False:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            if use_inotify:
+                raise
+    return PollingWatcher(root, interval=interval)
+
+
+def _warm_up() -> None:
+    # load the extraction backend and PDF tooling before the first paper arrives
+    nlp_extractor.warm_up()
+    try:
+        import fitz  # noqa: F401  (PyMuPDF)
+    except Exception:
+        pass
+
+
+def watch(inbox, out_dir, populate_code: bool = False, methods_first: bool = False,
+          settle: float = DEFAULT_SETTLE, interval: float = DEFAULT_INTERVAL,
+          use_inotify: Optional[bool] = None, stop: Optional[threading.Event] = None,
+          on_build: Optional[Callable[[batch.BatchReport], None]] = None) -> None:
+    """Regenerate notebooks for papers under `inbox` into `out_dir` until `stop` is set.
+
+    Out-of-date papers already in the inbox are built first. After that a
+    paper is regenerated once it has been unchanged for `settle` seconds
+    after its last change; unchanged content (e.g. a touched file) is skipped
+    through the batch manifest. `on_build` receives the BatchReport of every
+    build that looked at any paper. `interval` is the polling period when
+    inotify is not used. Runs until `stop` is set (or KeyboardInterrupt).
+    """
+    inbox, out_dir = Path(inbox), Path(out_dir)
+    stop = stop or threading.Event()
+    options = {'populate_code': populate_code, 'methods_first': methods_first}
+    _warm_up()
+    watcher = open_watcher(inbox, use_inotify=use_inotify, interval=interval)
+
+    def report(result):
+        if on_build is not None and (result.rebuilt or result.skipped or result.failed):
+            on_build(result)
+
+    # papers waiting to settle: path -> (time of last change, size and mtime then)
+    pending: Dict[Path, Tuple[float, Optional[Tuple[int, int]]]] = {}
+    try:
+        report(batch.build(inbox, out_dir, **options))
+        while not stop.is_set():
+            timeout = interval
+            if pending:
+                oldest = min(t for t, _ in pending.values())
+                timeout = max(0.0, min(timeout, oldest + settle - time.monotonic()))
+            changed = watcher.changes(timeout)
+            now = time.monotonic()
+            if changed is None:
+                # events were lost: let the manifest sort out what changed
+                pending.clear()
+                report(batch.build(inbox, out_dir, **options))
+                continue
+            for p in changed:
+                pending[p] = (now, _signature(p))
+            ready = []
+            for p, (t, sig) in list(pending.items()):
+                current = _signature(p)
+                if current is None:
+                    del pending[p]
+                elif current != sig:
+                    pending[p] = (now, current)
+                elif now - t >= settle:
+                    del pending[p]
+                    ready.append(p)
+            if ready:
+                report(batch.build_papers(sorted(ready), inbox, out_dir, **options))
+    finally:
+        watcher.close()
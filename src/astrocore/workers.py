@@ -0,0 +1,131 @@
+"""Worker pools that share one warm copy of the extraction models.
+
+A worker that imports nlp_extractor and loads en_core_web_sm (plus the
+EntityRuler) itself holds a private copy of the model, so memory grows with
+the number of workers. `WarmPool` loads and warms the models once in the
+parent, then forks the workers, which inherit the model pages copy-on-write::
+
+    from astrocore import workers
+    with workers.WarmPool(8) as pool:
+        results = pool.extract(texts)
+        print(pool.memory())
+
+Before forking, the parent runs a full collection and `gc.freeze()`s every
+surviving object, so the cyclic GC in the workers never walks (and thereby
+writes to) the inherited objects. Workers only receive texts and return
+plain result dicts, so the shared objects are not pickled either. Reference
+counts of the Python objects a worker actually uses still change; the bulk
+of a model, its weight arrays, is never touched that way and stays shared.
+
+Forking needs the 'fork' start method (Linux; not Windows). Elsewhere, or
+with start_method='spawn', each worker loads its own models and nothing is
+shared. `memory()` reports resident and private memory per process on Linux.
+"""
+from pathlib import Path
+import os
+import gc
+import multiprocessing
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from astrocore import nlp_extractor
+
+_SMAPS_FIELDS = ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty', 'Shared_Clean', 'Shared_Dirty')
+
+
+def process_memory(pid: Optional[int] = None) -> Optional[Dict[str, float]]:
+    """Return memory of a process in MiB from /proc/<pid>/smaps_rollup, or None where unavailable.
+
+    `private` is what only this process uses (its real overhead), `rss`
+    includes pages shared with other processes, and `pss` splits shared
+    pages evenly between their users.
+    """
+    path = Path('/proc') / str(pid or os.getpid()) / 'smaps_rollup'
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return None
+    kb = {}
+    for line in lines:
+        name, _, rest = line.partition(':')
+        if name in _SMAPS_FIELDS:
+            kb[name] = int(rest.split()[0])
+    mib = {k: v / 1024.0 for k, v in kb.items()}
+    return {
+        'rss': mib.get('Rss', 0.0),
+        'pss': mib.get('Pss', 0.0),
+        'private': mib.get('Private_Clean', 0.0) + mib.get('Private_Dirty', 0.0),
+        'shared': mib.get('Shared_Clean', 0.0) + mib.get('Shared_Dirty', 0.0),
+    }
+
+
+def _default_start_method() -> Optional[str]:
+    return 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+
+
+def _init_worker(backend: Optional[str], forked: bool) -> None:
+    # the default is set in the worker only; the parent's stays untouched
+    if backend:
+        nlp_extractor.set_default_backend(backend)
+    if not forked:
+        nlp_extractor.warm_up()
+
+
+def _extract_one(args) -> Dict[str, Any]:
+    text, fields = args
+    return nlp_extractor.extract_parameters(text, fields=fields)
+
+
+class WarmPool:
+    """Process pool whose workers are forked after the extraction models are loaded.
+
+    `workers` defaults to os.cpu_count(). `backend` selects the extraction
+    backend, which is warmed up in the parent before forking. `start_method`
+    defaults to 'fork' where available; other methods work but share nothing.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, workers: Optional[int] = None, backend: Optional[str] = None,
+                 start_method: Optional[str] = None, freeze: bool = True):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.backend = backend
+        self.start_method = start_method or _default_start_method()
+        self.forked = self.start_method == 'fork'
+        ctx = multiprocessing.get_context(self.start_method)
+        self._frozen = False
+        if self.forked:
+            nlp_extractor.warm_up(backend)
+            if freeze and hasattr(gc, 'freeze'):
+                gc.collect()
+                gc.freeze()
+                self._frozen = True
+        before = set(multiprocessing.active_children())
+        self._pool = ctx.Pool(self.workers, initializer=_init_worker, initargs=(backend, self.forked))
+        self._pids = [p.pid for p in multiprocessing.active_children() if p not in before]
+
+    def map(self, fn: Callable, iterable: Iterable, chunksize: int = 8) -> Iterable:
+        """Yield fn(item) for each item, in order, computed in the workers."""
+        return self._pool.imap(fn, iterable, chunksize)
+
+    def extract(self, texts: Iterable[str], fields=None, chunksize: int = 8) -> List[Dict[str, Any]]:
+        """Return extract_parameters(text, fields=fields) for each text, in order."""
+        return list(self.map(_extract_one, ((t, fields) for t in texts), chunksize))
+
+    def pids(self) -> List[int]:
+        return list(self._pids)
+
+    def memory(self) -> Dict[str, Any]:
+        """Return {'parent': ..., 'workers': [...]} as from process_memory (None entries off Linux)."""
+        return {'parent': process_memory(os.getpid()), 'workers': [process_memory(pid) for pid in self._pids]}
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+        if self._frozen:
+            gc.unfreeze()
+            self._frozen = False
+
+    def __enter__(self) -> 'WarmPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
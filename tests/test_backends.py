@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import os
+import unittest
+from unittest import mock
+from astrocore import nlp_extractor
+
+TEXT = "We used Welch's method with nperseg=1024. Data were sampled at fs = 1 kHz (data/s01.csv)."
+
+
+class BackendTests(unittest.TestCase):
+    def tearDown(self):
+        nlp_extractor.set_default_backend(None)
+
+    def test_builtin_backends_registered(self):
+        self.assertEqual(nlp_extractor.backends()[:3], ('regex', 'spacy-blank', 'spacy-full'))
+        self.assertTrue(nlp_extractor.backend_available('regex'))
+
+    def test_selection_order(self):
+        with mock.patch.dict(os.environ, {nlp_extractor.BACKEND_ENV_VAR: ''}):
+            auto = 'spacy-full' if nlp_extractor._HAS_SPACY else 'regex'
+            self.assertEqual(nlp_extractor.resolve_backend(), auto)
+            os.environ[nlp_extractor.BACKEND_ENV_VAR] = 'spacy-blank'
+            self.assertEqual(nlp_extractor.resolve_backend(), 'spacy-blank')
+            nlp_extractor.set_default_backend('regex')
+            self.assertEqual(nlp_extractor.resolve_backend(), 'regex')
+            self.assertEqual(nlp_extractor.resolve_backend('spacy-full'), 'spacy-full')
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            nlp_extractor.extract_parameters(TEXT, backend='stanza')
+        with self.assertRaises(ValueError):
+            nlp_extractor.set_default_backend('stanza')
+
+    def test_regex_backend_never_loads_a_pipeline(self):
+        with mock.patch.object(nlp_extractor, '_load_spacy_pipeline', side_effect=AssertionError('loaded')), \
+                mock.patch.object(nlp_extractor, '_load_blank_pipeline', side_effect=AssertionError('loaded')):
+            res = nlp_extractor.extract_parameters(TEXT, cache=False, backend='regex')
+            batch = list(nlp_extractor.extract_parameters_batch([TEXT], cache=False, backend='regex'))
+        self.assertEqual(res['methods'], ['Welch'])
+        self.assertEqual(res['fs'], 1000.0)
+        self.assertEqual(res['data_path'], 'data/s01.csv')
+        self.assertEqual(batch, [res])
+
+    def test_registered_backend_is_loaded_once_and_lazily(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return None
+
+        nlp_extractor.register_backend('test-null', loader)
+        try:
+            self.assertEqual(calls, [])
+            for _ in range(3):
+                res = nlp_extractor.extract_parameters(TEXT, cache=False, backend='test-null')
+            self.assertEqual(calls, [1])
+            self.assertEqual(res, nlp_extractor.extract_parameters(TEXT, cache=False, backend='regex'))
+            self.assertFalse(nlp_extractor.backend_available('test-null'))
+        finally:
+            nlp_extractor._BACKENDS.pop('test-null', None)
+            nlp_extractor._PIPELINES.pop('test-null', None)
+
+    def test_cache_key_depends_on_backend(self):
+        keys = {nlp_extractor.content_key_for(TEXT, backend=b) for b in ('regex', 'spacy-blank', 'spacy-full')}
+        self.assertEqual(len(keys), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
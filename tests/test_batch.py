@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import os
+import json
+import shutil
+import tempfile
+import subprocess
+import unittest
+from unittest import mock
+from astrocore import batch, nlp_extractor, replicator
+
+PAPER = "A Study\nAbstract\nabc\nMethods\nWelch PSD with nperseg=256 at 500 Hz.\nResults\nok\n"
+
+
+class BatchBuildTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.papers = Path(tmp) / 'papers'
+        self.out = Path(tmp) / 'out'
+        (self.papers / 'sub').mkdir(parents=True)
+        for name in ('a.txt', 'b.txt', 'sub/c.txt'):
+            (self.papers / name).write_text(PAPER.replace('abc', name), encoding='utf-8')
+        (self.papers / 'notes.md').write_text('not a paper', encoding='utf-8')
+
+    def test_rebuilds_only_stale_outputs(self):
+        first = batch.build(self.papers, self.out)
+        self.assertEqual(len(first.rebuilt), 3)
+        self.assertTrue((self.out / 'sub' / 'c.ipynb').exists())
+        self.assertTrue((self.out / 'sub' / 'c.extraction.json').exists())
+        entries = batch.load_manifest(self.out)
+        self.assertEqual(sorted(entries), ['a.ipynb', 'b.ipynb', 'sub/c.ipynb'])
+
+        second = batch.build(self.papers, self.out)
+        self.assertEqual((len(second.rebuilt), len(second.skipped)), (0, 3))
+
+        # a changed paper, a deleted output, new options or generator versions
+        (self.papers / 'a.txt').write_text(PAPER + 'Discussion\nmore\n', encoding='utf-8')
+        (self.out / 'b.extraction.json').unlink()
+        third = batch.build(self.papers, self.out)
+        self.assertEqual(sorted(Path(p).name for p, _ in third.rebuilt), ['a.txt', 'b.txt'])
+        self.assertEqual(len(batch.build(self.papers, self.out, populate_code=True).rebuilt), 3)
+        with mock.patch.object(batch.codegen, 'codegen_version', return_value='next'):
+            self.assertEqual(len(batch.build(self.papers, self.out, populate_code=True).rebuilt), 3)
+        self.assertEqual(len(batch.build(self.papers, self.out, populate_code=True, force=True).rebuilt), 3)
+
+    def test_touch_without_change_is_skipped(self):
+        batch.build(self.papers, self.out)
+        os.utime(self.papers / 'a.txt', ns=(1, 1))
+        report = batch.build(self.papers, self.out)
+        self.assertEqual(len(report.skipped), 3)
+        self.assertEqual(batch.load_manifest(self.out)['a.ipynb']['mtime_ns'], 1)
+
+    def test_failures_are_retried_and_workers(self):
+        (self.papers / 'bad.txt').write_bytes(b'\xff\xfe not utf-8')
+        report = batch.build(str(self.papers / '*.txt'), self.out, workers=2)
+        self.assertFalse(report.ok)
+        self.assertEqual([Path(p).name for p, _ in report.failed], ['bad.txt'])
+        self.assertIn('UnicodeDecodeError', report.failed[0][1])
+        self.assertIn('failed 1', report.summary())
+        self.assertEqual(sorted(batch.load_manifest(self.out)), ['a.ipynb', 'b.ipynb'])
+        (self.papers / 'bad.txt').write_text(PAPER, encoding='utf-8')
+        report = batch.build(str(self.papers / '*.txt'), self.out, workers=2)
+        self.assertEqual(([Path(p).name for p, _ in report.rebuilt], len(report.skipped)), (['bad.txt'], 2))
+
+    def test_papers_sharing_outputs_fail_instead_of_overwriting(self):
+        (self.papers / 'a.pdf').write_bytes(b'%PDF-1.4 same stem as a.txt')
+        for _ in range(3):
+            report = batch.build(self.papers, self.out)
+            self.assertEqual(sorted(Path(p).name for p, _ in report.failed), ['a.pdf', 'a.txt'])
+            self.assertIn('a.ipynb', report.failed[0][1])
+            self.assertEqual(len(report.rebuilt) + len(report.skipped), 2)
+        self.assertFalse((self.out / 'a.ipynb').exists())
+        self.assertNotIn('a.ipynb', batch.load_manifest(self.out))
+
+        # an output already generated from another paper is not taken over
+        (self.papers / 'a.pdf').unlink()
+        self.assertEqual([Path(p).name for p, _ in batch.build(self.papers, self.out).rebuilt], ['a.txt'])
+        (self.papers / 'a.pdf').write_bytes(b'%PDF-1.4 same stem as a.txt')
+        report = batch.build_papers([self.papers / 'a.pdf'], self.papers, self.out)
+        self.assertEqual([Path(p).name for p, _ in report.failed], ['a.pdf'])
+        self.assertIn('a.txt', report.failed[0][1])
+        self.assertTrue(batch.load_manifest(self.out)['a.ipynb']['paper'].endswith('a.txt'))
+
+    def test_backend_and_pdf_cache_apply_to_the_build_only(self):
+        defaults = (nlp_extractor._DEFAULT_BACKEND, replicator._DEFAULT_PDF_CACHE, replicator._DEFAULT_PDF_CACHE_SET)
+        pdf_cache = mock.MagicMock()
+        with mock.patch.object(replicator, 'open_pdf_cache', return_value=pdf_cache) as opened:
+            report = batch.build(self.papers, self.out, backend='regex', pdf_cache=self.out / 'pdf.sqlite')
+        self.assertEqual(len(report.rebuilt), 3)
+        opened.assert_called_once_with(str(self.out / 'pdf.sqlite'))
+        pdf_cache.close.assert_called_once_with()
+        self.assertTrue(batch.load_manifest(self.out)['a.ipynb']['extractor'].endswith('+regex'))
+        self.assertEqual((nlp_extractor._DEFAULT_BACKEND, replicator._DEFAULT_PDF_CACHE,
+                          replicator._DEFAULT_PDF_CACHE_SET), defaults)
+
+    def test_entries_of_removed_papers_are_dropped(self):
+        batch.build(self.papers, self.out)
+        (self.papers / 'b.txt').rename(self.papers / 'b2.txt')
+        batch.build_papers([self.papers / 'a.txt'], self.papers, self.out)
+        self.assertIn('b.ipynb', batch.load_manifest(self.out))
+        report = batch.build(self.papers, self.out)
+        self.assertEqual([Path(p).name for p, _ in report.rebuilt], ['b2.txt'])
+        self.assertEqual(sorted(batch.load_manifest(self.out)), ['a.ipynb', 'b2.ipynb', 'sub/c.ipynb'])
+
+    def test_workers_leave_the_start_method_unset(self):
+        code = ('import sys, multiprocessing\n'
+                'from astrocore import batch\n'
+                'report = batch.build(sys.argv[1], sys.argv[2], workers=2)\n'
+                'print(len(report.rebuilt), multiprocessing.get_start_method(allow_none=True))\n')
+        res = subprocess.run([sys.executable, '-c', code, str(self.papers), str(self.out)], capture_output=True,
+                             text=True, env=dict(os.environ, PYTHONPATH=str(SRC)))
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(res.stdout.split(), ['3', 'None'])
+
+    def test_cli_directory_mode(self):
+        cmd = [sys.executable, str(ROOT / 'scripts' / 'reproduce_from_papers.py'), str(self.papers), str(self.out)]
+        res = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertIn('rebuilt 3, skipped 0, failed 0', res.stdout)
+        nb = json.loads((self.out / 'a.ipynb').read_text(encoding='utf-8'))
+        self.assertEqual(nb['nbformat'], 4)
+        res = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertIn('rebuilt 0, skipped 3, failed 0', res.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
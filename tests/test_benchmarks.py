@@ -0,0 +1,69 @@
+import sys
+import io
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+for p in (SRC, ROOT):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+from astrocore import nlp_extractor, replicator
+from benchmarks import corpus, run as bench
+
+
+class CorpusTests(unittest.TestCase):
+    def test_generation_is_reproducible(self):
+        a = corpus.generate('methods', 3, 2000, seed=1)
+        b = corpus.generate('methods', 3, 2000, seed=1)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, corpus.generate('methods', 3, 2000, seed=2))
+        self.assertTrue(all(len(d) >= 2000 for d in a))
+
+    def test_methods_text_carries_parameters(self):
+        text = corpus.methods_text(4000, random.Random(0), param_every=1, units=('attached',), paths=('unix',))
+        out = nlp_extractor.extract_parameters(text, cache=False)
+        self.assertIn('fs', out)
+        self.assertTrue(out['data_path'].startswith('data/sub-'))
+        self.assertNotIn(' Hz and ICA', text)
+
+    def test_paper_has_sections(self):
+        paper = corpus.paper_text(6000, random.Random(0))
+        secs = replicator.extract_sections_from_text(paper)
+        for name in ('Abstract', 'Methods', 'Results', 'References'):
+            self.assertIn(name, secs)
+        self.assertGreater(len(secs['Methods']), 1000)
+
+
+class SuiteTests(unittest.TestCase):
+    def test_quick_run_writes_results_and_compares(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / 'results.json'
+            rc = bench.main(['--sizes', '500', '--docs', '2', '--repeat', '1', '--out', str(out)])
+            self.assertEqual(rc, 0)
+            report = json.loads(out.read_text(encoding='utf-8'))
+        results = report['results']
+        self.assertIn('extract_parameters/regex@500', results)
+        self.assertIn('replicator.write_notebook@500', results)
+        self.assertEqual(results['parser.parse_text@500']['docs'], 2)
+        self.assertIn('commit', report['meta'])
+
+        slower = {k: dict(v, median_ms=v['median_ms'] * 3 + 1) for k, v in results.items()}
+        self.assertFalse(bench.compare(slower, results, fail_over=2.0, out=io.StringIO()))
+        self.assertTrue(bench.compare(results, results, fail_over=2.0, out=io.StringIO()))
+
+    def test_worker_memory_report(self):
+        docs = corpus.generate('methods', 4, 500, seed=0)
+        report = bench.worker_memory(2, docs)
+        self.assertEqual((report['workers'], report['docs']), (2, 4))
+        if report['parent'] is not None:
+            self.assertEqual(len(report['per_worker']), 2)
+            self.assertLessEqual(report['mean_private_mb'], report['mean_rss_mb'])
+
+
+if __name__ == '__main__':
+    unittest.main()
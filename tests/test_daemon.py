@@ -0,0 +1,193 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import os
+import json
+import socket
+import shutil
+import tempfile
+import threading
+import subprocess
+import unittest
+from unittest import mock
+from astrocore import daemon, nlp_extractor, parser
+
+METHODS = "EEG was sampled at 500 Hz, band-pass filtered 1-40 Hz and analysed with Welch PSD (nperseg=256)."
+
+
+class _RecordingServer(daemon.DaemonServer):
+    fail = None
+
+    def dispatch(self, message):
+        self.ops.append(message['op'])
+        self.backends.append(message.get('backend'))
+        if message['op'] == self.fail:
+            raise ValueError('broken paper')
+        return super().dispatch(message)
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX domain sockets not available')
+class DaemonTests(unittest.TestCase):
+    def setUp(self):
+        # short directory: socket paths are limited to about 100 bytes
+        self.tmp = Path(tempfile.mkdtemp(prefix='acd', dir='/tmp' if os.path.isdir('/tmp') else None))
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.sock = self.tmp / 'd.sock'
+        self.addCleanup(nlp_extractor.set_default_backend, None)
+        self.server = _RecordingServer(self.sock, backend='regex')
+        self.server.ops, self.server.backends = [], []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(self.server.shutdown)
+
+    def test_requests_match_in_process_results(self):
+        self.assertEqual(daemon.request('ping', self.sock)['backend'], 'regex')
+        self.assertEqual(daemon.request('summarize', self.sock, text='PEG 与 EEG'),
+                         json.loads(json.dumps(parser.summarize_to_json('PEG 与 EEG'), ensure_ascii=False)))
+        expected = json.loads(json.dumps(nlp_extractor.extract_parameters(METHODS, cache=False, backend='regex')))
+        self.assertEqual(daemon.request('extract', self.sock, text=METHODS, backend='regex'), expected)
+        paper = self.tmp / 'p.txt'
+        paper.write_text(METHODS, encoding='utf-8')
+        self.assertEqual(daemon.request('extract', self.sock, paper=str(paper), backend='regex'), expected)
+        self.assertEqual(self.server.ops, ['ping', 'summarize', 'extract', 'extract'])
+
+    def test_errors_and_fallback_signals(self):
+        with self.assertRaises(FileNotFoundError):
+            daemon.request('extract', self.sock, paper=str(self.tmp / 'missing.txt'))
+        with self.assertRaises(daemon.DaemonUnavailable):
+            daemon.request('notebook', self.sock, paper='x.txt', out='x.ipynb', backend='spacy-blank')
+        with self.assertRaises(daemon.DaemonUnavailable):
+            daemon.request('ping', self.tmp / 'none.sock')
+        with mock.patch.dict(os.environ, {daemon.DISABLE_ENV_VAR: '0'}):
+            with self.assertRaises(daemon.DaemonUnavailable):
+                daemon.request('ping', self.sock)
+        with mock.patch.object(daemon, 'source_version', return_value='other'):
+            with self.assertRaises(daemon.DaemonUnavailable):
+                daemon.request('ping', self.sock)
+        with self.assertRaises(OSError):
+            daemon.DaemonServer(self.sock)
+        self.assertEqual(os.stat(self.sock).st_mode & 0o777, 0o600)
+
+    def test_cli_uses_daemon(self):
+        paper = self.tmp / 'paper.txt'
+        paper.write_text(f"Title\nMethods\n{METHODS}\nResults\nok\n", encoding='utf-8')
+        env = dict(os.environ, PYTHONPATH=str(SRC), ASTROCORE_DAEMON_SOCKET=str(self.sock), ASTROCORE_BACKEND='regex')
+        script = str(ROOT / 'scripts' / 'reproduce_from_papers.py')
+        out = self.tmp / 'nb.ipynb'
+        res = subprocess.run([sys.executable, script, str(paper), str(out)], capture_output=True, text=True, env=env)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(self.server.ops, ['notebook'])
+        nb = json.loads(out.read_text(encoding='utf-8'))
+        self.assertIn('Welch', nb['astrocore_extraction']['methods'])
+        res = subprocess.run([sys.executable, script, str(paper), str(out), '--dump-extraction-only', '--no-daemon'],
+                             capture_output=True, text=True, env=env)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(self.server.ops, ['notebook'])
+        res = subprocess.run([sys.executable, str(ROOT / 'scripts' / 'summarize_readme.py'), str(paper)],
+                             capture_output=True, text=True, env=env)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(self.server.ops, ['notebook', 'summarize'])
+
+    def test_cli_sends_its_own_backend(self):
+        sock = self.tmp / 'blank.sock'
+        server = _RecordingServer(sock, backend='spacy-blank')
+        server.ops, server.backends = [], []
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(server.shutdown)
+        paper = self.tmp / 'paper.txt'
+        paper.write_text(f"Title\nMethods\n{METHODS}\nResults\nok\n", encoding='utf-8')
+        env = dict(os.environ, PYTHONPATH=str(SRC), ASTROCORE_DAEMON_SOCKET=str(sock))
+        env.pop(nlp_extractor.BACKEND_ENV_VAR, None)
+        res = subprocess.run([sys.executable, '-c', 'from astrocore import nlp_extractor; print(nlp_extractor.resolve_backend())'],
+                             capture_output=True, text=True, env=env)
+        client_backend = res.stdout.strip()
+        self.assertNotEqual(client_backend, 'spacy-blank')
+        script = str(ROOT / 'scripts' / 'reproduce_from_papers.py')
+        out = self.tmp / 'nb.ipynb'
+        res = subprocess.run([sys.executable, script, str(paper), str(out)], capture_output=True, text=True, env=env)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        # the daemon refuses a notebook for another backend and the CLI builds it in process
+        self.assertEqual(server.ops, ['notebook'])
+        self.assertEqual(server.backends, [client_backend])
+        dump = self.tmp / 'dump.ipynb'
+        res = subprocess.run([sys.executable, script, str(paper), str(dump), '--dump-extraction-only'],
+                             capture_output=True, text=True, env=env)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(server.ops, ['notebook', 'extract'])
+        self.assertEqual(server.backends, [client_backend, client_backend])
+        sidecar = dump.with_suffix('.extraction.json')
+        served = json.loads(sidecar.read_text(encoding='utf-8'))
+        res = subprocess.run([sys.executable, script, str(paper), str(dump), '--dump-extraction-only', '--no-daemon'],
+                             capture_output=True, text=True, env=env)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(server.ops, ['notebook', 'extract'])
+        self.assertEqual(served, json.loads(sidecar.read_text(encoding='utf-8')))
+        nb = json.loads(out.read_text(encoding='utf-8'))
+        self.assertEqual(nb['astrocore_extraction'], served)
+
+    def test_cli_reports_daemon_errors(self):
+        paper = self.tmp / 'paper.txt'
+        paper.write_text(METHODS, encoding='utf-8')
+        self.server.fail = 'summarize'
+        env = dict(os.environ, PYTHONPATH=str(SRC), ASTROCORE_DAEMON_SOCKET=str(self.sock))
+        res = subprocess.run([sys.executable, str(ROOT / 'scripts' / 'summarize_readme.py'), str(paper)],
+                             capture_output=True, text=True, env=env)
+        self.assertNotEqual(res.returncode, 0)
+        self.assertIn('ValueError: broken paper', res.stderr)
+
+    def test_only_sockets_of_this_user_are_used(self):
+        with mock.patch.object(daemon.os, 'getuid', return_value=os.getuid() + 1):
+            with self.assertRaises(daemon.DaemonUnavailable):
+                daemon.request('ping', self.sock)
+        planted = self.tmp / 'planted.sock'
+        planted.write_text('not a socket', encoding='utf-8')
+        with self.assertRaises(daemon.DaemonUnavailable):
+            daemon.request('ping', planted)
+        with self.assertRaises(OSError):
+            daemon.DaemonServer(planted)
+        self.assertTrue(planted.exists())
+
+    def test_default_socket_directory_is_private(self):
+        env = {k: v for k, v in os.environ.items() if k != daemon.SOCKET_ENV_VAR}
+        env['XDG_RUNTIME_DIR'] = str(self.tmp)
+        with mock.patch.dict(os.environ, env, clear=True):
+            path = daemon.socket_path()
+            self.assertEqual(path.parent, self.tmp / f'astrocore-{os.getuid()}')
+            server = daemon.DaemonServer()
+            server.server_close()
+            self.assertEqual(os.stat(path.parent).st_mode & 0o777, 0o700)
+            with mock.patch.object(daemon.os, 'getuid', return_value=os.getuid() + 1):
+                taken = daemon.socket_path().parent
+                taken.mkdir()
+                with self.assertRaises(OSError):
+                    daemon.DaemonServer()
+
+    def test_silent_daemon_counts_as_unavailable(self):
+        silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(silent.close)
+        silent.bind(str(self.tmp / 'q.sock'))
+        silent.listen(1)
+        with self.assertRaises(daemon.DaemonUnavailable):
+            daemon.request('ping', self.tmp / 'q.sock', timeout=0.2)
+
+    def test_stale_socket_is_replaced(self):
+        stale = self.tmp / 's.sock'
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.bind(str(stale))
+        s.close()
+        server = daemon.DaemonServer(stale)
+        server.server_close()
+        self.assertFalse(stale.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import unittest
+from astrocore import nlp_extractor
+from astrocore.cache import ExtractionCache
+
+TEXT = ("We used Welch's method with nperseg=1024. Data were sampled at fs = 1 kHz "
+        "and stored in data/subject1/session1.csv after a 1-40 Hz bandpass.")
+
+
+def _spacy_ready():
+    return nlp_extractor._HAS_SPACY and nlp_extractor._get_spacy_nlp() is not None
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_generous_deadline_matches_unbounded_extraction(self):
+        res = nlp_extractor.extract_parameters(TEXT, cache=False, deadline_ms=60000)
+        self.assertFalse(res.pop('partial'))
+        self.assertEqual(res.pop('skipped_stages'), [])
+        self.assertEqual(res, nlp_extractor.extract_parameters(TEXT, cache=False))
+
+    def test_expired_deadline_returns_partial_result(self):
+        res = nlp_extractor.extract_parameters(TEXT, cache=False, deadline_ms=0)
+        self.assertTrue(res['partial'])
+        self.assertEqual(res['skipped_stages'][0], 'regex_rules')
+        self.assertEqual(res['methods'], [])
+        self.assertEqual(res['confidence'], 0.0)
+
+    def test_partial_results_are_not_cached(self):
+        cache = ExtractionCache(version='v1')
+        nlp_extractor.extract_parameters(TEXT, cache=cache, deadline_ms=0)
+        self.assertEqual(cache.stats()['writes'], 0)
+        nlp_extractor.extract_parameters(TEXT, cache=cache, deadline_ms=60000)
+        self.assertEqual(cache.stats()['writes'], 1)
+        # the cached entry serves calls with and without a deadline
+        self.assertNotIn('partial', nlp_extractor.extract_parameters(TEXT, cache=cache))
+        hit = nlp_extractor.extract_parameters(TEXT, cache=cache, deadline_ms=0)
+        self.assertFalse(hit['partial'])
+
+    def test_partial_lowers_confidence(self):
+        self.assertAlmostEqual(nlp_extractor.compute_confidence({'fs': 1000, 'partial': True}), 0.225)
+        self.assertAlmostEqual(nlp_extractor.compute_confidence({'fs': 1000, 'partial': False}), 0.3)
+
+    @unittest.skipUnless(_spacy_ready(), 'spaCy not available')
+    def test_slow_parse_is_skipped_but_regex_results_kept(self):
+        saved = nlp_extractor._PARSE_SECONDS_PER_CHAR
+        nlp_extractor._PARSE_SECONDS_PER_CHAR = 1.0  # every parse looks too slow
+        try:
+            res = nlp_extractor.extract_parameters(TEXT, cache=False, deadline_ms=1000)
+        finally:
+            nlp_extractor._PARSE_SECONDS_PER_CHAR = saved
+        self.assertTrue(res['partial'])
+        self.assertEqual(res['skipped_stages'], ['spacy_parse', 'spacy_enrich'])
+        self.assertEqual(res['methods'], ['Welch'])
+        self.assertEqual(res['params']['nperseg'], 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
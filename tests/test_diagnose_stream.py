@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import tempfile
+import importlib
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+diag = importlib.import_module('scripts.diagnose_nlp_samples')
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _interrupt_after(samples, n):
+    for i, s in enumerate(samples):
+        if i == n:
+            raise Interrupted()
+        yield s
+
+
+class DiagnoseStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name) / 'report.jsonl'
+        self.samples = diag.BUILTIN_SAMPLES * 3
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _rows(self):
+        return [json.loads(l) for l in self.out.read_text(encoding='utf-8').splitlines()]
+
+    def test_stream_writes_jsonl(self):
+        n = diag.run_stream(self.samples, out_path=str(self.out), chunk_size=4, log=None)
+        rows = self._rows()
+        self.assertEqual(n, len(self.samples))
+        self.assertEqual([r['index'] for r in rows], list(range(len(self.samples))))
+        self.assertEqual([r['text'] for r in rows], self.samples)
+
+    def test_resume_after_interruption(self):
+        with self.assertRaises(Interrupted):
+            diag.run_stream(_interrupt_after(self.samples, 10), out_path=str(self.out), chunk_size=4, log=None)
+        ckpt = json.loads(self.out.with_name(self.out.name + '.ckpt').read_text())
+        self.assertEqual(ckpt['done'], 8)
+        n = diag.run_stream(self.samples, out_path=str(self.out), chunk_size=4, resume=True, log=None)
+        self.assertEqual(n, len(self.samples))
+        rows = self._rows()
+        self.assertEqual([r['text'] for r in rows], self.samples)
+
+    def test_workers_match_serial(self):
+        diag.run_stream(self.samples, out_path=str(self.out), chunk_size=4, log=None)
+        serial = self._rows()
+        diag.run_stream(self.samples, out_path=str(self.out), workers=2, chunk_size=4, log=None)
+        self.assertEqual(self._rows(), serial)
+
+    def test_stream_mode_defaults_to_jsonl_report(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            diag.main(['--workers', '1'])
+        finally:
+            os.chdir(cwd)
+        self.assertTrue((Path(self.tmp.name) / 'diagnose_report.jsonl').exists())
+        self.assertFalse((Path(self.tmp.name) / 'diagnose_report.json').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
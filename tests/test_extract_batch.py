@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import types
+import sqlite3
+import unittest
+from astrocore import nlp_extractor
+from astrocore.cache import ExtractionCache
+from astrocore.nlp_extractor import extract_parameters, extract_parameters_batch
+
+SAMPLES = [
+    "We used Welch's method with nperseg=1024 and window='hann' and a bandpass of 1-40 Hz.",
+    "",
+    "Power spectra were computed (FFT) after bandpass filtering 0.5 to 30 Hz.",
+    "Data were sampled at fs = 1 kHz and stored in data/subject1/session1.csv.",
+    None,
+    "Sampling rate was 2048Hz and ICA was performed to remove artifacts.",
+    "EEG files at C:\\data\\subj.mat were loaded; filtering 0.1 to 100 Hz.",
+]
+
+
+class ExtractBatchTests(unittest.TestCase):
+    def test_batch_matches_single(self):
+        expected = [extract_parameters(t) for t in SAMPLES]
+        got = list(extract_parameters_batch(SAMPLES, batch_size=2))
+        self.assertEqual(got, expected)
+
+    def test_batch_is_lazy_generator(self):
+        consumed = []
+
+        def source():
+            for t in SAMPLES:
+                consumed.append(t)
+                yield t
+
+        gen = extract_parameters_batch(source(), batch_size=1)
+        self.assertIsInstance(gen, types.GeneratorType)
+        self.assertEqual(consumed, [])
+        first = next(gen)
+        self.assertIn('Welch', first['methods'])
+        self.assertLess(len(consumed), len(SAMPLES))
+
+    @unittest.skipUnless(nlp_extractor._HAS_SPACY, 'spaCy not available')
+    def test_failure_while_storing_keeps_results_aligned(self):
+        class FlakyCache(ExtractionCache):
+            failures = 1
+
+            def put(self, key, value):
+                if self.failures:
+                    self.failures -= 1
+                    raise sqlite3.OperationalError('database is locked')
+                super().put(key, value)
+
+        expected = [extract_parameters(t, cache=False, backend='spacy-blank') for t in SAMPLES]
+        got = list(extract_parameters_batch(SAMPLES, batch_size=2, cache=FlakyCache(), backend='spacy-blank'))
+        self.assertEqual(got, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import io
+import unittest
+import tracemalloc
+from astrocore import nlp_extractor
+
+SAMPLE = ("We used Welch's method with nperseg=1024 and window='hann'. "
+          "Data were bandpass filtered 1-40 Hz with a butterworth filter. "
+          "The sampling rate was 500 Hz and data were stored in data/s1.edf. ")
+FILLER = "Participants were seated comfortably in a dimly lit room. "
+
+
+class StreamExtractionTests(unittest.TestCase):
+    def test_matches_whole_text_extraction(self):
+        text = FILLER * 40 + SAMPLE + FILLER * 40 + "ICA removed artifacts. fs = 250 Hz. "
+        expected = nlp_extractor.extract_parameters(text, cache=False)
+        for size in (7, 100, 1000):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            got = nlp_extractor.extract_parameters_stream(chunks, window_chars=300, overlap=200)
+            self.assertEqual(got, expected, size)
+
+    def test_match_across_chunk_and_window_boundary(self):
+        text = FILLER * 10 + "nperseg=2048 " + FILLER * 10
+        cut = text.index('2048') + 2
+        window = cut - 5
+        got = nlp_extractor.extract_parameters_stream([text[:cut], text[cut:]],
+                                                      window_chars=window, overlap=100)
+        self.assertEqual(got['params']['nperseg'], 2048)
+
+    def test_first_match_wins_across_windows(self):
+        text = "nperseg=256 " + FILLER * 20 + "nperseg=512 " + FILLER * 20
+        got = nlp_extractor.extract_parameters_stream(text, window_chars=200, overlap=100)
+        self.assertEqual(got['params']['nperseg'], 256)
+
+    def test_file_object_and_empty_input(self):
+        got = nlp_extractor.extract_parameters_stream(io.StringIO(SAMPLE))
+        self.assertEqual(got, nlp_extractor.extract_parameters(SAMPLE, cache=False))
+        self.assertEqual(nlp_extractor.extract_parameters_stream([]),
+                         nlp_extractor.extract_parameters('', cache=False))
+        with self.assertRaises(ValueError):
+            nlp_extractor.extract_parameters_stream([SAMPLE], window_chars=0)
+
+    def test_memory_is_bounded(self):
+        def chunks():
+            for _ in range(400):
+                yield FILLER * 200      # ~12 KB per chunk, ~4.7 MB in total
+            yield SAMPLE
+
+        tracemalloc.start()
+        try:
+            got = nlp_extractor.extract_parameters_stream(chunks(), window_chars=50000, overlap=1000)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(got['fs'], 500.0)
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from astrocore import nlp_extractor, scanners
+from astrocore.cache import ExtractionCache
+
+TEXT = "Data were sampled at fs = 1 kHz and stored in data/subject1/session1.csv."
+
+
+class ExtractionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self.tmp.name) / 'extraction.sqlite'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_memory_tier_lru(self):
+        cache = ExtractionCache(version='v1', max_memory_entries=2)
+        for k in ('a', 'b', 'c'):
+            cache.put(k, {'k': k})
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), {'k': 'c'})
+        self.assertEqual(cache.stats()['memory_hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_disk_tier_persists_and_invalidates_on_version_change(self):
+        cache = ExtractionCache(self.db, version='v1')
+        cache.put('k', {'fs': 1000.0})
+        cache.close()
+        reopened = ExtractionCache(self.db, version='v1')
+        self.assertEqual(reopened.get('k'), {'fs': 1000.0})
+        self.assertEqual(reopened.stats()['disk_hits'], 1)
+        reopened.close()
+        upgraded = ExtractionCache(self.db, version='v2')
+        self.assertIsNone(upgraded.get('k'))
+        self.assertEqual(upgraded._disk.total_bytes(), 0)
+        upgraded.close()
+
+    def test_version_covers_scanner_sources(self):
+        before = nlp_extractor.cache_version()
+        edited = Path(self.tmp.name) / 'scanners.py'
+        shutil.copyfile(scanners.__file__, edited)
+        with open(edited, 'a', encoding='utf-8') as fh:
+            fh.write('\n# changed\n')
+        with mock.patch.object(nlp_extractor, '_CACHE_VERSION', None), \
+                mock.patch.object(scanners, '__file__', str(edited)):
+            self.assertNotEqual(nlp_extractor.cache_version(), before)
+
+    def test_disk_reads_record_access_times_lazily(self):
+        cache = ExtractionCache(self.db, version='v1')
+        cache.put('k', {'fs': 1000.0})
+        cache.close()
+        db = sqlite3.connect(str(self.db))
+        self.addCleanup(db.close)
+        db.execute('UPDATE entries SET atime = 0')
+        db.commit()
+        reopened = ExtractionCache(self.db, version='v1')
+        self.assertEqual(reopened.get('k'), {'fs': 1000.0})
+        self.assertEqual(db.execute('SELECT atime FROM entries').fetchone()[0], 0)
+        reopened.close()
+        self.assertGreater(db.execute('SELECT atime FROM entries').fetchone()[0], 0)
+
+    def test_disk_size_eviction(self):
+        cache = ExtractionCache(self.db, version='v1', max_memory_entries=1, max_disk_bytes=4096)
+        for i in range(200):
+            cache.put(f'k{i}', 'x' * 100)
+        cache._disk.evict()
+        self.assertLessEqual(cache._disk.total_bytes(), 4096)
+        self.assertGreater(cache.stats()['disk_evictions'], 0)
+        # most recently written entries survive
+        self.assertIsNotNone(cache.get('k199'))
+        cache.close()
+
+    def test_extract_parameters_hit_skips_extraction(self):
+        cache = nlp_extractor.open_extraction_cache(self.db)
+        first = nlp_extractor.extract_parameters(TEXT, cache=cache)
+        original = nlp_extractor._extract_with_doc
+        nlp_extractor._extract_with_doc = None  # any call would raise
+        try:
+            again = nlp_extractor.extract_parameters(TEXT, cache=cache)
+            batch = list(nlp_extractor.extract_parameters_batch([TEXT, TEXT], cache=cache))
+        finally:
+            nlp_extractor._extract_with_doc = original
+        self.assertEqual(again, first)
+        self.assertEqual(batch, [first, first])
+        self.assertIsNot(again, first)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['hits'], 3)
+        cache.close()
+
+    def test_batch_with_cache_matches_uncached(self):
+        texts = [TEXT, "Welch nperseg=512", TEXT, "", "fs=250"]
+        cache = nlp_extractor.open_extraction_cache()
+        list(nlp_extractor.extract_parameters_batch(texts[:2], cache=cache))
+        got = list(nlp_extractor.extract_parameters_batch(texts, cache=cache))
+        self.assertEqual(got, [nlp_extractor.extract_parameters(t, cache=False) for t in texts])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import unittest
+from unittest import mock
+from astrocore import nlp_extractor, nlp_stats
+from astrocore.cache import ExtractionCache
+
+SAMPLES = [
+    "We used Welch's method with nperseg=1024 and window='hann' and a bandpass of 1-40 Hz.",
+    "Data were sampled at fs = 1 kHz and stored in data/subject1/session1.csv.",
+    "A 4th order butterworth lowpass 40 Hz filter was applied; ICA removed artifacts.",
+    "EEG files at C:\\data\\subj.mat were loaded; sampling rate was 2048Hz.",
+]
+
+
+class FieldProjectionTests(unittest.TestCase):
+    def test_projection_equals_filtered_full_result(self):
+        for fields in (['fs'], ['methods'], ['data_path', 'fs'], ['params', 'bandpass'], ['confidence'],
+                       ['filters', 'confidence']):
+            for text in SAMPLES:
+                full = nlp_extractor.extract_parameters(text, cache=False)
+                expected = {k: v for k, v in full.items() if k in fields}
+                self.assertEqual(nlp_extractor.extract_parameters(text, cache=False, fields=fields), expected)
+
+    def test_single_string_field(self):
+        res = nlp_extractor.extract_parameters(SAMPLES[1], cache=False, fields='fs')
+        self.assertEqual(res, {'fs': 1000.0})
+
+    def test_unknown_field_raises(self):
+        with self.assertRaises(ValueError):
+            nlp_extractor.extract_parameters(SAMPLES[0], fields=['sampling'])
+
+    def test_only_dependent_rules_run(self):
+        with nlp_stats.collect() as stats:
+            nlp_extractor.extract_parameters(SAMPLES[0], cache=False, fields=['methods'])
+        rules = {name for name in stats.as_dict()['rules'] if not name.startswith('spacy:')}
+        self.assertTrue(rules)
+        self.assertTrue(rules <= set(nlp_extractor._METHOD_RULES))
+
+    def test_spacy_skipped_when_no_field_needs_it(self):
+        with mock.patch.object(nlp_extractor, '_get_pipeline', side_effect=AssertionError('spaCy used')):
+            res = nlp_extractor.extract_parameters(SAMPLES[2], cache=False, fields=['methods', 'filters'])
+            batch = list(nlp_extractor.extract_parameters_batch(SAMPLES, cache=False, fields=['methods']))
+        self.assertEqual(res['methods'], ['ICA'])
+        self.assertEqual(res['filters'][0], {'type': 'lowpass', 'cutoff': 40.0})
+        self.assertEqual([r['methods'] for r in batch], [['Welch'], [], ['ICA'], []])
+
+    def test_projections_are_cached_separately(self):
+        cache = ExtractionCache(version='v1')
+        nlp_extractor.extract_parameters(SAMPLES[1], cache=cache, fields=['fs'])
+        full = nlp_extractor.extract_parameters(SAMPLES[1], cache=cache)
+        self.assertEqual(cache.stats()['writes'], 2)
+        self.assertIn('data_path', full)
+        self.assertEqual(nlp_extractor.extract_parameters(SAMPLES[1], cache=cache, fields=['fs']), {'fs': 1000.0})
+        self.assertEqual(cache.stats()['memory_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
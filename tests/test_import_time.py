@@ -0,0 +1,51 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+ENV = dict(os.environ, PYTHONPATH=str(SRC))
+
+# Cumulative import budget for the astrocore modules used by the CLIs. The
+# real cost is a few milliseconds; the budget leaves headroom for slow CI.
+IMPORT_BUDGET_MS = 250
+
+
+def _importtime(module):
+    """Return (cumulative_us, stderr) for `import module` in a fresh interpreter."""
+    code = f"import {module}"
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         capture_output=True, text=True, cwd=str(ROOT), env=ENV)
+    if res.returncode != 0:
+        raise AssertionError(res.stderr)
+    for line in res.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]), res.stderr
+    raise AssertionError(f'{module} not found in -X importtime output')
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_extractor_import_does_not_load_spacy(self):
+        code = "import sys, astrocore.replicator; print('spacy' in sys.modules)"
+        res = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=ENV)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(res.stdout.strip(), 'False')
+
+    def test_import_budget(self):
+        for module in ('astrocore.nlp_extractor', 'astrocore.replicator'):
+            cumulative_us, _ = _importtime(module)
+            self.assertLess(cumulative_us / 1000.0, IMPORT_BUDGET_MS, msg=module)
+
+    def test_package_defers_submodules(self):
+        code = "import sys, astrocore; print('astrocore.nlp_extractor' in sys.modules); astrocore.codegen; print('astrocore.codegen' in sys.modules)"
+        res = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=ENV)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertEqual(res.stdout.split(), ['False', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
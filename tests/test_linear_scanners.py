@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import re
+import time
+import base64
+import random
+import unittest
+from astrocore import nlp_extractor, scanners
+
+# the rule-table regexes the scanners replace
+ORIGINALS = {
+    'bandpass': r'([0-9]+(?:\.[0-9]+)?)\s*(?:-|to)\s*([0-9]+(?:\.[0-9]+)?)\s*(k?m?hz|hz)?',
+    'fs_hz': r"(\d+(?:\.\d+)?)\s*hz",
+    'data_path': r"(?P<path>['\"]?([A-Za-z]:)?[\\/\w\-\.]+\.(?:csv|mat|npy|fif|edf)['\"]?)",
+    'data_path_loose': r"data\s*(?:file|set)?\s*(?:[:=\-])?\s*['\"]?(?P<p>[\w\-/\\\.]+)['\"]?",
+}
+
+# pieces chosen to hit every branch: ranges, units, drives, quotes, separators,
+# and characters where IGNORECASE and \w/\d differ from ASCII
+ALPHABET = ['1', '23', '.', '-', ' to ', 'to', ' ', '  ', '\n', '\t', '"', "'", 'data', 'Data', 'file',
+            'set', '\u017fet', ':', '=', 'C:', 'c:', '\\', '/', 'csv', 'CSV', '.csv', '.mat', '.edf',
+            '.c\u017fv', 'hz', 'Hz', 'kHz', 'mhz', 'K', '\u0130', '\u017f', '\u0663', 'x', '_', '\u00e9', '!', ',']
+
+# worst-case latency for one extraction, per KB of input
+MAX_MS_PER_KB = 5.0
+
+
+def _key(m, n_groups):
+    if m is None:
+        return None
+    return m.group(0), m.groups(), m.groupdict(), [m.span(i) for i in range(n_groups + 1)]
+
+
+class LinearScannerTests(unittest.TestCase):
+    def test_scanners_match_original_regexes(self):
+        rules = dict((name, pattern) for name, _, pattern, _, _ in nlp_extractor._COMPILED_RULES)
+        rng = random.Random(1234)
+        for _ in range(20000):
+            text = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 30)))
+            pos = rng.randint(0, len(text))
+            for name, original in ORIGINALS.items():
+                regex = re.compile(original, re.IGNORECASE)
+                expected = _key(regex.search(text, pos), regex.groups)
+                got = _key(rules[name].search(text, pos), regex.groups)
+                self.assertEqual(got, expected, (name, text, pos))
+
+    def test_examples(self):
+        m = scanners.DataPathScanner().search('Loaded "C:\\data\\run1.csv" first')
+        self.assertEqual(m.group('path'), '"C:\\data\\run1.csv"')
+        self.assertEqual(m.group(2), 'C:')
+        m = scanners.LooseDataPathScanner().search('data file: recordings/s01')
+        self.assertEqual(m.group('p'), 'recordings/s01')
+        self.assertIsNone(scanners.LooseDataPathScanner().search('data   !'))
+
+    def test_latency_ceiling_on_adversarial_input(self):
+        rng = random.Random(0)
+        n = 40000
+        blob = base64.b64encode(bytes(rng.randrange(256) for _ in range(n * 3 // 4))).decode()
+        cases = {
+            'digits': '1' * n,
+            'fractions': '1.' * (n // 2),
+            'path_chars': 'a/' * (n // 2),
+            'base64': blob,
+            'url': 'https://example.org/' + 'a-b_c.d/' * (n // 8),
+            'data_spaces': ('data' + ' ' * 50 + '!') * (n // 55),
+            'nperseg_spaces': ('nperseg' + ' ' * 50 + 'x ') * (n // 59),
+        }
+        nlp_extractor.extract_parameters('warm-up: fs = 500 Hz', cache=False)  # lazy model load
+        for name, text in cases.items():
+            t0 = time.perf_counter()
+            nlp_extractor.extract_parameters(text, cache=False)
+            ms_per_kb = (time.perf_counter() - t0) * 1000.0 / (len(text) / 1024.0)
+            self.assertLess(ms_per_kb, MAX_MS_PER_KB, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
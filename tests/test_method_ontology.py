@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import time
+import unittest
+from astrocore import codegen, nlp_extractor, ontology
+
+
+class MethodOntologyTests(unittest.TestCase):
+    def setUp(self):
+        self.onto = ontology.default_ontology()
+
+    def test_every_alias_resolves_to_its_method(self):
+        self.assertEqual(self.onto.names[:4], ('Welch', 'FFT', 'ICA', 'MNE'))
+        for entry in self.onto.entries:
+            for alias in entry['aliases']:
+                for written in (alias, alias.upper(), alias.replace(' ', '-'), alias.replace(' ', '\n  ')):
+                    hits = self.onto.search(f'we used {written}, then')
+                    self.assertEqual(hits.names() if hits else None, [entry['name']], written)
+
+    def test_whole_words_and_longest_alias(self):
+        self.assertIsNone(self.onto.search('a statistical mnemonic for fftw'))
+        hits = self.onto.search("Welch's t-test, the Hilbert-Huang transform and Welch periodograms")
+        self.assertEqual(hits.names(), ['Welch', 'EMD', 'TTest'])
+        self.assertEqual(hits.offsets()['TTest'], 0)
+
+    def test_canonical_lookup_and_hints(self):
+        self.assertEqual(self.onto.canonical('Fast-Fourier  Transform'), 'FFT')
+        self.assertEqual(self.onto.canonical('wpli'), 'wPLI')
+        self.assertIsNone(self.onto.canonical('astrology'))
+        self.assertIn('nperseg', self.onto.hints('welch'))
+
+    def test_conflicting_aliases_rejected(self):
+        doc = {'methods': [{'name': 'A', 'aliases': ['same']}, {'name': 'B', 'aliases': ['Same']}]}
+        with self.assertRaises(ValueError):
+            ontology.MethodOntology(doc)
+
+    def test_extractor_reports_canonical_names_in_ontology_order(self):
+        text = ("Data were cleaned with artifact subspace reconstruction and FastICA; "
+                "multitaper spectra and the weighted phase lag index were compared with Welch's method.")
+        res = nlp_extractor.extract_parameters(text, cache=False)
+        self.assertEqual(res['methods'], ['Welch', 'ICA', 'Multitaper', 'wPLI', 'ASR'])
+
+    def test_stream_reports_methods_from_every_window(self):
+        text = 'ICA first. ' + 'x ' * 3000 + 'Then coherence. ' + 'y ' * 3000 + 'Finally FFT.'
+        res = nlp_extractor.extract_parameters_stream(text, window_chars=1000, overlap=100, backend='regex')
+        self.assertEqual(res['methods'], nlp_extractor.extract_parameters(text, cache=False, backend='regex')['methods'])
+        self.assertEqual(res['methods'], ['FFT', 'ICA', 'Coherence'])
+
+    def test_codegen_dispatches_on_canonical_names(self):
+        code = '\n'.join(codegen.generate_code_from_extraction(
+            {'methods': ['fast fourier transform', 'sLORETA', 'Coherence'], 'params': {'nperseg': 256}}))
+        self.assertIn('np.fft', code)
+        self.assertIn('# sLORETA: no code template', code)
+        self.assertIn('nperseg=256', code)
+        code = codegen.generate_code_from_extraction({'methods': ['PCA'], 'params': {}})
+        self.assertTrue(code[0].startswith('# No automatic code generated'))
+        code = '\n'.join(codegen.generate_code_from_extraction({'methods': ['sLORETA', 'Welch'], 'params': None}))
+        self.assertIn('# sLORETA: no code template', code)
+
+    def test_search_cost_is_linear(self):
+        self.onto.search('warm-up')  # compile the automaton
+        sentence = 'The signal was analysed with several methods and some statistics. '
+        timings = []
+        for n in (200, 800):
+            text = sentence * n
+            t0 = time.perf_counter()
+            self.onto.search(text)
+            timings.append((time.perf_counter() - t0) / len(text))
+        self.assertLess(timings[1], timings[0] * 4 + 1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import unittest
+import importlib.util
+from unittest import mock
+from astrocore import model_pool
+
+HAS_SPACY = importlib.util.find_spec('spacy') is not None
+
+
+class _Pipeline:
+    def __init__(self, name, disable):
+        self.name, self.disable = name, disable
+        self.seen = []
+
+    def __call__(self, text):
+        self.seen.append(text)
+        return text.upper()
+
+    def pipe(self, texts, batch_size=64, n_process=1):
+        return (self(t) for t in texts)
+
+
+class ModelPoolTests(unittest.TestCase):
+    def setUp(self):
+        model_pool.clear()
+        self.addCleanup(model_pool.clear)
+
+    def test_loads_and_warms_each_model_once(self):
+        with mock.patch.object(model_pool, '_load', side_effect=_Pipeline) as load:
+            first = model_pool.get_model('m', disable=['parser', 'lemmatizer'])
+            for _ in range(1000):
+                self.assertIs(model_pool.get_model('m', disable=('lemmatizer', 'parser')), first)
+            other = model_pool.get_model('m')
+        self.assertEqual(load.call_count, 2)
+        self.assertIsNot(other, first)
+        self.assertEqual(first.disable, ('lemmatizer', 'parser'))
+        self.assertEqual(first.seen, [model_pool.WARMUP_TEXT])
+        self.assertEqual(set(model_pool.loaded()), {('m', ('lemmatizer', 'parser')), ('m', ())})
+
+    def test_failed_load_is_retried(self):
+        with mock.patch.object(model_pool, '_load', side_effect=[OSError('no model'), _Pipeline('m', ())]):
+            with self.assertRaises(OSError):
+                model_pool.get_model('m')
+            self.assertIsNotNone(model_pool.get_model('m'))
+
+    def test_pipe_uses_pooled_model(self):
+        with mock.patch.object(model_pool, '_load', side_effect=_Pipeline) as load:
+            self.assertEqual(list(model_pool.pipe(['a', 'b'], 'm')), ['A', 'B'])
+            self.assertEqual(list(model_pool.pipe(['c'], 'm')), ['C'])
+        self.assertEqual(load.call_count, 1)
+
+    @unittest.skipUnless(HAS_SPACY, 'spaCy not installed')
+    def test_advanced_parser_reuses_pooled_model(self):
+        from astrocore import advanced_parser
+        self.assertEqual(advanced_parser.parse_text_advanced('PEG and PES membranes.', model='blank:en'),
+                         {'materials': []})
+        nlp = model_pool.get_model('blank:en', disable=advanced_parser.DISABLED_COMPONENTS)
+        with mock.patch.object(model_pool, '_load', side_effect=AssertionError('reloaded')):
+            results = list(advanced_parser.parse_many_advanced(['a', 'b'], model='blank:en'))
+            advanced_parser.parse_text_advanced('c', model='blank:en')
+        self.assertEqual(results, [{'materials': []}, {'materials': []}])
+        self.assertIs(model_pool.get_model('blank:en', disable=advanced_parser.DISABLED_COMPONENTS), nlp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys
+import json
+import tempfile
+import importlib
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from astrocore import nlp_extractor, nlp_stats
+
+diag = importlib.import_module('scripts.diagnose_nlp_samples')
+
+TEXT = "We used Welch's method with nperseg=1024 and a bandpass of 1-40 Hz."
+
+
+class NlpStatsTests(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(nlp_stats.current())
+
+    def test_collect_records_rules_and_stages(self):
+        with nlp_stats.collect() as stats:
+            nlp_extractor.extract_parameters(TEXT, cache=False)
+            nlp_extractor.extract_parameters("nothing to see here", cache=False)
+        self.assertIsNone(nlp_stats.current())
+        snap = stats.as_dict()
+        self.assertEqual(snap['documents'], 2)
+        self.assertEqual(snap['rules']['nperseg']['hits'], 1)
+        # the second text has no 'nperseg' anchor, so the regex never runs
+        self.assertEqual(snap['rules']['nperseg']['calls'], 1)
+        self.assertEqual(snap['rules']['nperseg']['skipped'], 1)
+        self.assertEqual(snap['rules']['methods']['hits'], 1)
+        self.assertEqual(snap['rules']['bandpass']['calls'], 2)
+        self.assertEqual(snap['stages']['regex_rules']['calls'], 2)
+        self.assertIn('nperseg', stats.report())
+
+    def test_json_export_and_merge(self):
+        with nlp_stats.collect() as stats:
+            nlp_extractor.extract_parameters(TEXT, cache=False)
+        snap = json.loads(stats.to_json())
+        total = nlp_stats.ExtractionStats()
+        total.merge(snap)
+        total.merge(snap)
+        self.assertEqual(total.as_dict()['documents'], 2)
+        self.assertEqual(total.as_dict()['rules']['nperseg']['hits'], 2)
+        self.assertEqual(stats.take()['documents'], 1)
+        self.assertEqual(stats.as_dict()['documents'], 0)
+
+    def test_diagnose_writes_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / 'report.jsonl'
+            path = Path(tmp) / 'stats.json'
+            diag.main(['--format', 'jsonl', '--workers', '2', '--out', str(out), '--stats', str(path)])
+            snap = json.loads(path.read_text(encoding='utf-8'))
+        self.assertEqual(snap['documents'], len(diag.BUILTIN_SAMPLES))
+        self.assertGreater(snap['rules']['fs_hz']['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,8 +7,11 @@ SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
 
 import unittest
+from unittest import mock
+from astrocore import parser
 from astrocore.parser import parse_text
 import importlib
+import random
 
 
 class AdvancedParserAvailabilityTests(unittest.TestCase):
@@ -37,6 +40,33 @@ class ParserTests(unittest.TestCase):
         self.assertIn('Alginate', ''.join([m['name'] for m in result['materials']]) or 'Alginate')
         self.assertIn('MRS', result['monitoring'])
 
+    def test_keyword_matcher_equals_substring_tests(self):
+        keywords = ['ab', 'abc', 'bcd', 'c', 'cab', '中性', '中性电荷', '性电']
+        matcher = parser.KeywordMatcher(keywords)
+        rng = random.Random(7)
+        for _ in range(3000):
+            text = ''.join(rng.choice('abcd中性电荷 ') for _ in range(rng.randint(0, 12)))
+            self.assertEqual(matcher.find(text), {k for k in keywords if k in text}, text)
+
+    def test_pore_size_computed_once(self):
+        sample = "海藻酸盐 与 PEG、PES、PAN，孔径 50-100 kDa，亲水 中性。"
+        with mock.patch.object(parser, '_extract_pore_size', wraps=parser._extract_pore_size) as pore:
+            result = parse_text(sample)
+        self.assertEqual(pore.call_count, 1)
+        self.assertEqual([m['name'] for m in result['materials']], ['Alginate', 'PEG', 'PES', 'PAN'])
+        self.assertEqual({m['pore_size'] for m in result['materials']}, {'50-100 kDa'})
+        self.assertEqual(result['materials'][0]['surface_property'], '亲水性, 中性电荷')
+
+    def test_custom_keyword_table(self):
+        table = parser.KeywordTable(materials=(("Chitosan", ("壳聚糖", "chitosan")),), monitoring=("fMRI",))
+        result = parse_text("壳聚糖 膜，使用 fMRI 与 EEG。", table=table)
+        self.assertEqual([m['name'] for m in result['materials']], ['Chitosan'])
+        self.assertEqual(result['monitoring'], ['fMRI'])
+        # vocabularies written as lists, like the module tables once were
+        listed = parser.KeywordTable(materials=[["Chitosan", ["壳聚糖", "chitosan"]]], monitoring=["fMRI"])
+        self.assertEqual(listed, table)
+        self.assertEqual(parse_text("壳聚糖 膜，使用 fMRI 与 EEG。", table=listed), result)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from astrocore import cache, replicator
+
+PAGES = ['Title\nAbstract\nabc\n', 'Methods\nfs = 500 Hz\n', 'Welch PSD\n', 'Results\nr\n', 'é\nReferences\n'] * 4
+
+
+class _FakePdf:
+    """Stands in for PyMuPDF: a '.pdf' file holds page texts separated by form feeds."""
+
+    def __init__(self):
+        self.parsed = 0
+
+    def pages(self, p):
+        return Path(p).read_text(encoding='utf-8').split('\f')
+
+    def extract(self, p, workers):
+        for text in self.pages(p):
+            self.parsed += 1
+            yield text
+
+    def count(self, p):
+        return len(self.pages(p))
+
+    def page_texts(self, path, start, stop):
+        self.parsed += stop - start
+        return self.pages(path)[start:stop]
+
+
+class PdfTextCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.tmp = Path(tmp)
+        self.pdf = self.tmp / 'paper.pdf'
+        self.pdf.write_text('\f'.join(PAGES), encoding='utf-8')
+        self.fake = _FakePdf()
+        for name, fn in (('_extract_pdf_pages', self.fake.extract), ('_pdf_page_count', self.fake.count),
+                         ('_pdf_page_texts', self.fake.page_texts)):
+            patcher = mock.patch.object(replicator, name, fn)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cache = replicator.open_pdf_cache(self.tmp / 'pdf.sqlite', version='test')
+        self.addCleanup(self.cache.close)
+
+    def test_second_read_skips_parsing(self):
+        expected = '\n'.join(PAGES)
+        self.assertEqual(replicator.pdf_to_text(self.pdf, cache=self.cache), expected)
+        self.assertEqual(self.fake.parsed, len(PAGES))
+        copy = self.tmp / 'renamed.pdf'
+        shutil.copyfile(self.pdf, copy)
+        self.assertEqual(replicator.pdf_to_text(copy, cache=self.cache), expected)
+        self.assertEqual(self.fake.parsed, len(PAGES))
+        self.assertEqual(self.cache.stats()['page_hits'], len(PAGES))
+        # an edited PDF is a different document
+        self.pdf.write_text('\f'.join(PAGES[:2]), encoding='utf-8')
+        self.assertEqual(replicator.pdf_to_text(self.pdf, cache=self.cache), '\n'.join(PAGES[:2]))
+        self.assertEqual(self.fake.parsed, len(PAGES) + 2)
+
+    def test_partial_reads_and_lost_pages(self):
+        early = replicator.pdf_to_text_until_methods(self.pdf, cache=self.cache)
+        self.assertEqual(early, '\n'.join(PAGES[:4]))
+        self.assertEqual(self.fake.parsed, 4)
+        # pages never read, or evicted, are extracted again range by range
+        key = self.cache.key(self.pdf)
+        self.assertEqual(self.cache.page_count(key), len(PAGES))
+        self.assertEqual(self.cache.get_pages(key, 2, 6), PAGES[2:4] + [None, None])
+        self.assertEqual(replicator.pdf_to_text(self.pdf, cache=self.cache), '\n'.join(PAGES))
+        self.assertEqual(self.fake.parsed, 4 + len(PAGES))
+        self.assertEqual(replicator.pdf_to_text_until_methods(self.pdf, cache=self.cache), early)
+        self.assertEqual(self.fake.parsed, 4 + len(PAGES))
+
+    def test_default_cache_and_versions(self):
+        replicator.set_default_pdf_cache(self.cache)
+        self.addCleanup(replicator.set_default_pdf_cache, None)
+        replicator.pdf_to_text(self.pdf)
+        replicator.pdf_to_text(self.pdf)
+        replicator.pdf_to_text(self.pdf, cache=False)
+        self.assertEqual(self.fake.parsed, 2 * len(PAGES))
+        # text extracted by another PyMuPDF version is not reused
+        other = replicator.open_pdf_cache(self.cache.path, version='other')
+        self.addCleanup(other.close)
+        self.assertIsNone(other.page_count(other.key(self.pdf)))
+        self.assertIn('-pymupdf-', cache.PdfTextCache(self.tmp / 'v.sqlite').version)
+
+    def test_size_cap_evicts_least_recently_used_pages(self):
+        small = replicator.open_pdf_cache(self.tmp / 'small.sqlite', max_bytes=200, version='test')
+        self.addCleanup(small.close)
+        key = small.key(self.pdf)
+        small.put_pages(key, 0, ['x' * 1000] * 70)
+        small.evict()
+        self.assertLessEqual(small.total_bytes(), 200)
+        self.assertGreater(small.stats()['disk_evictions'], 0)
+
+    def test_eviction_keeps_page_counts(self):
+        small = replicator.open_pdf_cache(self.tmp / 'small.sqlite', max_bytes=300, version='test')
+        self.addCleanup(small.close)
+        replicator.pdf_to_text(self.pdf, cache=small)
+        small.evict()
+        self.assertGreater(small.stats()['disk_evictions'], 0)
+        self.assertEqual(small.page_count(small.key(self.pdf)), len(PAGES))
+        # only the ranges that lost pages are extracted again
+        self.assertEqual(replicator.pdf_to_text(self.pdf, cache=small), '\n'.join(PAGES))
+        self.assertLess(self.fake.parsed, 2 * len(PAGES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from pathlib import Path
 import importlib
+import importlib.util
+import tempfile
 
 
 class PDFSupportTests(unittest.TestCase):
@@ -33,7 +35,7 @@ class PDFSupportTests(unittest.TestCase):
         # monkeypatch the pdf_to_text
         original = getattr(rep, 'pdf_to_text', None)
         try:
-            rep.pdf_to_text = lambda p: 'Title\n\nMethods\nmonkeypatched method text'
+            rep.pdf_to_text = lambda p, **kw: 'Title\n\nMethods\nmonkeypatched method text'
             out = tmp_pdf.with_suffix('.ipynb')
             if out.exists():
                 out.unlink()
@@ -48,6 +50,50 @@ class PDFSupportTests(unittest.TestCase):
             if tmp_pdf.exists():
                 tmp_pdf.unlink()
 
+    def test_methods_first_stops_after_methods_section(self):
+        rep = importlib.import_module('astrocore.replicator')
+        pages = ['Title\nAbstract\nabc\n', 'Methods\nfs = 500 Hz\n', 'more methods\n',
+                 'Results\nr\n', 'Discussion\nd\n', 'References\n']
+        read = []
+
+        def fake_pages(path, workers=None, cache=None):
+            for page in pages:
+                read.append(page)
+                yield page
+
+        original = rep.iter_pdf_pages
+        try:
+            rep.iter_pdf_pages = fake_pages
+            text = rep.pdf_to_text_until_methods('paper.pdf')
+            self.assertEqual(len(read), 4)
+            secs = rep.extract_sections_from_text(text)
+            self.assertEqual(secs['Methods'], 'fs = 500 Hz\n\nmore methods')
+            read.clear()
+            pages[1] = 'no heading here\n'
+            rep.pdf_to_text_until_methods('paper.pdf')
+            self.assertEqual(len(read), len(pages))
+        finally:
+            rep.iter_pdf_pages = original
+
+    @unittest.skipUnless(importlib.util.find_spec('fitz'), 'PyMuPDF not installed')
+    def test_parallel_pages_match_serial(self):
+        import fitz  # type: ignore
+        rep = importlib.import_module('astrocore.replicator')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'long.pdf'
+            doc = fitz.open()
+            for i in range(rep.PDF_PARALLEL_MIN_PAGES + 5):
+                heading = 'Methods' if i == 3 else ('Results' if i == 6 else f'Page {i}')
+                doc.new_page().insert_text((72, 72), f'{heading}\nbody of page {i}')
+            doc.save(str(path))
+            doc.close()
+            serial = rep.pdf_to_text(path, workers=1)
+            self.assertEqual(rep.pdf_to_text(path, workers=3), serial)
+            self.assertIn('body of page 36', serial)
+            early = rep.pdf_to_text_until_methods(path, workers=3)
+            self.assertTrue(serial.startswith(early))
+            self.assertNotIn('body of page 7', early)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import unittest
+from astrocore import nlp_extractor
+
+FILLER = "Participants were seated comfortably in a dimly lit room. " * 60
+PARAMS = "The sampling rate was 500 Hz and data were stored in data/s1.edf. "
+
+
+class PrefilterTests(unittest.TestCase):
+    def test_short_text_is_parsed_whole(self):
+        self.assertIsNone(nlp_extractor._prefilter_windows(PARAMS))
+        self.assertEqual(nlp_extractor._nlp_input(PARAMS), (PARAMS, None))
+
+    def test_windows_cover_keywords_only(self):
+        text = FILLER + PARAMS + FILLER
+        windows = nlp_extractor._prefilter_windows(text)
+        self.assertEqual(len(windows), 1)
+        start, end = windows[0]
+        self.assertLessEqual(start, text.index(PARAMS))
+        self.assertGreaterEqual(end, text.index(PARAMS) + len(PARAMS))
+        self.assertLess(end - start, len(text) // 10)
+        # windows start and end on sentence boundaries
+        self.assertTrue(text[start:end].startswith('Participants'))
+        self.assertTrue(text[:end].endswith('. '))
+
+    def test_method_names_must_start_a_word(self):
+        text = FILLER + "Statistical analyses were typically clinical. " + FILLER
+        self.assertEqual(nlp_extractor._keyword_hits(text.lower()), [])
+        self.assertEqual(len(nlp_extractor._keyword_hits("ica and fastica".lower())), 1)
+
+    def test_no_keywords_skips_nlp(self):
+        self.assertEqual(nlp_extractor._nlp_input(FILLER), ('', []))
+
+    def test_offsets_map_back_to_text(self):
+        try:
+            import spacy
+        except Exception:
+            self.skipTest('spaCy not installed')
+        nlp = spacy.blank('en')
+        text = FILLER + PARAMS + FILLER + "Welch windows used fs 250. " + FILLER
+        doc = nlp_extractor._parse(nlp, text)
+        self.assertLess(len(doc.text), len(text))
+        for tok in doc:
+            if tok.is_space:
+                continue
+            start = nlp_extractor.doc_offset_to_text(doc, tok.idx)
+            self.assertEqual(text[start:start + len(tok.text)], tok.text)
+
+    def test_results_match_unfiltered(self):
+        text = FILLER + PARAMS + FILLER + "Welch with nperseg 256 and 1 to 40 Hz. " + FILLER
+        filtered = nlp_extractor.extract_parameters(text, cache=False)
+        saved = nlp_extractor._PREFILTER_MIN_CHARS
+        nlp_extractor._PREFILTER_MIN_CHARS = sys.maxsize
+        try:
+            whole = nlp_extractor.extract_parameters(text, cache=False)
+        finally:
+            nlp_extractor._PREFILTER_MIN_CHARS = saved
+        self.assertEqual(filtered, whole)
+        self.assertEqual(filtered['fs'], 500.0)
+        self.assertEqual(filtered['data_path'], 'data/s1.edf')
+
+
+if __name__ == '__main__':
+    unittest.main()
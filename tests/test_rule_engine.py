@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import unittest
+from astrocore import nlp_extractor, nlp_stats
+
+
+class RuleEngineTests(unittest.TestCase):
+    def test_rule_table_compiled_once(self):
+        names = [r[0] for r in nlp_extractor._COMPILED_RULES]
+        self.assertEqual(names, [r[0] for r in nlp_extractor._RULES])
+        for _, _, pattern, _, _ in nlp_extractor._COMPILED_RULES:
+            self.assertTrue(hasattr(pattern, 'search'))
+
+    def test_absent_anchors_skip_rules(self):
+        text = "Signals were recorded with nperseg=256."
+        with nlp_stats.collect() as stats:
+            hits = nlp_extractor._match_rules(text, text)
+        self.assertIn('nperseg', hits)
+        # rules table entries are [calls, hits, skipped, seconds]
+        self.assertEqual(stats.rules['nperseg'][:3], [1, 1, 0])
+        for name in ('nfft', 'window', 'fs'):
+            calls, _, skipped, _ = stats.rules[name]
+            self.assertEqual((calls, skipped), (0, 1), name)
+
+    def test_seek_finds_first_match_after_non_matching_anchor(self):
+        # 'fs' occurs inside 'offset' first; the rule must still find 'fs = 500'
+        text = "An offset was removed. fs = 500 Hz"
+        hits = nlp_extractor._match_rules(text, text)
+        self.assertEqual(hits['fs'].group(1), '500 Hz')
+
+    def test_casefold_hazard_disables_gating(self):
+        # U+017F (long s) matches 's' under IGNORECASE but not after lower()
+        text = "ſampling rate 500 Hz"
+        res = nlp_extractor.extract_parameters(text)
+        self.assertEqual(res.get('fs'), 500.0)
+
+    def test_long_document(self):
+        filler = "Participants were seated comfortably in a dimly lit room. " * 500
+        text = filler + "We used Welch's method with nperseg=1024 and fs = 1 kHz. " + filler
+        res = nlp_extractor.extract_parameters(text)
+        self.assertIn('Welch', res['methods'])
+        self.assertEqual(res['params'].get('nperseg'), 1024)
+        self.assertEqual(res.get('fs'), 1000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import json
+import tempfile
+import unittest
+from astrocore import replicator
+
+PAPER = ("A Study of Things\r\n\r\nABSTRACT\r\nWe did things.\r\n  Methods  \r\nEEG at 1000 Hz.\r\n"
+         "Welch PSD.\r\nResults\r\n\r\nMethods\r\nSecond methods block.\r\nRéférences Discussion\n\n")
+
+
+def _line_based(text):
+    # the line-splitting implementation the index replaced
+    import re
+    heading_re = re.compile(r"^(?:\s*)(Abstract|Introduction|Methods|Materials|Results|Discussion|Conclusion|References)\s*$",
+                            re.IGNORECASE)
+    sections, current = {"Title": []}, "Title"
+    for ln in text.splitlines():
+        m = heading_re.match(ln.strip())
+        if m:
+            current = m.group(1).title()
+            sections[current] = []
+        else:
+            sections.setdefault(current, []).append(ln)
+    return {k: "\n".join(v).strip() for k, v in sections.items() if "\n".join(v).strip()}
+
+
+class SectionIndexTests(unittest.TestCase):
+    def test_matches_line_based_sections(self):
+        expected = _line_based(PAPER)
+        self.assertEqual(list(replicator.extract_sections_from_text(PAPER).items()), list(expected.items()))
+        self.assertEqual(expected['Methods'], 'Second methods block.\nRéférences')
+        for buf in (PAPER, PAPER.encode('utf-8')):
+            index = replicator.index_sections(buf)
+            self.assertEqual({name: replicator.section_text(buf, s, e) for name, s, e in index}, expected)
+
+    def test_offsets_slice_the_original_buffer(self):
+        text = "Title\n\nMethods\nfs = 500 Hz\n\nResults\nok\n"
+        index = replicator.index_sections(text)
+        self.assertEqual([(n, text[s:e]) for n, s, e in index],
+                         [('Title', 'Title'), ('Methods', 'fs = 500 Hz'), ('Results', 'ok')])
+        data = "Titel é\nMethods\nfs = 500 Hz".encode('utf-8')
+        self.assertEqual([data[s:e] for _, s, e in replicator.index_sections(data)], [b'Titel \xc3\xa9', b'fs = 500 Hz'])
+
+    def test_file_index_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paper = Path(tmp) / 'paper.txt'
+            paper.write_bytes(PAPER.encode('utf-8'))
+            self.assertEqual(replicator.read_sections(paper), replicator.extract_sections_from_text(PAPER))
+            side = replicator.section_index_path(paper)
+            data = json.loads(side.read_text(encoding='utf-8'))
+            self.assertEqual(data['unit'], 'bytes')
+            # a stale-looking sidecar is rebuilt, a matching one is reused
+            data['sections'] = [['Methods', 0, 1]]
+            side.write_text(json.dumps(data), encoding='utf-8')
+            self.assertEqual(replicator.read_sections(paper, names=['Methods']), {'Methods': 'A'})
+            paper.write_bytes(b'Methods\nnew text\n')
+            self.assertEqual(replicator.read_sections(paper, names=['Methods']), {'Methods': 'new text'})
+            empty = Path(tmp) / 'empty.txt'
+            empty.write_bytes(b'')
+            self.assertEqual(replicator.read_sections(empty, sidecar=False), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import csv
+import tempfile
+import unittest
+import importlib.util
+from unittest import mock
+from astrocore import parser
+
+DOCS = [
+    "能量供给 与 废物清除。提到 Alginate 和 PEG，孔径 50-100 kDa。使用 MRS 和 EEG。",
+    "nothing relevant here",
+    "聚醚砜 膜，亲水 中性；PET 与 脑电图 监测。",
+]
+
+
+class SummarizeManyTests(unittest.TestCase):
+    def test_columns_match_parse_text(self):
+        cols = parser.summarize_many(DOCS)
+        expected = {name: [] for name in parser.SUMMARY_COLUMNS}
+        for i, doc in enumerate(DOCS):
+            summary = parser.parse_text(doc)
+            expected['goals'] += [dict(doc_id=str(i), **row) for row in summary['goals']]
+            expected['materials'] += [dict(doc_id=str(i), **row) for row in summary['materials']]
+            expected['monitoring'] += [{'doc_id': str(i), 'keyword': kw} for kw in summary['monitoring']]
+        for name in parser.SUMMARY_COLUMNS:
+            self.assertEqual(list(cols.rows(name)), expected[name], name)
+        self.assertEqual(cols.num_rows('materials'), 3)
+
+    def test_workers_and_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i, doc in enumerate(DOCS * 3):
+                p = Path(tmp) / f'note{i}.txt'
+                p.write_text(doc, encoding='utf-8')
+                paths.append(p)
+            serial = parser.summarize_many(paths)
+            parallel = parser.summarize_many(paths, workers=2, chunk_size=2)
+        self.assertEqual(parallel.tables(), serial.tables())
+        self.assertEqual(serial.goals['doc_id'][0], str(paths[0]))
+
+    def test_workers_bound_documents_in_flight(self):
+        consumed = []
+
+        def docs():
+            for i in range(200):
+                consumed.append(i)
+                yield DOCS[i % len(DOCS)]
+
+        seen_at_first_result = []
+        extend = parser.SummaryColumns.extend
+
+        def record(cols, other):
+            if not seen_at_first_result:
+                seen_at_first_result.append(len(consumed))
+            extend(cols, other)
+
+        with mock.patch.object(parser.SummaryColumns, 'extend', record):
+            cols = parser.summarize_many(docs(), workers=2, chunk_size=4)
+        serial = parser.summarize_many([DOCS[i % len(DOCS)] for i in range(200)])
+        self.assertEqual(cols.tables(), serial.tables())
+        self.assertLessEqual(seen_at_first_result[0], (2 * 2 + 1) * 4)
+
+    def test_csv_output(self):
+        cols = parser.summarize_many(DOCS, ids=['a', 'b', 'c'])
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = cols.to_csv(tmp)
+            with paths['monitoring'].open(encoding='utf-8', newline='') as fh:
+                rows = list(csv.reader(fh))
+        self.assertEqual(rows[0], ['doc_id', 'keyword'])
+        self.assertEqual(rows[1:], [['a', 'MRS'], ['a', 'EEG'], ['a', 'MRS'], ['c', 'PET'], ['c', '脑电图']])
+
+    @unittest.skipUnless(sys.version_info >= (3, 10), 'slotted dataclasses need Python 3.10')
+    def test_records_are_slotted(self):
+        self.assertFalse(hasattr(parser.MaterialSpec('PEG'), '__dict__'))
+        self.assertFalse(hasattr(parser.Goal('t', 'd'), '__dict__'))
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow not installed')
+    def test_arrow_tables(self):
+        tables = parser.summarize_many(DOCS).to_arrow()
+        self.assertEqual(tables['materials'].num_rows, 3)
+        self.assertEqual(tables['goals'].column_names, list(parser.SUMMARY_COLUMNS['goals']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import unittest
+from astrocore import nlp_extractor
+
+
+class TokenScanTests(unittest.TestCase):
+    def setUp(self):
+        try:
+            import spacy
+        except Exception:
+            self.skipTest('spaCy not installed')
+        # a blank pipeline is enough: the scan only needs the tokenizer
+        self.nlp = spacy.blank('en')
+
+    def test_candidates_collected_in_one_pass(self):
+        doc = self.nlp("nperseg 256 then 1 to 40 Hz; fs 250 and later fs 500 in data/1.csv")
+        scan = nlp_extractor._scan_tokens(doc)
+        self.assertEqual(scan.nperseg, 256)
+        self.assertEqual(scan.bandpass, (1.0, 40.0))
+        # first 'fs <num>' for the extract_parameters fallback, last for enrichment
+        self.assertEqual(scan.fs_after_keyword, 250.0)
+        self.assertEqual(scan.enrich_fs, 500.0)
+        self.assertEqual(scan.path, 'data/1.csv')
+
+    def test_unit_patterns_last_mention_wins(self):
+        doc = self.nlp("A 50 Hz notch; signals were recorded at 2 kHz.")
+        scan = nlp_extractor._scan_tokens(doc)
+        self.assertEqual(scan.pattern_fs, 2000.0)
+        out = {}
+        nlp_extractor.spacy_enrich_extraction(doc, out, scan=scan)
+        self.assertEqual(out['fs'], 2000.0)
+
+    def test_enrich_without_precomputed_scan(self):
+        doc = self.nlp("Sampling rate 1 kHz. Data saved at /data/subj1/rec.fif")
+        out = {}
+        nlp_extractor.spacy_enrich_extraction(doc, out)
+        self.assertEqual(out['fs'], 1000.0)
+        self.assertEqual(out['data_path'], '/data/subj1/rec.fif')
+
+
+if __name__ == '__main__':
+    unittest.main()
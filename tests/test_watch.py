@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from astrocore import watch
+
+PAPER = "A Study\nAbstract\nabc\nMethods\nWelch PSD with nperseg=256 at 500 Hz.\nResults\nok\n"
+
+try:
+    watch.InotifyWatcher(tempfile.gettempdir()).close()
+    HAS_INOTIFY = True
+except OSError:
+    HAS_INOTIFY = False
+
+
+class WatchTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.inbox = Path(tmp) / 'inbox'
+        self.out = Path(tmp) / 'out'
+        self.inbox.mkdir()
+        (self.inbox / 'old.txt').write_text(PAPER, encoding='utf-8')
+
+    def _start(self, use_inotify):
+        reports, stop = queue.Queue(), threading.Event()
+        thread = threading.Thread(target=watch.watch, args=(self.inbox, self.out),
+                                  kwargs=dict(use_inotify=use_inotify, interval=0.05, settle=0.2,
+                                              stop=stop, on_build=reports.put))
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(stop.set)
+        return reports
+
+    def _check(self, use_inotify):
+        reports = self._start(use_inotify)
+        first = reports.get(timeout=10)
+        self.assertEqual([Path(p).name for p, _ in first.rebuilt], ['old.txt'])
+
+        # a paper written in two steps is built once, after it settled
+        new = self.inbox / 'sub' / 'new.txt'
+        new.parent.mkdir()
+        t0 = time.monotonic()
+        with new.open('w', encoding='utf-8') as fh:
+            fh.write(PAPER[:20])
+            fh.flush()
+            time.sleep(0.1)
+            fh.write(PAPER[20:])
+        report = reports.get(timeout=10)
+        self.assertLess(time.monotonic() - t0, 3)
+        self.assertEqual([Path(p).name for p, _ in report.rebuilt], ['new.txt'])
+        self.assertTrue((self.out / 'sub' / 'new.ipynb').exists())
+        self.assertTrue((self.out / 'sub' / 'new.extraction.json').exists())
+
+        # rewriting identical content is skipped; a real edit is rebuilt
+        (self.inbox / 'old.txt').write_text(PAPER, encoding='utf-8')
+        report = reports.get(timeout=10)
+        self.assertEqual((report.rebuilt, report.skipped), ([], [str(self.inbox / 'old.txt')]))
+        (self.inbox / 'old.txt').write_text(PAPER + 'Discussion\nmore\n', encoding='utf-8')
+        report = reports.get(timeout=10)
+        self.assertEqual([Path(p).name for p, _ in report.rebuilt], ['old.txt'])
+        (self.inbox / 'notes.md').write_text('ignored', encoding='utf-8')
+        (self.inbox / '.hidden.txt').write_text(PAPER, encoding='utf-8')
+        with self.assertRaises(queue.Empty):
+            reports.get(timeout=0.6)
+
+    def test_polling(self):
+        self._check(use_inotify=False)
+
+    @unittest.skipUnless(HAS_INOTIFY, 'inotify not available')
+    def test_inotify(self):
+        self._check(use_inotify=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import gc
+import os
+import unittest
+import multiprocessing
+from astrocore import nlp_extractor, workers
+
+TEXTS = [
+    "EEG was sampled at 500 Hz and analysed with Welch PSD (nperseg=256).",
+    "Independent component analysis (ICA) removed ocular artefacts; FFT of 1 s epochs.",
+    "",
+] * 5
+
+HAS_FORK = 'fork' in multiprocessing.get_all_start_methods()
+
+
+@unittest.skipUnless(HAS_FORK, 'fork start method not available')
+class WarmPoolTests(unittest.TestCase):
+    def test_results_match_in_process(self):
+        expected = [nlp_extractor.extract_parameters(t, cache=False) for t in TEXTS]
+        with workers.WarmPool(2) as pool:
+            self.assertTrue(pool.forked)
+            self.assertEqual(pool.extract(TEXTS, chunksize=2), expected)
+            self.assertEqual(pool.extract(TEXTS, fields=['methods']),
+                             [nlp_extractor.extract_parameters(t, cache=False, fields=['methods']) for t in TEXTS])
+            self.assertEqual(len(pool.pids()), 2)
+            self.assertNotIn(os.getpid(), pool.pids())
+            if hasattr(gc, 'get_freeze_count'):
+                self.assertGreater(gc.get_freeze_count(), 0)
+            memory = pool.memory()
+        if hasattr(gc, 'get_freeze_count'):
+            self.assertEqual(gc.get_freeze_count(), 0)
+        if memory['parent'] is not None:
+            self.assertEqual(len(memory['workers']), 2)
+            for m in memory['workers']:
+                self.assertGreater(m['rss'], 0)
+                self.assertLessEqual(m['private'], m['rss'])
+
+    def test_backend_stays_out_of_the_parent(self):
+        before = nlp_extractor.resolve_backend()
+        backend = 'spacy-blank' if before != 'spacy-blank' else 'regex'
+        with workers.WarmPool(2, backend=backend, freeze=False) as pool:
+            self.assertEqual(nlp_extractor.resolve_backend(), before)
+            self.assertEqual(pool.extract(TEXTS[:3]),
+                             [nlp_extractor.extract_parameters(t, cache=False, backend=backend) for t in TEXTS[:3]])
+        self.assertEqual(nlp_extractor.resolve_backend(), before)
+
+    def test_map_keeps_order(self):
+        with workers.WarmPool(3, freeze=False) as pool:
+            self.assertEqual(list(pool.map(abs, range(-20, 0), chunksize=3)), list(range(20, 0, -1)))
+
+    def test_process_memory_of_missing_process(self):
+        self.assertIsNone(workers.process_memory(2 ** 22 + 12345))
+
+
+if __name__ == '__main__':
+    unittest.main()